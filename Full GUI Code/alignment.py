@@ -0,0 +1,64 @@
+import numpy as np
+from scipy import fft
+
+
+# Automatic alignment of waveforms recorded by different devices, independent of the GUI.
+# The lag between two waveforms is found from the cross-correlation of their rates of change, which is dominated by the
+# upstroke of each beat, so this is equivalent to aligning the waveforms foot-to-foot. Every possible lag is tested in a
+# single FFT pass instead of one shift at a time.
+
+def _normalise(x):
+    """
+    Rate of change of x scaled to zero mean and unit standard deviation, so waveforms in different units are weighted
+    equally.
+
+    :param x: 1D array of data.
+
+    :return dx: Normalised rate of change of x.
+    """
+    dx = np.gradient(np.asarray(x, dtype=float))
+    dx -= np.mean(dx)
+    std = np.std(dx)
+    if std > 0:
+        dx /= std
+    return dx
+
+
+def cross_correlation(reference, signal):
+    """
+    Cross-correlation of the normalised rates of change of two waveforms for every lag, calculated with zero-padded
+    FFTs so that no wrap-around occurs.
+
+    :param reference: 1D array of the waveform which stays in place.
+    :param signal: 1D array of the waveform to be shifted. Same sampling frequency as reference.
+
+    :return lags, correlation: Lags in samples from -(len(signal) - 1) to len(reference) - 1, and the correlation at
+                               each lag. A positive lag means signal must move right (later) to line up with reference.
+    """
+    a = _normalise(reference)
+    b = _normalise(signal)
+    n = fft.next_fast_len(len(a) + len(b) - 1)
+
+    correlation = fft.irfft(fft.rfft(a, n) * np.conj(fft.rfft(b, n)), n)
+    # Negative lags wrap around to the end of the output, so move them to the start
+    correlation = np.concatenate((correlation[n - len(b) + 1:], correlation[:len(a)]))
+    lags = np.arange(-(len(b) - 1), len(a))
+    return lags, correlation
+
+
+def find_lag(reference, signal, max_lag=None):
+    """
+    Finds the shift of signal which best aligns it with reference.
+
+    :param reference: 1D array of the waveform which stays in place.
+    :param signal: 1D array of the waveform to be shifted. Same sampling frequency as reference.
+    :param max_lag: Largest shift in samples to consider in either direction. Defaults to half the length of the data.
+
+    :return lag: Shift in samples. Positive means signal must move right (later).
+    """
+    if max_lag is None:
+        max_lag = min(len(reference), len(signal)) // 2
+
+    lags, correlation = cross_correlation(reference, signal)
+    in_range = np.abs(lags) <= max_lag
+    return int(lags[in_range][np.argmax(correlation[in_range])])
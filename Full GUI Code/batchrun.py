@@ -0,0 +1,353 @@
+import argparse
+import glob
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from alignment import find_lag
+from beats import detect_beats, split_beats
+from loopfit import find_linear_section
+from reservoir import windkessel_fit
+from shiftedarray import ShiftedArray
+from smoothing import smooth, cut_indices
+from units import to_si, from_si
+from waveintensity import separate_invasive, separate_non_invasive
+
+
+# Command line entry point which runs the same analysis as the GUI on a whole cohort of recordings without any clicking.
+# Every recording is processed independently in a pool of worker processes, and each one writes its own results and
+# timings to the output directory. Usage:
+#
+#     python batchrun.py recordings/ --params params.json --output results/
+#     python batchrun.py "recordings/*.txt" --params params.json --output results/ --workers 4
+#
+# The parameter file is JSON. Every key is optional apart from method_choice. Columns count from 1, as in 'InputPage'.
+#
+#     {"method_choice": 1,
+#      "columns": {"t": 1, "p": 2, "u": 3, "d": null},
+#      "units": {"p": "mmHg", "u": "m/s", "d": "mm"},
+#      "sampling_frequency": 1000,
+#      "savgol": {"window_size": 51, "poly_order": 3, "data": ["P", "U", "D"]},
+#      "cut": [0.0, 1.0],
+#      "u_shift": 0.0,
+#      "auto_align": false,
+#      "rho": 1050,
+#      "c": null}
+
+default_params = {
+    'method_choice': None,
+    'columns': {'t': None, 'p': None, 'u': None, 'd': None},
+    'units': {'p': 'Pa', 'u': 'm/s', 'd': 'm'},
+    'sampling_frequency': 1000,  # Only used when there is no time column
+    'savgol': None,              # Savitzky-Golay filter applied as in 'SmoothData'. None to skip
+    'cut': None,                 # [start, end] times in seconds to keep, as in 'SmoothData'. None to keep everything
+    'u_shift': 0.0,              # Time in seconds to shift U by, as in 'PUAdjust'. Positive moves U right
+    'auto_align': False,         # Find the shift of U automatically, as the 'Auto align' button in 'PUAdjust'
+    'rho': 1050,                 # Blood density
+    'c': None,                   # Wave speed. None to find it from the loop, as automatic_gradient() in 'PULoop'
+    'pu_frame_fraction': 0.04,   # Size of linear frames checked in PU-loops
+    'lndu_frame_fraction': 0.02,  # Size of linear frames checked in lnDU-loops
+    'delimiter': None,           # Column delimiter for np.loadtxt. None for any whitespace
+}
+
+
+def load_params(path):
+    """
+    Reads the parameter file and fills in defaults for any missing keys.
+
+    :param path: Path to JSON parameter file.
+
+    :return params: Dictionary of parameters.
+    """
+    with open(path) as f:
+        user_params = json.load(f)
+
+    params = dict(default_params)
+    params.update(user_params)
+    for key in ('columns', 'units'):
+        params[key] = dict(default_params[key], **user_params.get(key, {}))
+
+    if params['method_choice'] not in (1, 2, 3):
+        raise ValueError("method_choice must be 1 (invasive), 2 (non-invasive) or 3 (windkessel).")
+    return params
+
+
+def find_recordings(inputs):
+    """
+    Expands the command line inputs into a sorted list of recordings. Directories contribute every .txt file inside
+    them, anything else is treated as a glob pattern.
+
+    :param inputs: List of directories, files or glob patterns.
+
+    :return paths: Sorted list of file paths without duplicates.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, '*.txt')))
+        else:
+            paths.update(glob.glob(item))
+    return sorted(paths)
+
+
+def output_names(paths):
+    """
+    Chooses the name used for the output files of each recording. This is the file name without its extension, unless
+    recordings in different directories share a file name. Those recordings are named by their path relative to the
+    directory holding all of them instead, e.g. 'patient1_rest' for 'patient1/rest.txt', so no results are overwritten.
+
+    :param paths: List of recordings.
+
+    :return names: List of unique output names, in the same order as paths.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    names = []
+    for path, stem in zip(paths, stems):
+        if stems.count(stem) > 1:
+            common = os.path.commonpath([os.path.dirname(os.path.abspath(other)) for other in paths])
+            stem = os.path.relpath(os.path.splitext(os.path.abspath(path))[0], common).replace(os.sep, '_')
+        name = stem
+        suffix = 2
+        while name in names:  # Still taken, e.g. by 'a_b.txt' alongside 'a/b.txt'
+            name = f"{stem}_{suffix}"
+            suffix += 1
+        names.append(name)
+    return names
+
+
+def load_recording(path, params):
+    """
+    Loads one recording and splits it into P/U/D/t arrays, in the same way as process_data() in 'InputPage'.
+
+    :param path: Path to recording.
+    :param params: Dictionary of parameters.
+
+    :return data, sampling_frequency: Dictionary of arrays with keys 't', 'p', 'u' and 'd' for each column present,
+                                      and the sampling frequency.
+    """
+    all_data = np.loadtxt(path, delimiter=params['delimiter'], ndmin=2)
+    data = {}
+    for key, column in params['columns'].items():
+        if column is not None:
+            data[key] = np.array(all_data[:, column - 1], dtype=float)
+
+    # Detect sampling frequency if the recording has time data, otherwise create the time array
+    if 't' in data:
+        sampling_frequency = 1 / (data['t'][1] - data['t'][0])
+    else:
+        sampling_frequency = params['sampling_frequency']
+        length = len(next(iter(data.values())))
+        data['t'] = np.arange(length) / sampling_frequency
+
+    return data, sampling_frequency
+
+
+def smooth_and_cut(data, params):
+    """
+    Filters and trims the data as in 'SmoothData'. Filtering is done in the units of the recording.
+
+    :param data: Dictionary of arrays from load_recording(). Edited in place.
+    :param params: Dictionary of parameters. The ends of params['cut'] may be given in either order.
+    """
+    savgol = params['savgol']
+    if savgol:
+        for data_type in savgol.get('data', ['P', 'U', 'D']):
+            key = data_type.lower()
+            if key in data:
+                data[key] = smooth(data[key], savgol['window_size'], savgol['poly_order'])
+
+    if params['cut']:
+        index_low, index_high = cut_indices(data['t'], *params['cut'])
+        if index_low == index_high:
+            raise ValueError(f"cut {params['cut']} keeps no samples of the recording, which runs from "
+                             f"{data['t'][0]:g} s to {data['t'][-1]:g} s.")
+        for key in data:
+            data[key] = data[key][index_low:index_high]
+
+
+def align_velocity(data, params, sampling_frequency):
+    """
+    Shifts U to line it up with P (or D), as in 'PUAdjust'.
+
+    :param data: Dictionary of arrays. 'u' is replaced by the shifted velocity.
+    :param params: Dictionary of parameters.
+    :param sampling_frequency: Sampling frequency in Hz.
+
+    :return shift: Shift of U in samples.
+    """
+    if params['auto_align']:
+        reference = data['p'] if params['method_choice'] == 1 else data['d']
+        shift = find_lag(reference, data['u'])
+    else:
+        shift = round(params['u_shift'] * sampling_frequency)
+    data['u'] = ShiftedArray(data['u'], shift).values()
+    return shift
+
+
+def analyse_recording(path, params, output_dir, name=None):
+    """
+    Runs the full analysis for one recording and writes its results and timings to output_dir.
+    Runs in a worker process, so everything it needs is passed in and only a small summary is returned.
+    Windkessel analysis is run on every complete beat of the recording, found by detect_beats() from 'beats.py'.
+
+    :param path: Path to recording.
+    :param params: Dictionary of parameters.
+    :param output_dir: Directory for results.
+    :param name: Name used for the output files, from output_names(). Defaults to the file name of the recording.
+
+    :return summary: Dictionary describing the outcome of the analysis, including the time taken by each stage.
+    """
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+    summary = {'file': path, 'name': name, 'status': 'ok', 'timing': {}}
+    timing = summary['timing']
+    start = time.perf_counter()
+
+    try:
+        stage = time.perf_counter()
+        data, sampling_frequency = load_recording(path, params)
+        smooth_and_cut(data, params)
+        timing['load'] = time.perf_counter() - stage
+        summary['sampling_frequency'] = float(sampling_frequency)
+        summary['samples'] = len(data['t'])
+
+        method = params['method_choice']
+        units = params['units']
+        t = data['t']
+
+        if method == 3:
+            # Windkessel analysis works in the units of the recording, as in the GUI, and is fitted to each beat
+            stage = time.perf_counter()
+            p = data['p']
+            boundaries = detect_beats(p, sampling_frequency)
+            if len(boundaries) < 2:  # Less than one whole beat, so fitted from the lowest point as in 'Windkessel'
+                boundaries = np.array([np.argmin(p), len(p)])
+            with warnings.catch_warnings(record=True) as caught:  # Kept in the summary instead of the console
+                warnings.simplefilter('always')
+                fits = [windkessel_fit(beat, sampling_frequency) for beat in split_beats(p, boundaries)]
+            timing['windkessel'] = time.perf_counter() - stage
+            if len(caught) > 0:
+                summary['warnings'] = [str(warning.message) for warning in caught]
+
+            constants = np.array([[fit['a'], fit['b'], fit['pinf']] for fit in fits])
+            finite = [np.all(np.isfinite(fit_constants)) and all(np.all(np.isfinite(fit[key])) for key in ('pr', 'pex'))
+                      for fit, fit_constants in zip(fits, constants)]
+            if not all(finite):
+                raise ValueError(f"windkessel fit is not finite for {finite.count(False)} of {len(fits)} beats.")
+
+            columns = ['t', 'p', 'pr', 'pex', 'beat']
+            output = [t[boundaries[0]:boundaries[-1]]] + [np.concatenate([fit[key] for fit in fits])
+                                                          for key in ('p', 'pr', 'pex')]
+            output.append(np.repeat(np.arange(len(fits)), np.diff(boundaries)))  # Index of the beat of each sample
+
+            # Constants of each beat, and their median over the recording
+            summary['beats'] = [{'start': float(t[index]), 'a': float(a), 'b': float(b), 'pinf': float(pinf)}
+                                for index, (a, b, pinf) in zip(boundaries, constants)]
+            summary.update(zip(('a', 'b', 'pinf'), np.median(constants, axis=0).tolist()))
+
+        else:
+            stage = time.perf_counter()
+            summary['u_shift_samples'] = align_velocity(data, params, sampling_frequency)
+            timing['align'] = time.perf_counter() - stage
+
+            # Convert all units into SI so that correct values can be obtained from loop analysis
+            u = to_si(data['u'], 'U', units['u'])
+            if method == 1:
+                p = to_si(data['p'], 'P', units['p'])
+            else:
+                d = to_si(data['d'], 'D', units['d'])
+
+            stage = time.perf_counter()
+            c = params['c']
+            if c is None:
+                if method == 1:
+                    slope = find_linear_section(u, p, params['pu_frame_fraction'])[0]
+                    c = (1 / params['rho']) * slope  # Calculate wave speed using PU-loop
+                else:
+                    slope = find_linear_section(u, np.log(d), params['lndu_frame_fraction'])[0]
+                    c = 0.5 * (1 / slope)  # Calculate wave speed using lnDU-loop
+                summary['gradient'] = float(slope)
+            summary['c'] = float(c)
+            timing['loop'] = time.perf_counter() - stage
+
+            # Wave separation, with results converted back to the units of the recording as in 'OutputPage'
+            stage = time.perf_counter()
+            if method == 1:
+                results = separate_invasive(p, u, t, c, params['rho'])
+                columns = ['t', 'p', 'P_f', 'P_b', 'u', 'U_f', 'U_b', 'dI', 'dI_f', 'dI_b']
+                output = [t, data['p'], from_si(results['P_f'], 'P', units['p']),
+                          from_si(results['P_b'], 'P', units['p'])]
+            else:
+                results = separate_non_invasive(d, u, t, c)
+                columns = ['t', 'd', 'D_f', 'D_b', 'u', 'U_f', 'U_b', 'dI', 'dI_f', 'dI_b']
+                output = [t, data['d'], from_si(results['D_f'], 'D', units['d']),
+                          from_si(results['D_b'], 'D', units['d'])]
+            output += [data['u'], from_si(results['U_f'], 'U', units['u']), from_si(results['U_b'], 'U', units['u']),
+                       results['dI'], results['dI_f'], results['dI_b']]
+            timing['separation'] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        results_path = os.path.join(output_dir, name + '_results.txt')
+        np.savetxt(results_path, np.column_stack(output), fmt='%.6f', delimiter='\t', header='\t'.join(columns))
+        summary['results'] = results_path
+        timing['save'] = time.perf_counter() - stage
+
+    except Exception as error:  # One bad recording should not stop an overnight run
+        summary['status'] = 'error'
+        summary['error'] = f"{type(error).__name__}: {error}"
+
+    timing['total'] = time.perf_counter() - start
+    with open(os.path.join(output_dir, name + '_summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def run_batch(paths, params, output_dir, workers=None):
+    """
+    Analyses every recording in a pool of worker processes.
+
+    :param paths: List of recordings.
+    :param params: Dictionary of parameters.
+    :param output_dir: Directory for results. Created if it does not exist.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+
+    :return summaries: List of summaries from analyse_recording(), in the same order as paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(analyse_recording, path, params, output_dir, name)
+                   for path, name in zip(paths, output_names(paths))]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run arterial wave analysis on a batch of recordings.")
+    parser.add_argument('inputs', nargs='+', help="Directories of .txt recordings, files, or glob patterns.")
+    parser.add_argument('--params', required=True, help="JSON parameter file.")
+    parser.add_argument('--output', required=True, help="Directory for results.")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    params = load_params(args.params)
+    paths = find_recordings(args.inputs)
+    if len(paths) == 0:
+        parser.error("No recordings found.")
+
+    start = time.perf_counter()
+    summaries = run_batch(paths, params, args.output, args.workers)
+    elapsed = time.perf_counter() - start
+
+    failed = [summary for summary in summaries if summary['status'] != 'ok']
+    with open(os.path.join(args.output, 'batch_summary.json'), 'w') as f:
+        json.dump({'params': params, 'files': len(summaries), 'failed': len(failed), 'total_time': elapsed,
+                   'recordings': summaries}, f, indent=2)
+
+    print(f"Analysed {len(summaries) - len(failed)} of {len(summaries)} recordings in {elapsed:.1f} s")
+    for summary in failed:
+        print(f"{summary['file']}: {summary['error']}")
+
+
+if __name__ == "__main__":
+    main()
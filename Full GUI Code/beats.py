@@ -0,0 +1,155 @@
+import numpy as np
+from scipy.signal import find_peaks, savgol_coeffs, savgol_filter
+
+
+# Beat detection for pressure, velocity and diameter recordings, independent of the GUI.
+# Each beat is found from the steepest point of its upstroke, and the foot of the beat is found with the intersecting
+# tangent method, so it stays fixed relative to the upstroke however flat or noisy the waveform is before it.
+# Every step is vectorised, so recordings several minutes long are segmented in one pass.
+
+def _window_size(length, sampling_frequency, smoothing):
+    """
+    Odd length of the Savitzky-Golay window in samples, no longer than the data.
+
+    :param length: Number of samples of data.
+    :param sampling_frequency: Sampling frequency in Hz.
+    :param smoothing: Length of the window in seconds.
+
+    :return window_size: Window length in samples.
+    """
+    return min(2 * int(smoothing * sampling_frequency / 2) + 1, length - (length + 1) % 2)
+
+
+def find_upstrokes(x, sampling_frequency, min_interval=0.3, threshold=0.5, smoothing=0.04, min_amplitude=0.1):
+    """
+    Finds the steepest point of the upstroke of every beat. The rate of rise is found with a Savitzky-Golay filter, as
+    used in SmoothData, so measurement noise does not produce extra upstrokes.
+
+    :param x: 1D array of pressure, velocity or diameter.
+    :param sampling_frequency: Sampling frequency of x in Hz.
+    :param min_interval: Shortest time between beats in seconds. 0.3 s allows heart rates up to 200 bpm.
+    :param threshold: Fraction of the typical maximum rate of rise which an upstroke must exceed.
+    :param smoothing: Length of the Savitzky-Golay window in seconds.
+    :param min_amplitude: Fraction of the range of x which an upstroke must be steep enough to rise by within
+                          min_interval.
+
+    :return upstrokes: Indices of the steepest point of each upstroke. Empty if x is flat.
+    """
+    x = np.asarray(x, dtype=float)
+    # A range no larger than floating point rounding of the values means there are no beats to find
+    if len(x) == 0 or not np.ptp(x) > 1e-9 * np.max(np.abs(x)):
+        return np.array([], dtype=int)
+
+    window_size = _window_size(len(x), sampling_frequency, smoothing)
+    if window_size > 3:
+        dx = savgol_filter(x, window_size, 2, deriv=1)
+    else:
+        dx = np.gradient(x)
+
+    # 99th percentile is used instead of the maximum so a single spike cannot hide every other beat. The floor relative
+    # to the range of x stops noise from being taken for beats when the recording has none.
+    distance = max(int(min_interval * sampling_frequency), 1)
+    height = max(threshold * np.percentile(dx, 99), min_amplitude * np.ptp(x) / distance)
+    upstrokes, properties = find_peaks(dx, height=height, distance=distance)
+    return upstrokes
+
+
+def find_beat_feet(x, upstrokes, sampling_frequency, search_window=0.3, smoothing=0.04):
+    """
+    Finds the foot of each beat with the intersecting tangent method. The foot is where the tangent at the steepest
+    point of the upstroke crosses the horizontal line through the lowest point of x in the window before it. Unlike the
+    lowest point itself, this does not move around on a flat or noisy diastole. The window never extends back past the
+    previous upstroke.
+
+    :param x: 1D array of pressure, velocity or diameter.
+    :param upstrokes: Indices of the upstrokes from find_upstrokes().
+    :param sampling_frequency: Sampling frequency of x in Hz.
+    :param search_window: Length of the window searched before each upstroke in seconds.
+    :param smoothing: Length of the Savitzky-Golay window used to find the slope of the upstroke in seconds.
+
+    :return feet: Indices of the foot of each beat.
+    """
+    x = np.asarray(x, dtype=float)
+    upstrokes = np.asarray(upstrokes, dtype=int)
+    if len(upstrokes) == 0:
+        return upstrokes
+
+    window = max(int(search_window * sampling_frequency), 1)
+    previous = np.concatenate(([0], upstrokes[:-1]))
+
+    # One row of indices for each beat, ending at the upstroke
+    indices = upstrokes[:, np.newaxis] - np.arange(window, -1, -1)
+    in_range = indices >= previous[:, np.newaxis]
+    values = np.where(in_range, x[np.clip(indices, 0, None)], np.inf)
+    lowest = indices[np.arange(len(upstrokes)), np.argmin(values, axis=1)]
+
+    # Slope at each upstroke from the same Savitzky-Golay filter as find_upstrokes(), found only where it is needed
+    window_size = max(_window_size(len(x), sampling_frequency, smoothing), 3)
+    half = window_size // 2
+    neighbours = np.clip(upstrokes[:, np.newaxis] + np.arange(-half, half + 1), 0, len(x) - 1)
+    slopes = x[neighbours] @ savgol_coeffs(window_size, 2, deriv=1, use='dot')
+
+    # Samples from the foot to the upstroke along the tangent. The lowest point is kept where there is no upstroke.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        feet = np.round(upstrokes - (x[upstrokes] - x[lowest]) / slopes)
+    feet = np.where(slopes > 0, feet, lowest)
+    return np.clip(feet, np.maximum(upstrokes - window, previous), upstrokes).astype(int)
+
+
+def detect_beats(x, sampling_frequency, min_interval=0.3, threshold=0.5, search_window=0.3, smoothing=0.04):
+    """
+    Detects beats in a recording and returns the boundaries between them. Beat i runs from boundaries[i] up to but not
+    including boundaries[i + 1].
+
+    :param x: 1D array of pressure, velocity or diameter.
+    :param sampling_frequency: Sampling frequency of x in Hz.
+    :param min_interval: Shortest time between beats in seconds.
+    :param threshold: Fraction of the typical maximum rate of rise which an upstroke must exceed.
+    :param search_window: Length of the window searched for the foot before each upstroke in seconds.
+    :param smoothing: Length of the Savitzky-Golay window used to find the rate of rise in seconds.
+
+    :return boundaries: Indices of the foot of each beat, in increasing order. Empty if x is flat.
+    """
+    upstrokes = find_upstrokes(x, sampling_frequency, min_interval, threshold, smoothing)
+    feet = find_beat_feet(x, upstrokes, sampling_frequency, search_window, smoothing)
+    return np.unique(feet)
+
+
+def split_beats(x, boundaries):
+    """
+    Splits a recording into complete beats. Data before the first boundary and after the last is discarded.
+
+    :param x: 1D array of data. May be a different signal to the one used to find the boundaries, as long as it is
+              sampled at the same times.
+    :param boundaries: Beat boundaries from detect_beats().
+
+    :return beats: List of 1D arrays, one for each complete beat.
+    """
+    boundaries = np.asarray(boundaries, dtype=int)
+    if len(boundaries) < 2:
+        return []
+    return np.split(np.asarray(x)[boundaries[0]:boundaries[-1]], boundaries[1:-1] - boundaries[0])
+
+
+def stack_beats(x, boundaries, length=None):
+    """
+    Stacks complete beats into a 2D array with one beat per row, so they can be processed together by the batch
+    functions in waveintensity.py. Every beat is truncated to the same length.
+
+    :param x: 1D array of data sampled at the same times as the signal used to find the boundaries.
+    :param boundaries: Beat boundaries from detect_beats().
+    :param length: Number of samples kept from each beat. Defaults to the length of the shortest beat. Beats which
+                   would run past the end of x are dropped.
+
+    :return beats: 2D array with shape (number of beats, length).
+    """
+    x = np.asarray(x)
+    boundaries = np.asarray(boundaries, dtype=int)
+    starts = boundaries[:-1]
+    if len(starts) == 0:
+        return np.empty((0, 0 if length is None else length), dtype=x.dtype)
+    if length is None:
+        length = np.min(np.diff(boundaries))
+    starts = starts[starts + length <= len(x)]
+
+    return x[starts[:, np.newaxis] + np.arange(length)]
@@ -0,0 +1,277 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+import numpy as np
+import scipy
+from beats import detect_beats, split_beats
+from loopfit import find_linear_section
+from reservoir import windkessel_fit
+from session import AnalysisSession
+from smoothing import smooth, cut_indices
+from units import convert_session_to_si
+from waveintensity import separate_invasive, separate_non_invasive
+
+
+# Benchmarks for the numerical hot paths of the GUI, run on synthetic recordings so results are reproducible.
+# Each benchmark is timed over several repeats, and run once more under tracemalloc to find its peak memory use.
+# Results are saved as JSON so runs from different commits can be compared with --compare. Usage:
+#
+#     python benchmark.py --output results.json
+#     python benchmark.py --full --output results.json
+#     python benchmark.py --output new.json --compare old.json
+
+# Recording lengths in seconds and sampling frequencies in Hz
+default_durations = [1, 10, 60]
+default_frequencies = [1000, 5000]
+full_durations = [1, 10, 60, 600, 3600]
+full_frequencies = [1000, 2000, 5000, 10000]
+
+# Time in seconds each benchmark should take at most. The windkessel fit of one beat needs to be well within this, so
+# that it can run across every beat of long recordings.
+targets = {'windkessel_beat': 1e-3}
+
+
+def synthetic_recording(duration, sampling_frequency, heart_rate=75, seed=0):
+    """
+    Creates a recording of pressure, velocity and diameter with a realistic shape and a little noise.
+
+    :param duration: Length of recording in seconds.
+    :param sampling_frequency: Sampling frequency in Hz.
+    :param heart_rate: Heart rate in beats per minute.
+    :param seed: Seed for the noise, so every run uses identical data.
+
+    :return t, p, u, d: Time (s), pressure (mmHg), velocity (m/s) and diameter (mm).
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sampling_frequency)) / sampling_frequency
+    s = t % (60 / heart_rate)  # Time since the start of the beat
+
+    p = 80 + 40 * np.exp(-((s - 0.15) / 0.07) ** 2) + 15 * np.exp(-((s - 0.4) / 0.1) ** 2)
+    u = 0.6 * np.exp(-((s - 0.12) / 0.05) ** 2) - 0.05 * np.exp(-((s - 0.3) / 0.05) ** 2)
+    d = 6 + 0.4 * np.exp(-((s - 0.16) / 0.08) ** 2)
+
+    p += rng.normal(0, 0.2, len(t))
+    u += rng.normal(0, 0.005, len(t))
+    d += rng.normal(0, 0.005, len(t))
+    return t, p, u, d
+
+
+def make_session(t, p, u, d, sampling_frequency):
+    """
+    Creates an AnalysisSession holding a recording, as it would be after 'InputPage'.
+    """
+    session = AnalysisSession()
+    session.t_data = t
+    session.p_data = p.copy()
+    session.u_data = u.copy()
+    session.d_data = d.copy()
+    session.p_unit = 'mmHg'
+    session.u_unit = 'cm/s'
+    session.d_unit = 'mm'
+    session.sampling_frequency = sampling_frequency
+    return session
+
+
+def benchmark_cases(t, p, u, d, sampling_frequency):
+    """
+    The functions to be benchmarked for one recording. Each takes no arguments and works on its own copy of any data
+    it edits, so it can be repeated.
+
+    :return cases: Dictionary of benchmark name to function.
+    """
+    p_si = p * 133
+    u_si = u / 100
+    d_si = d / 1000
+    c = 5.0
+    beat = p[:int(0.8 * sampling_frequency)]  # One beat of synthetic_recording() at 75 bpm, starting at its foot
+
+    def run_analysis_invasive():
+        # OutputPage.run_analysis() for PU-loop analysis
+        separate_invasive(p_si, u_si, t, c)
+
+    def run_analysis_non_invasive():
+        # OutputPage.run_analysis() for lnDU-loop analysis
+        separate_non_invasive(d_si, u_si, t, c)
+
+    def windkessel():
+        # Windkessel.calculate_windkessel() on every beat of the recording, as in 'batchrun.py'
+        boundaries = detect_beats(p, sampling_frequency)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for beat in split_beats(p, boundaries):
+                windkessel_fit(beat, sampling_frequency)
+
+    def windkessel_beat():
+        # Windkessel.calculate_windkessel() on a single beat, compared with its target time
+        windkessel_fit(beat, sampling_frequency)
+
+    def automatic_gradient_pu():
+        # PULoop.automatic_gradient() for a PU-loop
+        find_linear_section(u_si, p_si, 0.04)
+
+    def automatic_gradient_lndu():
+        # PULoop.automatic_gradient() for a lnDU-loop
+        find_linear_section(u_si, np.log(d_si), 0.02)
+
+    def smooth_data():
+        # SmoothData.clean_data() followed by SmoothData.cut_data(), keeping the middle half of the recording
+        window_size = max(2 * int(0.025 * sampling_frequency) + 1, 5)
+        edit = smooth(p, window_size, 3)
+        index_low, index_high = cut_indices(t, t[-1] / 4, 3 * t[-1] / 4)
+        return edit[index_low:index_high], t[index_low:index_high]
+
+    def convert_units():
+        # PUAdjust.convert_units(), including the lnD array for non-invasive analysis
+        session = make_session(t, p, u, d, sampling_frequency)
+        convert_session_to_si(session)
+        session.lnd_data_adjusted = np.log(session.d_data)
+
+    return {
+        'run_analysis_invasive': run_analysis_invasive,
+        'run_analysis_non_invasive': run_analysis_non_invasive,
+        'windkessel': windkessel,
+        'windkessel_beat': windkessel_beat,
+        'automatic_gradient_pu': automatic_gradient_pu,
+        'automatic_gradient_lndu': automatic_gradient_lndu,
+        'smooth_data': smooth_data,
+        'convert_units': convert_units,
+    }
+
+
+def measure(function, repeats):
+    """
+    Times a function and finds its peak memory use.
+
+    :param function: Function taking no arguments.
+    :param repeats: Number of timed runs.
+
+    :return times, peak_memory: List of run times in seconds, and peak memory allocated during one run in bytes.
+    """
+    function()  # Warm up caches and imports
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    # Measured separately, as tracing allocations slows the function down
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return times, peak_memory
+
+
+def environment():
+    """
+    Details of the machine and code the benchmarks ran on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'time': datetime.now(timezone.utc).isoformat(), 'python': platform.python_version(),
+            'numpy': np.__version__, 'scipy': scipy.__version__, 'machine': platform.platform(),
+            'processor': platform.processor()}
+
+
+def run_benchmarks(durations, frequencies, repeats, selected=None):
+    """
+    Runs every benchmark for every combination of recording length and sampling frequency.
+
+    :param durations: Recording lengths in seconds.
+    :param frequencies: Sampling frequencies in Hz.
+    :param repeats: Number of timed runs of each benchmark.
+    :param selected: Optional list of benchmark names to run. Defaults to all of them.
+
+    :return results: List of dictionaries, one per benchmark run.
+    """
+    results = []
+    for sampling_frequency in frequencies:
+        for duration in durations:
+            t, p, u, d = synthetic_recording(duration, sampling_frequency)
+            cases = benchmark_cases(t, p, u, d, sampling_frequency)
+            for name, function in cases.items():
+                if selected and name not in selected:
+                    continue
+                # Long recordings are only timed once, to keep the full suite to a reasonable length
+                times, peak_memory = measure(function, repeats if len(t) <= 1e6 else 1)
+                result = {'benchmark': name, 'duration': duration, 'sampling_frequency': sampling_frequency,
+                          'samples': len(t), 'repeats': len(times), 'time_min': min(times),
+                          'time_median': float(np.median(times)), 'peak_memory': peak_memory}
+                line = (f"{name:28s} {duration:6g} s {sampling_frequency:6g} Hz  "
+                        f"{result['time_min'] * 1000:10.3f} ms  {peak_memory / 1e6:10.2f} MB")
+                if name in targets:
+                    result['target'] = targets[name]
+                    result['target_met'] = result['time_min'] <= targets[name]
+                    line += f"  target {targets[name] * 1000:g} ms {'met' if result['target_met'] else 'MISSED'}"
+                results.append(result)
+                print(line)
+    return results
+
+
+def compare(results, previous_path):
+    """
+    Prints the change in time and peak memory of each benchmark against a previous results file.
+
+    :param results: List of results from run_benchmarks().
+    :param previous_path: Path to JSON results saved by an earlier run.
+    """
+    with open(previous_path) as f:
+        previous = json.load(f)
+
+    def key(result):
+        return result['benchmark'], result['duration'], result['sampling_frequency']
+
+    previous_results = {key(result): result for result in previous['results']}
+
+    print(f"\nCompared with {previous_path} (commit {previous['environment'].get('commit')})")
+    print("ratio > 1 means the new code is slower or uses more memory")
+    for result in results:
+        old = previous_results.get(key(result))
+        if old is None:
+            continue
+        time_ratio = result['time_min'] / old['time_min']
+        memory_ratio = result['peak_memory'] / old['peak_memory'] if old['peak_memory'] else float('nan')
+        print(f"{result['benchmark']:28s} {result['duration']:6g} s {result['sampling_frequency']:6g} Hz  "
+              f"time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the numerical hot paths of the GUI.")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON file to save results to.")
+    parser.add_argument('--full', action='store_true',
+                        help="Run every recording length from 1 s to 1 h at 1 to 10 kHz. Needs several GB of memory.")
+    parser.add_argument('--durations', type=float, nargs='+', help="Recording lengths in seconds.")
+    parser.add_argument('--frequencies', type=float, nargs='+', help="Sampling frequencies in Hz.")
+    parser.add_argument('--repeats', type=int, default=5, help="Number of timed runs of each benchmark.")
+    parser.add_argument('--benchmarks', nargs='+', help="Only run these benchmarks.")
+    parser.add_argument('--compare', help="Previous results file to compare against.")
+    args = parser.parse_args()
+
+    durations = args.durations or (full_durations if args.full else default_durations)
+    frequencies = args.frequencies or (full_frequencies if args.full else default_frequencies)
+
+    results = run_benchmarks(durations, frequencies, args.repeats, args.benchmarks)
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    missed = [result for result in results if result.get('target_met') is False]
+    for result in missed:
+        print(f"{result['benchmark']} at {result['duration']:g} s {result['sampling_frequency']:g} Hz took "
+              f"{result['time_min'] * 1000:.3f} ms, missing its target of {result['target'] * 1000:g} ms")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Fast redrawing of plots where only a few artists move, such as the waveforms shifted in 'PUAdjust' and 'PULoop' and
+# the cut lines drawn in 'SmoothData'.
+# Everything which does not move (axes, twin axes, grids with minor ticks, labels and legends) is drawn once and saved
+# as a background image. Each update restores the background and draws only the moving artists on top, instead of
+# drawing the whole figure again. The background is saved again whenever the whole figure is drawn, e.g. when the window
+# is resized.
+
+class BlitManager:
+    """
+    Redraws the moving artists of a figure on top of a saved background.
+    Moving artists are marked as animated, so full draws of the figure leave them out of the background.
+
+    :param canvas: FigureCanvasTkAgg showing the figure.
+    :param artists: Artists which move, e.g. lines whose data is changed with set_xdata().
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        for artist in artists:
+            self.add_artist(artist)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def add_artist(self, artist):
+        """
+        Adds an artist to be redrawn by update().
+
+        :param artist: Matplotlib artist in the figure of canvas.
+        """
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def set_artists(self, artists):
+        """
+        Replaces the moving artists, e.g. after the figure has been cleared for a new plot. The background is saved
+        again at the next full draw.
+
+        :param artists: Artists which move in the new plot.
+        """
+        self.artists = []
+        self.background = None
+        for artist in artists:
+            self.add_artist(artist)
+
+    def on_draw(self, event):
+        """
+        Called by Matplotlib after every full draw of the figure. Saves the new background and draws the moving
+        artists on top of it.
+        """
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+
+    def update(self):
+        """
+        Shows the current state of the moving artists. The first update draws the whole figure, which saves the
+        background for every update after it.
+        """
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
@@ -0,0 +1,84 @@
+import numpy as np
+from dicomio import read_header, number_of_frames, frame_rate, default_frame_rate, frame_to_image, iter_frames
+from imageops import crop_image, resize_for_model, split_squares, ProbabilityMap, fill_gaps
+from models import predict_squares
+
+
+# Whole-cine analysis for 'DiameterImage', independent of the GUI.
+# Every frame of a B-mode DICOM cine is cropped to the box the user drew on one frame, segmented, and reduced to a
+# single diameter, giving diameter over time from one run. Frames are decoded, segmented and discarded a batch at a
+# time, so memory use does not grow with the length of the cine.
+
+def frame_diameter(predictions, threshold, width):
+    """
+    Diameter of the artery in one frame, from the model predictions for its square images.
+
+    :param predictions: List of predictions of shape (1, 512, 512, 1) for the squares of one frame, from left to right.
+    :param threshold: Mask threshold, as ImageAnalysis.mask_threshold.
+    :param width: Width of the frame after resize_for_model().
+
+    :return diameter: Median distance in pixels between the top and bottom walls over all pixel columns, or NaN if no
+                      walls were found.
+    """
+    try:
+        top_y_values, bottom_y_values = ProbabilityMap(predictions, width).outline(threshold)
+    except ValueError:  # Nothing in the frame is above the threshold
+        return np.nan
+    return float(np.median(bottom_y_values - top_y_values))
+
+
+def cine_diameters(file_path, box_coords, model, threshold, batch_size=8, progress=None):
+    """
+    Finds the diameter of the artery in every frame of a DICOM cine.
+    Square images from several frames are passed through the model together, batch_size at a time, and only the frames
+    of the current batch are held in memory.
+
+    :param file_path: Path to .dcm file.
+    :param box_coords: Coordinates of the crop box drawn by the user on one frame, as ImageAnalysis.dcm_box_coords.
+    :param model: Loaded segmentation model from models.get_model().
+    :param threshold: Mask threshold, as ImageAnalysis.mask_threshold.
+    :param batch_size: Number of square images passed through the model at once.
+    :param progress: Optional function called with (frames done, total frames) after each batch.
+
+    :return diameters, rate, crop_height: Diameter in each frame in pixels of the resized image, frames per second, and
+                                          height of the cropped frames in original pixels for converting units.
+    """
+    ds = read_header(file_path)
+    n = number_of_frames(ds)
+    rate = frame_rate(ds) or default_frame_rate
+
+    diameters = np.full(n, np.nan)
+    crop_height = None
+    batch = []  # (frame index, width after resizing, square images) for each frame waiting to be segmented
+
+    def segment_batch():
+        squares = [square for _, _, frame_squares in batch for square in frame_squares]
+        predictions = predict_squares(model, squares, batch_size)
+        start = 0
+        for index, width, frame_squares in batch:
+            diameters[index] = frame_diameter(predictions[start:start + len(frame_squares)], threshold, width)
+            start += len(frame_squares)
+        batch.clear()
+        if progress is not None:
+            progress(index + 1, n)
+
+    for index, frame_array in enumerate(iter_frames(file_path)):
+        img = crop_image(frame_to_image(frame_array), box_coords)
+        crop_height = img.height
+        img = resize_for_model(img)
+        batch.append((index, img.width, split_squares(img)))
+
+        if sum(len(frame_squares) for _, _, frame_squares in batch) >= batch_size:
+            segment_batch()
+
+    if len(batch) > 0:
+        segment_batch()
+
+    # Frames where no walls were found are filled in from the frames either side
+    missing = np.isnan(diameters)
+    if missing.all():
+        raise ValueError("No arterial walls found in any frame of the cine.")
+    if missing.any():
+        diameters = fill_gaps(diameters, missing)
+
+    return diameters, rate, crop_height
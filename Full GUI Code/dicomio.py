@@ -0,0 +1,121 @@
+import numpy as np
+import pydicom as dicom
+from PIL import Image
+
+
+# Reading of ultrasound DICOM files for 'VelocityImage' and 'DiameterImage', independent of the GUI.
+# Only the frame being analysed is decoded. The header is read without the pixel data, and pixels are decoded one frame
+# at a time straight from the file, instead of decoding every frame of a cine into memory to keep one of them.
+
+header_height = 80  # Pixels removed from the top of every frame in case patient name is there
+default_frame_rate = 30  # Frames per second assumed when a cine does not record its frame rate
+
+def read_header(file_path):
+    """
+    Reads the DICOM header without loading any pixel data.
+
+    :param file_path: Path to .dcm file.
+
+    :return ds: pydicom Dataset without pixel data.
+    """
+    return dicom.dcmread(file_path, stop_before_pixels=True)
+
+
+def number_of_frames(ds):
+    """
+    Number of frames in a DICOM file. Single images have no NumberOfFrames element, so count as one frame.
+
+    :param ds: pydicom Dataset, e.g. from read_header().
+
+    :return n: Number of frames.
+    """
+    return int(getattr(ds, 'NumberOfFrames', 1) or 1)
+
+
+def frame_rate(ds):
+    """
+    Frame rate of a DICOM cine, from Frame Time, Cine Rate or Recommended Display Frame Rate, whichever is present.
+
+    :param ds: pydicom Dataset, e.g. from read_header().
+
+    :return rate: Frames per second, or None if the file does not record it.
+    """
+    if getattr(ds, 'FrameTime', None):
+        return 1000 / float(ds.FrameTime)  # Frame Time is in ms
+    for keyword in ('CineRate', 'RecommendedDisplayFrameRate'):
+        if getattr(ds, keyword, None):
+            return float(getattr(ds, keyword))
+    return None
+
+
+def frame_to_image(frame_array):
+    """
+    Converts a decoded frame into the RGB image shown to the user, with the top header_height pixels cropped off.
+
+    :param frame_array: 2D array of pixel values from read_frame() or iter_frames().
+
+    :return img: RGB Image object.
+    """
+    img = Image.fromarray(np.uint8(frame_array))  # Convert pixel array to image
+    img = img.crop((0, header_height, img.width, img.height))  # Crop off top of DICOM
+    return img.convert("RGB")  # Convert the grayscale image to RGB
+
+
+def _single_channel(frame_array, channel):
+    """
+    Keeps one channel of a colour frame. Grayscale frames are returned unchanged.
+    """
+    if frame_array.ndim == 3:
+        return np.ascontiguousarray(frame_array[..., channel])
+    return frame_array
+
+
+def read_frame(file_path, frame=0, channel=0):
+    """
+    Decodes a single frame of a DICOM file and keeps a single channel of it.
+    With pydicom 3 or later only the requested frame is read from the file and decompressed. Older versions of pydicom
+    have no way to decode one frame, so the whole file is decoded and the rest discarded.
+
+    :param file_path: Path to .dcm file.
+    :param frame: Index of frame to decode, starting at 0.
+    :param channel: Colour channel to keep, for colour images.
+
+    :return frame_array: 2D array of pixel values.
+    """
+    n = number_of_frames(read_header(file_path))
+    if not 0 <= frame < n:
+        raise IndexError(f"Frame {frame} requested from a DICOM file with {n} frames.")
+
+    try:
+        from pydicom.pixels import pixel_array
+    except ImportError:  # pydicom < 3
+        frames = dicom.dcmread(file_path).pixel_array
+        frame_array = frames[frame] if n > 1 else frames
+    else:
+        frame_array = pixel_array(file_path, index=frame)
+
+    return _single_channel(frame_array, channel)
+
+
+def iter_frames(file_path, channel=0):
+    """
+    Decodes the frames of a DICOM file one at a time, so that only one frame is held in memory.
+    Older versions of pydicom have no way to decode one frame at a time, so the whole file is decoded first.
+
+    :param file_path: Path to .dcm file.
+    :param channel: Colour channel to keep, for colour images.
+
+    :return frames: Generator of 2D arrays of pixel values, in order.
+    """
+    n = number_of_frames(read_header(file_path))
+    try:
+        from pydicom.pixels import iter_pixels
+    except ImportError:  # pydicom < 3
+        frames = dicom.dcmread(file_path).pixel_array
+        if n == 1:
+            frames = frames[np.newaxis]
+    else:
+        frames = iter_pixels(file_path)
+
+    for frame_array in frames:
+        yield _single_channel(frame_array, channel)
@@ -7,16 +7,20 @@ class Homepage(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=config.bg_col)
         self.controller = controller
+        session = controller.session  # Data and results of the current analysis
 
         def choose_method(x):
             """
-            Saves which type of analysis the user wants to run to global configuration.
+            Saves which type of analysis the user wants to run to session.method_choice of the AnalysisSession.
             Methods 1/2/3 correspond to invasive/non-invasive/windkessel respectively.
-            Edits variable config.method_choice.
+            Choosing a method starts a new analysis, so anything left from a previous analysis is cleared with
+            session.reset() first.
+            Edits variable session.method_choice.
 
             :param x: Method choice based on which button the user pressed
             """
-            config.method_choice = x
+            session.reset()
+            session.method_choice = x
 
         self.grid_rowconfigure((0, 1, 2, 3, 4, 5, 6, 7, 8, 9), weight=1)  # Configure rows to split evenl.
         self.grid_columnconfigure(0, weight=1)                            # Configure columns to split evenly.
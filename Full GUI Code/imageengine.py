@@ -0,0 +1,352 @@
+import os
+import numpy as np
+from PIL import Image
+from dicomio import read_frame, frame_to_image
+from imageops import draw_box, crop_image, fill_boxes, fill_gaps, trace_in_boxes, draw_traces, resize_for_model, \
+    split_squares, square_size, ProbabilityMap
+
+
+# Image analysis shared by 'VelocityImage' and 'DiameterImage', independent of the GUI.
+# An ImageAnalysis holds every image, box and annotation of one ultrasound image, and carries out each step of its
+# analysis. What differs between velocity and diameter images is held in a Modality, so both pages run exactly the same
+# code, and the pages only display the results and pass on the user's clicks. Nothing here needs Tk or TensorFlow, so
+# the session can hold an ImageAnalysis for each image, and images can be analysed by scripts without the GUI, with
+# models.segment_squares() or cine.cine_diameters() providing the model output.
+
+class Modality:
+    """
+    Settings which differ between the kinds of ultrasound image.
+
+    :param name: Name of the measurement, used in messages.
+    :param mask_threshold: Default mask threshold.
+    :param edited_traces: Which of 'top' and 'bottom' are edited by anomaly removal after the model has run.
+    :param line_width: Width in pixels of the annotation drawn along each trace.
+    :param png_scale: Conversion from pixels to units for .png images, which have no DICOM scale.
+    :param not_found: Message given when nothing in the image is above the mask threshold.
+    """
+
+    def __init__(self, name, mask_threshold, edited_traces, line_width, png_scale, not_found):
+        self.name = name
+        self.mask_threshold = mask_threshold
+        self.edited_traces = edited_traces
+        self.line_width = line_width
+        self.png_scale = png_scale
+        self.not_found = not_found
+
+
+# The top of the velocity trace is the baseline, so only the envelope below it is edited. Both arterial walls are
+# edited, and drawn two pixels thick so they can be seen against the vessel walls.
+velocity = Modality('velocity', 0.5, ('bottom',), 1, 0.003,
+                    "No velocity waveform found. Try a lower mask threshold.")
+diameter = Modality('diameter', 0.3, ('top', 'bottom'), 2, 0.01,
+                    "No arterial walls found. Try a lower mask threshold.")
+
+dicom_scale_pixels = 460  # Length in pixels of the scale bar of a DICOM frame, before resizing
+seconds_per_pixel = 3 / 1685  # Time covered by each pixel column of an image
+
+
+def match_length(data, target_size):
+    """
+    Resamples data with linear interpolation, so that data extracted from velocity and diameter images have the same
+    length.
+
+    :param data: 1D array of data.
+    :param target_size: Length of the new array.
+
+    :return data: New array of length target_size.
+    """
+    original_indices = np.linspace(0, len(data) - 1, num=len(data))
+    new_indices = np.linspace(0, len(data) - 1, num=target_size)
+    return np.interp(new_indices, original_indices, data)
+
+
+class ImageAnalysis:
+    """
+    State and steps of the analysis of one ultrasound image: uploading, cropping a DICOM frame, removing anomalies,
+    running the image segmentation model, editing its annotation and extracting data.
+    Anomaly removal works in two modes. In mode 1, before the model has run, boxes are filled in black on the image. In
+    mode 2, once the image has been annotated, annotation inside the boxes is replaced by a straight line.
+
+    :param modality: velocity or diameter.
+    """
+
+    def __init__(self, modality):
+        self.modality = modality
+        self.mask_threshold = modality.mask_threshold
+        self.dicom_frame = 0  # Frame of DICOM file to be displayed and analysed
+
+        self.image_path = None
+        self.dicom_upload = False
+        self.anomaly_mode = 1
+
+        # DICOM frame to be worked with until it is cropped, a copy of the full unedited frame, and the crop box
+        self.dicom_img = None
+        self.dicom_original = None
+        self.dcm_box_coords = []
+
+        # Unedited image, image used before the model has run, and image annotated by the model
+        self.original_img = None
+        self.img = None
+        self.img_annotated = None
+
+        # Coordinates of boxes drawn on image to highlight anomalies
+        self.box_coords = []
+
+        # Model predictions for the square images, and the same predictions joined for the whole image
+        self.predictions = []
+        self.probability_map = None
+
+        # Pixel coordinates of image segmentation output, which change with anomaly removal, and a saved initial copy
+        self.top_values = []
+        self.bottom_values = []
+        self.og_top_values = []
+        self.og_bottom_values = []
+
+        self.pix_scale = None
+
+        # Diameter of every frame of a DICOM cine, and its frame rate, when a whole cine is analysed
+        self.cine_diameters = None
+        self.cine_frame_rate = None
+
+    @property
+    def display_img(self):
+        """
+        Image edited by the user's boxes in the current anomaly mode.
+        """
+        return self.img if self.anomaly_mode == 1 else self.img_annotated
+
+    def load(self, file_path):
+        """
+        Uploads a .png image, or decodes frame dicom_frame of a .dcm file using read_frame() from 'dicomio.py', with 80
+        pixels removed from the top in case patient name is there. Copies are kept in case the user undoes changes.
+
+        :param file_path: Path to .png or .dcm file.
+
+        :return loaded: False if the file is neither, in which case nothing is changed.
+        """
+        file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension not in ('.png', '.dcm'):
+            return False
+
+        self.image_path = file_path
+        self.cine_diameters = None
+        if file_extension == '.png':
+            self.dicom_upload = False
+            self.original_img = Image.open(file_path)
+            self.img = self.original_img.copy()
+        else:
+            self.dicom_upload = True
+            self.dcm_box_coords = []
+            self.dicom_img = frame_to_image(read_frame(file_path, self.dicom_frame))
+            self.dicom_original = self.dicom_img.copy()
+        return True
+
+    def add_crop_point(self, x, y):
+        """
+        Saves a corner of the crop box clicked by the user on the DICOM frame. Once both corners have been clicked the
+        box is drawn on dicom_img.
+
+        :param x, y: Coordinates of the click in pixels.
+        """
+        self.dcm_box_coords = np.append(self.dcm_box_coords, [x, y])
+        if len(self.dcm_box_coords) == 4:
+            self.dicom_img = draw_box(self.dicom_img, self.dcm_box_coords)
+
+    def crop_dicom(self):
+        """
+        Crops the DICOM frame to the box drawn by the user, removing any stray pixels of the box which are not cropped
+        out. The cropped image becomes img, in the same way as an uploaded .png.
+        """
+        self.img = crop_image(self.dicom_img, self.dcm_box_coords)
+        self.original_img = self.img.copy()
+
+    def add_box_point(self, x, y):
+        """
+        Saves a corner of an anomaly box clicked by the user. Each time both corners of a box have been clicked, it is
+        drawn on display_img.
+
+        :param x, y: Coordinates of the click in pixels.
+        """
+        self.box_coords = np.append(self.box_coords, [x, y])
+        if len(self.box_coords) % 4 == 0:
+            if self.anomaly_mode == 1:
+                self.img = draw_box(self.img, self.box_coords)
+            elif self.anomaly_mode == 2:
+                self.img_annotated = draw_box(self.img_annotated, self.box_coords)
+
+    def _complete_boxes(self):
+        # box_coords should always be multiple of 4 to correctly produce boxes.
+        # If it is not, spare coordinates are removed from the end
+        if len(self.box_coords) % 4 != 0:
+            self.box_coords = np.delete(self.box_coords, [-2, -1])
+
+    def remove_anomalies(self):
+        """
+        Removes anomalies inside the boxes drawn by the user. In mode 1 every box is filled in black, so the model will
+        ignore it. In mode 2 the edited traces of the annotation are replaced inside the boxes by a straight line
+        joining the nearest points either side, and the boxes are cleared.
+
+        :return display_img: Image with anomalies removed.
+        """
+        self._complete_boxes()
+        if self.anomaly_mode == 1:
+            if len(self.box_coords) > 0:
+                self.img = fill_boxes(self.img, self.box_coords)
+        else:
+            for trace in self.modality.edited_traces:
+                values = getattr(self, trace + '_values')
+                # An annotation entirely inside the boxes is left unchanged, as there is nothing to join.
+                anomalies = trace_in_boxes(values, self.box_coords)
+                if not anomalies.all():
+                    setattr(self, trace + '_values', fill_gaps(values, anomalies))
+            self.img_annotated = self.draw_annotation(self.top_values, self.bottom_values)
+            self.box_coords = []
+        return self.display_img
+
+    def undo(self):
+        """
+        Undoes changes depending on the stage of the analysis. A DICOM frame goes back to the original frame so a new
+        crop can be taken. Before the model has run, the image goes back to the uploaded or cropped image. After the
+        model has run, the annotation goes back to the one first made by the model.
+
+        :return display_img: Image to display, or None if only the DICOM frame is left to display.
+        """
+        if self.dicom_upload:
+            self.dcm_box_coords = []
+            self.dicom_img = self.dicom_original.copy()
+
+        if self.anomaly_mode == 1 and self.img is not None:
+            self.img = self.original_img.copy()
+            self.box_coords = []
+            return self.img
+        elif self.anomaly_mode == 2:
+            self.box_coords = []
+            self.top_values = self.og_top_values.copy()
+            self.bottom_values = self.og_bottom_values.copy()
+            return self.remove_anomalies()
+        return None
+
+    def reset_image(self):
+        """
+        Completely resets img to original_img, regardless of which stage of the analysis has been reached.
+        """
+        self.img = self.original_img.copy()
+        self.box_coords = []
+        self.cine_diameters = None
+        self.anomaly_mode = 1
+
+    def split_image(self, scale_length=None):
+        """
+        Resizes img to a height of 512 pixels and cuts it into the 512x512 square images used by the segmentation
+        model. The final square overlaps the previous one if the width is not divisible by 512.
+        For DICOM images, also calculates the conversion from pixels to units, pix_scale, from the length of the DICOM
+        scale.
+
+        :param scale_length: Length of the DICOM scale entered by the user. Not needed for .png images.
+
+        :return square_crops: List of square Image objects.
+        """
+        if self.dicom_upload:
+            if scale_length is None:
+                raise ValueError("Please input DICOM scale before proceeding.")
+            self.pix_scale = (scale_length / dicom_scale_pixels) * (self.img.height / square_size)
+
+        self.img = resize_for_model(self.img)
+        return split_squares(self.img)
+
+    def set_predictions(self, predictions, probability_map=None):
+        """
+        Saves new model predictions. Any joined map of the previous predictions is replaced, and anomaly removal moves
+        on to editing the annotation.
+
+        :param predictions: List of predictions, one per square image.
+        :param probability_map: ProbabilityMap of the predictions if already made, e.g. by
+                                models.segment_squares().
+        """
+        self.predictions = predictions
+        self.probability_map = probability_map
+        self.cine_diameters = None  # Single image analysis replaces any cine results
+        self.anomaly_mode = 2
+
+    def set_mask_threshold(self, threshold):
+        """
+        :param threshold: New mask threshold, limited to between 0 and 1.
+        """
+        self.mask_threshold = min(max(threshold, 0), 1)
+
+    def draw_annotation(self, top_values, bottom_values):
+        """
+        :return annotated_image: Copy of img with the traces drawn line_width pixels thick, outwards from the mask.
+        """
+        top, bottom = np.asarray(top_values), np.asarray(bottom_values)
+        traces = []
+        for i in range(self.modality.line_width):
+            traces += [top - i, bottom + i]
+        return draw_traces(self.img, traces)
+
+    def annotate(self):
+        """
+        Outlines the predicted mask at mask_threshold on a copy of img. The predictions are joined into probability_map
+        the first time, so changing the threshold afterwards only re-thresholds the joined map.
+        Saves og_top_values and og_bottom_values in case the user undoes later changes.
+
+        :return img_annotated: Annotated image, or None if the model has not run yet.
+        """
+        if len(self.predictions) == 0:
+            return None
+        if self.probability_map is None:
+            self.probability_map = ProbabilityMap(self.predictions, self.img.width)
+
+        try:
+            top_y_values, bottom_y_values = self.probability_map.outline(self.mask_threshold)
+        except ValueError:  # Nothing in the image is above the threshold
+            raise ValueError(self.modality.not_found)
+
+        self.top_values = top_y_values.copy()
+        self.bottom_values = bottom_y_values.copy()
+        self.og_top_values = top_y_values.copy()
+        self.og_bottom_values = bottom_y_values.copy()
+        self.img_annotated = self.draw_annotation(top_y_values, bottom_y_values)
+        return self.img_annotated
+
+    def set_cine_diameters(self, diameters, rate, crop_height, scale_length):
+        """
+        Saves the diameter of every frame of a cine from cine.cine_diameters(), converted with the DICOM scale.
+
+        :param diameters, rate, crop_height: As returned by cine_diameters().
+        :param scale_length: Length of the DICOM scale entered by the user.
+        """
+        self.pix_scale = (scale_length / dicom_scale_pixels) * (crop_height / square_size)
+        self.cine_diameters = diameters * self.pix_scale
+        self.cine_frame_rate = rate
+
+    def data(self):
+        """
+        Data extracted from the image, the distance between the top and bottom traces in every pixel column converted
+        to units, or the diameter of every frame if a whole cine has been analysed.
+
+        :return data: 1D array.
+        """
+        if self.cine_diameters is not None:
+            return self.cine_diameters.copy()
+        self.top_values = np.array(self.top_values)
+        self.bottom_values = np.array(self.bottom_values)
+        pixels = self.bottom_values - self.top_values
+        return pixels * (self.pix_scale if self.dicom_upload else self.modality.png_scale)
+
+    def time(self):
+        """
+        :return t: Time of each element of data(), from the frame rate of a cine, or the width of the image.
+        """
+        if self.cine_diameters is not None:
+            return np.arange(len(self.cine_diameters)) / self.cine_frame_rate
+        return np.arange(self.img.width) * seconds_per_pixel  # Convert pixels to seconds
+
+    def sampling_frequency(self):
+        """
+        :return sampling_frequency: Samples per second of data(), the frame rate of a cine, or the pixel columns per
+                                    second of the image.
+        """
+        if self.cine_diameters is not None:
+            return self.cine_frame_rate
+        return 1 / seconds_per_pixel
@@ -0,0 +1,316 @@
+import math
+import numpy as np
+from PIL import Image, ImageDraw
+from scipy import ndimage
+
+
+# Image editing shared by 'VelocityImage' and 'DiameterImage', independent of the GUI.
+# Edits only touch the pixels they change, instead of visiting every pixel of the image with getpixel()/putpixel().
+
+box_colour = (0, 255, 0)  # Green
+background_colour = (0, 0, 0)  # Black
+annotation_colour = (255, 255, 0)  # Yellow
+square_size = 512  # Side length of the square images used by the image segmentation models
+
+
+def draw_box(original_img, box_coords, colour=box_colour):
+    """
+    Takes an image and array of coordinates in order to draw a box on the image and return the edited version.
+    Only the outline is drawn, as four lines, so the time taken does not depend on the size of the image. Corner pixels
+    are left unchanged, as they were when the box was drawn pixel by pixel.
+
+    :param original_img: Image object to be edited by function. Box drawn on it at specified coordinates.
+    :param box_coords: Array containing coordinates of diagonally opposing corners of the box to be drawn. The last four
+                       values are used.
+    :param colour: Colour of the box.
+
+    :return box_img: Image object which is the original image but with box drawn on.
+    """
+    box_img = original_img.copy()
+    x1, y1 = round(box_coords[-4]), round(box_coords[-3])
+    x2, y2 = round(box_coords[-2]), round(box_coords[-1])
+    left, right = min(x1, x2), max(x1, x2)
+    top, bottom = min(y1, y2), max(y1, y2)
+
+    # Lines between the corners, excluding the corners themselves. Lines outside the image are clipped by PIL.
+    draw = ImageDraw.Draw(box_img)
+    if right - left > 1:
+        draw.line([(left + 1, y1), (right - 1, y1)], fill=colour)
+        draw.line([(left + 1, y2), (right - 1, y2)], fill=colour)
+    if bottom - top > 1:
+        draw.line([(x1, top + 1), (x1, bottom - 1)], fill=colour)
+        draw.line([(x2, top + 1), (x2, bottom - 1)], fill=colour)
+
+    return box_img
+
+
+def colour_mask(img_array, colour):
+    """
+    Boolean mask of the pixels of an image array which are exactly one colour. For arrays with an alpha channel, only
+    opaque pixels match.
+
+    :param img_array: (height, width, 3) RGB or (height, width, 4) RGBA array.
+    :param colour: (R, G, B) colour to find.
+
+    :return mask: 2D boolean array, True where the pixel is the colour.
+    """
+    mask = np.all(img_array[..., :3] == colour, axis=-1)
+    if img_array.shape[-1] == 4:
+        mask &= img_array[..., 3] == 255
+    return mask
+
+
+def replace_colour(img, colour=box_colour, replacement=background_colour):
+    """
+    Replaces every pixel of one exact colour with another in a single masked array operation.
+    For images with an alpha channel, only opaque pixels match, and replaced pixels are left opaque.
+
+    :param img: RGB or RGBA Image object.
+    :param colour: (R, G, B) colour to be replaced.
+    :param replacement: (R, G, B) colour to replace it with.
+
+    :return new_img: New Image object with the colour replaced.
+    """
+    img_array = np.array(img)
+    img_array[colour_mask(img_array, colour), :3] = replacement
+
+    return Image.fromarray(img_array, img.mode)
+
+
+def crop_image(img, box_coords):
+    """
+    Crops an image to the box drawn by the user, removing any pixels of the box outline which are left inside the crop.
+
+    :param img: RGB or RGBA Image object with a box drawn on it by draw_box().
+    :param box_coords: Array containing coordinates of diagonally opposing corners of the box. The first four values are
+                       used.
+
+    :return cropped_img: New Image object containing only the area inside the box.
+    """
+    x1, y1 = round(box_coords[0]), round(box_coords[1])
+    x2, y2 = round(box_coords[2]), round(box_coords[3])
+    left, right = min(x1, x2), max(x1, x2)
+    top, bottom = min(y1, y2), max(y1, y2)
+    cropped_img = img.crop((left, top, right, bottom))
+
+    # Remove stray coloured pixels left from the box drawn on the image. In certain situations they are not cropped out.
+    # Only the cropped area is converted to an array, never the whole frame.
+    return replace_colour(cropped_img)
+
+
+def box_mask(shape, box_coords):
+    """
+    Boolean mask of the pixels inside any of the boxes drawn by the user, including their edges. Each box only sets its
+    own rectangle of the mask, so the cost grows with the area of the boxes rather than boxes x image area.
+
+    :param shape: (height, width) of the image.
+    :param box_coords: Array of box corner coordinates, four values (x1, y1, x2, y2) per box.
+
+    :return mask: 2D boolean array, True inside the boxes.
+    """
+    height, width = shape
+    mask = np.zeros((height, width), dtype=bool)
+    for box in np.reshape(box_coords, (-1, 4)):
+        x1, y1, x2, y2 = box
+        # Pixels whose coordinates lie within the box, clipped to the image
+        left, right = max(math.ceil(min(x1, x2)), 0), min(math.floor(max(x1, x2)), width - 1)
+        top, bottom = max(math.ceil(min(y1, y2)), 0), min(math.floor(max(y1, y2)), height - 1)
+        if right < left or bottom < top:  # Box lies wholly outside the image, or between two pixels
+            continue  # Negative ends would otherwise wrap round to the far edge of the image
+        mask[top:bottom + 1, left:right + 1] = True
+
+    return mask
+
+
+def fill_boxes(img, box_coords, colour=background_colour):
+    """
+    Fills every box drawn by the user in one operation, and removes any remaining box outline pixels so they are not
+    detected by the image segmentation model.
+
+    :param img: RGB or RGBA Image object.
+    :param box_coords: Array of box corner coordinates, four values (x1, y1, x2, y2) per box.
+    :param colour: (R, G, B) colour to fill the boxes with.
+
+    :return filled_img: New Image object with the boxes filled in.
+    """
+    img_array = np.array(img)
+    mask = box_mask(img_array.shape[:2], box_coords)
+
+    mask |= colour_mask(img_array, box_colour)  # Remove any remaining green pixels. Prevents some strange behaviour.
+    img_array[mask, :3] = colour
+    if img_array.shape[-1] == 4:
+        img_array[mask, 3] = 255  # Filled pixels are opaque, as with putpixel()
+
+    return Image.fromarray(img_array, img.mode)
+
+
+def fill_gaps(values, missing):
+    """
+    Replaces missing values with a straight line joining the nearest values at either side, in a single np.interp()
+    call. Missing values before the first or after the last known value take the nearest known value.
+
+    :param values: 1D array of values.
+    :param missing: 1D boolean array, True where values are missing.
+
+    :return filled: New float array with the missing values filled in.
+    """
+    values = np.asarray(values, dtype=float)
+    known = np.flatnonzero(~missing)
+    if len(known) == 0:
+        raise ValueError("No known values to fill gaps from.")
+
+    filled = values.copy()
+    gaps = np.flatnonzero(missing)
+    filled[gaps] = np.interp(gaps, known, values[known])
+    return filled
+
+
+def trace_in_boxes(trace, box_coords):
+    """
+    Finds the points of an annotation trace which lie inside any of the boxes drawn by the user, including their edges.
+
+    :param trace: 1D array giving the row of the trace in every column of the image.
+    :param box_coords: Array of box corner coordinates, four values (x1, y1, x2, y2) per box.
+
+    :return inside: 1D boolean array, True where the trace is inside a box.
+    """
+    trace = np.asarray(trace, dtype=float)
+    columns = np.arange(len(trace))
+    inside = np.zeros(len(trace), dtype=bool)
+    for x1, y1, x2, y2 in np.reshape(box_coords, (-1, 4)):
+        inside |= ((min(x1, x2) <= columns) & (columns <= max(x1, x2)) &
+                   (min(y1, y2) <= trace) & (trace <= max(y1, y2)))
+    return inside
+
+
+def mask_outline(mask):
+    """
+    Finds the top and bottom foreground pixel of every column of a segmentation mask, with array reductions over the
+    whole mask. Columns with no foreground pixels are filled by fill_gaps() from the columns either side.
+
+    :param mask: 2D array, non-zero where the model found the waveform or artery.
+
+    :return top_y_values, bottom_y_values: Integer arrays of the row of the top and bottom foreground pixel in each
+                                           column.
+    """
+    foreground = np.asarray(mask) > 0
+    height = foreground.shape[0]
+    empty = ~foreground.any(axis=0)
+
+    top_y_values = np.argmax(foreground, axis=0)
+    bottom_y_values = height - 1 - np.argmax(foreground[::-1], axis=0)
+
+    if empty.any():
+        if empty.all():
+            raise ValueError("The mask has no foreground pixels.")
+        top_y_values = np.rint(fill_gaps(top_y_values, empty)).astype(int)
+        bottom_y_values = np.rint(fill_gaps(bottom_y_values, empty)).astype(int)
+
+    return top_y_values, bottom_y_values
+
+
+def draw_traces(img, traces, colour=annotation_colour):
+    """
+    Draws lines on an image, one pixel in each column, using fancy indexing instead of visiting every pixel.
+
+    :param img: RGB or RGBA Image object.
+    :param traces: List of 1D arrays, each giving the row of the line in every column of the image. Values are rounded
+                   to the nearest pixel, and rows outside the image are skipped.
+    :param colour: (R, G, B) colour of the lines.
+
+    :return annotated_img: New Image object with the lines drawn on.
+    """
+    img_array = np.array(img)
+    height, width = img_array.shape[:2]
+    for trace in traces:
+        rows = np.rint(np.asarray(trace[:width], dtype=float)).astype(int)
+        columns = np.arange(len(rows))
+        inside = (rows >= 0) & (rows < height)
+        img_array[rows[inside], columns[inside], :3] = colour
+        if img_array.shape[-1] == 4:
+            img_array[rows[inside], columns[inside], 3] = 255
+
+    return Image.fromarray(img_array, img.mode)
+
+
+def resize_for_model(img):
+    """
+    Resizes an image to have height square_size, keeping its aspect ratio, in order to be compatible with the model.
+
+    :param img: Image object.
+
+    :return resized_img: Resized Image object.
+    """
+    aspect_ratio = img.width / img.height
+    new_width = round(square_size * aspect_ratio)
+    return img.resize((new_width, square_size), Image.LANCZOS)
+
+
+def split_squares(img):
+    """
+    Crops an image of height square_size into the necessary number of square images. The final crop is taken backwards
+    from the end of the image, so may overlap with the previous one if the width is not divisible by square_size.
+
+    :param img: Image object resized by resize_for_model().
+
+    :return square_crops: List of square Image objects, from left to right.
+    """
+    num_squares = math.ceil(img.width / square_size)  # No. squares img must be cropped into. Always rounded up
+    square_crops = []
+    for i in range(num_squares - 1):
+        left_edge = i * square_size
+        square_crops.append(img.crop((left_edge, 0, left_edge + square_size, square_size)))
+
+    square_crops.append(img.crop((img.width - square_size, 0, img.width, square_size)))
+    return square_crops
+
+
+class ProbabilityMap:
+    """
+    Model predictions for a whole image strip, joined once so that the mask threshold can be changed without repeating
+    any work on the square images. Connected components are found on the joined strip rather than on each square, and
+    the outline found at each threshold is kept, so returning to a threshold already tried costs nothing.
+
+    :param predictions: List of predictions of shape (1, 512, 512, 1) for the squares from split_squares(), in order.
+    :param width: Width of the resized image the predictions were made from.
+    :param min_size: Smallest group of mask pixels which is kept. Smaller groups are not part of the waveform or artery.
+    """
+
+    def __init__(self, predictions, width, min_size=40000):
+        self.min_size = min_size
+        self.probability = np.zeros((square_size, width), dtype=np.float32)
+        # The final square is placed backwards from the end, as it overlaps the previous one if width is not divisible
+        # by 512
+        for i, prediction in enumerate(predictions[:-1]):
+            self.probability[:, i * square_size:(i + 1) * square_size] = prediction[0, :, :, 0]
+        self.probability[:, width - square_size:] = predictions[-1][0, :, :, 0]
+        self._outlines = {}
+
+    def mask(self, threshold):
+        """
+        Binary mask of the strip at a threshold, with groups of pixels smaller than min_size removed. Group sizes are
+        counted with a single np.bincount() over the labelled strip.
+
+        :param threshold: Mask threshold between 0 and 1.
+
+        :return mask: 2D boolean array.
+        """
+        labels = ndimage.label(self.probability > threshold, structure=np.ones((3, 3)))[0]  # Diagonals connect
+        keep = np.bincount(labels.ravel()) >= self.min_size
+        keep[0] = False  # Background
+        return keep[labels]
+
+    def outline(self, threshold):
+        """
+        Top and bottom of the mask in every column at a threshold, from mask_outline(). Results are kept for every
+        threshold used, so the arrays returned must not be edited.
+
+        :param threshold: Mask threshold between 0 and 1.
+
+        :return top_y_values, bottom_y_values: Integer arrays of the row of the top and bottom mask pixel in each
+                                               column.
+        """
+        key = round(float(threshold), 6)
+        if key not in self._outlines:
+            self._outlines[key] = mask_outline(self.mask(threshold))
+        return self._outlines[key]
@@ -0,0 +1,591 @@
+import tkinter as tk
+from tkinter import messagebox
+from tkinter.filedialog import askopenfilename
+import numpy as np
+import config
+from imageengine import match_length
+from models import backends, get_model, segment_squares
+from plotarea import PlotArea
+from worker import BackgroundTask
+
+import logging
+logging.getLogger('tensorflow').setLevel(logging.ERROR)
+
+
+# GUI page shared by 'VelocityImage' and 'DiameterImage', which extract a waveform from an ultrasound image.
+# Every step of the analysis is carried out by an ImageAnalysis from 'imageengine.py'. This page displays its images,
+# passes on the user's clicks and entries, and runs the segmentation model on a worker thread. Each image page only
+# adds the widgets and saving which belong to its modality.
+
+class ImagePage(tk.Frame):
+    """
+    Page for extracting a waveform from a velocity or diameter ultrasound image.
+    Subclasses must override the analysis property, returning their ImageAnalysis from the session, and save_data().
+
+    :param parent: Container frame of the GUI.
+    :param controller: Main window, holding the session.
+    :param modality: Modality from 'imageengine.py', velocity or diameter.
+    :param model_name: Name of the segmentation model file, e.g. models.velocity_model.
+    """
+    weighted_rows = (0, 1, 2, 3, 4)  # Rows of the page which share any spare height
+
+    def __init__(self, parent, controller, modality, model_name):
+        tk.Frame.__init__(self, parent, bg=config.bg_col)
+        self.controller = controller
+        self.modality = modality
+        self.model_name = model_name
+        self.task = None  # BackgroundTask running the segmentation model, if any
+        self.shown_analysis = self.analysis  # ImageAnalysis displayed by this page
+
+        self.grid_rowconfigure(self.weighted_rows, weight=1)                    # Configure rows to split evenly.
+        self.grid_columnconfigure((0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10), weight=1)  # Configure columns to split evenly.
+
+        # Define frame to hold the buttons relating to anomaly removal
+        button_frame = tk.Frame(self, bg=config.frame_col, relief='flat', highlightbackground=config.frame_border_col,
+                                highlightthickness=2)
+        button_frame.place(x=140, y=495)
+
+        # Labels for anomaly removal button frame
+        lbl_anomaly_tools = tk.Label(button_frame, text="Anomaly Removal Tools", font=('Roboto', 13, 'bold'),
+                                     bg=config.frame_col, fg=config.lbl_text_col)
+        lbl_click_to = tk.Label(button_frame, text="Click image to draw boxes around anomalies", font=('Roboto', 11),
+                                bg=config.frame_col, fg=config.lbl_text_col)
+
+        self.ent_scale = tk.Entry(self, font=('Roboto', 12), width=16, bg=config.frame_col)
+        lbl_enter_scale = tk.Label(self, text="             Enter length of DICOM scale:", font=('Roboto', 12),
+                                   bg=config.bg_col, fg=config.lbl_text_col)
+
+        # Define buttons which call anomaly removal functions
+        btn_remove_anomalies = tk.Button(
+            button_frame,
+            text="Remove anomalies",
+            font=config.font,
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=19,
+            height=config.btn_height,
+            command=lambda: self.remove_anomaly_press()
+        )
+        btn_undo = tk.Button(
+            button_frame,
+            text="Undo",
+            font=config.font,
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            command=lambda: self.undo_changes()
+        )
+        self.btn_reset = tk.Button(
+            button_frame,
+            text="Reset",
+            font=config.font,
+            bg=config.red,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            command=lambda: self.reset_image()
+        )
+        self.btn_crop_dicom = tk.Button(
+            self,
+            text="Crop DICOM",
+            font=('Roboto', 13),
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            command=lambda: self.crop_dicom()
+        )
+
+        # Define other buttons used in the GUI frame: Back, Select File, Run Model, and Save Data.
+        self.btn_back = tk.Button(
+            self,
+            text="Back",
+            font=config.font,
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=config.btn_width,
+            height=config.btn_height,
+            command=lambda: controller.show_frame("InputPage")
+        )
+        self.btn_select_image = tk.Button(
+            self,
+            text="Select file",
+            font=('Roboto', 13),
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            command=lambda: self.choose_file()
+        )
+        btn_run_model = tk.Button(
+            self,
+            text="Run model",
+            font=('Roboto', 13),
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            command=lambda: self.run_model()
+        )
+        self.btn_save_exit = tk.Button(
+            self,
+            text="Save and exit",
+            font=('Roboto', 13),
+            bg=config.dark_green,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            command=lambda: self.save_and_exit()
+        )
+
+        self.btn_cancel = tk.Button(
+            self,
+            text="Cancel",
+            font=('Roboto', 13),
+            bg=config.red,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=14,
+            height=config.btn_height,
+            state=tk.DISABLED,
+            command=lambda: self.cancel_task()
+        )
+
+        # Label showing progress of the segmentation model while it runs
+        self.progress_text = tk.StringVar(value="")
+        lbl_progress = tk.Label(self, textvariable=self.progress_text, font=('Roboto', 12), bg=config.bg_col,
+                                fg=config.lbl_text_col)
+
+        # Spinbox which adjusts mask threshold value. Defaults to the mask threshold of the modality
+        self.spinbox_value = tk.StringVar(value=self.analysis.mask_threshold)
+        spinbox = tk.Spinbox(
+            button_frame,
+            from_=0,
+            to=1,
+            width=9,
+            increment=0.05,
+            bg='#FFFFFF',
+            fg=config.frame_border_col,
+            font=('Roboto', 14),
+            relief=tk.FLAT,
+            textvariable=self.spinbox_value,
+            command=lambda: self.change_mask_threshold()
+        )
+        lbl_spinbox = tk.Label(button_frame, text=" Mask threshold:", font=('Roboto', 13), bg=config.frame_col,
+                               fg=config.lbl_text_col)
+
+        # Dropdown which chooses how the segmentation model is run. Defaults to Keras
+        self.backend = tk.StringVar(value=controller.session.model_backend)
+        drop_backend = tk.OptionMenu(self, self.backend, *backends, command=self.change_backend)
+        drop_backend.config(font=('Roboto', 11))
+        drop_backend.config(
+            bg=config.drop_col,
+            fg=config.drop_text,
+            activebackground=config.drop_col_a,
+            activeforeground=config.drop_text_a,
+            relief=tk.FLAT,
+        )
+        lbl_backend = tk.Label(self, text="Inference backend:", font=('Roboto', 12), bg=config.bg_col,
+                               fg=config.lbl_text_col)
+
+        # Create a blank plot to save space for user input image. Every image and plot is then drawn on this figure
+        self.plot = PlotArea(self, (10, 4.9), row=0, column=0, columnspan=11)
+        self.empty_plot()
+
+        # Arrange all widgets for this frame
+        lbl_anomaly_tools.grid(row=0, column=0, columnspan=2, padx=5, pady=5)
+        lbl_click_to.grid(row=1, column=0, columnspan=2, padx=5, pady=5)
+
+        btn_remove_anomalies.grid(row=2, column=0, columnspan=2, padx=5, pady=5)
+        btn_undo.grid(row=3, column=0, padx=5, pady=5)
+        self.btn_reset.grid(row=3, column=1, padx=5, pady=5)
+
+        lbl_spinbox.grid(row=4, column=0, padx=5, pady=5)
+        spinbox.grid(row=4, column=1, padx=5, pady=5)
+
+        self.btn_select_image.grid(row=2, column=8, padx=5, pady=10)
+        self.btn_crop_dicom.grid(row=2, column=9, padx=5, pady=10)
+        lbl_enter_scale.grid(row=1, column=8, padx=5, pady=10)
+        self.ent_scale.grid(row=1, column=9, padx=5, pady=10)
+        btn_run_model.grid(row=3, column=8, padx=5, pady=10)
+        self.btn_save_exit.grid(row=3, column=9, padx=5, pady=10)
+        lbl_backend.grid(row=4, column=8, padx=5, pady=10)
+        drop_backend.grid(row=4, column=9, padx=5, pady=10)
+        lbl_progress.grid(row=3, column=10, padx=5, pady=10)
+        self.btn_cancel.grid(row=4, column=10, padx=5, pady=10)
+
+        self.btn_back.grid(row=4, column=0, padx=5, pady=5, sticky='w')
+
+    @property
+    def task_running(self):
+        """
+        :return task_running: True while the segmentation model or cine analysis is running on the worker thread.
+        """
+        return self.task is not None and self.task.running
+
+    def is_current(self, analysis, img):
+        """
+        Checks whether a task's result still belongs on this page, as the session may have been reset or the image
+        changed while it ran.
+
+        :param analysis: ImageAnalysis the task was started for.
+        :param img: Image the task was started from, analysis.img at the time.
+
+        :return is_current: True if analysis is still this page's analysis and still holds img.
+        """
+        return analysis is self.analysis and analysis.img is img
+
+    def tkraise(self):
+        """
+        Shows this frame. If a new analysis has been started by session.reset() since it was last shown, the old image
+        and DICOM scale are cleared. The mask threshold and inference backend are always shown as saved in the session.
+        """
+        super().tkraise()
+        if self.analysis is not self.shown_analysis:
+            self.shown_analysis = self.analysis
+            self.empty_plot()
+            self.ent_scale.delete(0, tk.END)
+        self.spinbox_value.set(self.analysis.mask_threshold)
+        self.backend.set(self.controller.session.model_backend)
+
+    @property
+    def analysis(self):
+        """
+        Required override: every image page returns its own ImageAnalysis from the session, which is looked up on each
+        call, as the session creates a new one when the user resets.
+
+        :return analysis: ImageAnalysis of this page in the current session, e.g. session.u_analysis.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must override the 'analysis' property")
+
+    def save_data(self):
+        """
+        Required override, called by 'btn_save_exit' once the image has been analysed: every image page copies its
+        waveform into the session for the rest of the GUI, e.g. as session.u_data.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must override save_data()")
+
+    def empty_plot(self):
+        """
+        Clears the plot, leaving a blank space for the user's image.
+        """
+        fig, ax = self.plot.subplots()
+        ax.axis('off')  # Hide the axes
+        fig.tight_layout()
+        self.plot.connect_click(None)
+        self.plot.draw()
+
+    def choose_file(self):
+        """
+        Uses askopenfilename() function from tkinter.filedialog to allow the user to browse their system files and
+        choose which one to upload to the GUI. File expected in either .png or .dcm format.
+        The file is loaded by self.analysis.load(). Only the chosen frame of a .dcm file is decoded, with 80 pixels
+        deleted from the top in case patient name is there.
+        A .png image is displayed with image_plot(), and a .dcm frame with process_dicom() so the user can choose the
+        area to crop.
+        """
+        # Ensure only DICOM or PNG files can be selected
+        file_path = askopenfilename(filetypes=[("DICOM files", "*.dcm"), ("PNG files", "*.png")])
+        if not self.analysis.load(file_path):
+            return
+
+        if self.analysis.dicom_upload:
+            self.process_dicom()
+        else:
+            self.image_plot(self.analysis.img)
+
+    def process_dicom(self):
+        """
+        Displays DICOM frame in GUI. Allows user to click to draw a box around the area of interest, using function
+        on_click(). Each click is saved by self.analysis.add_crop_point(), which draws the box once both corners have
+        been clicked.
+        """
+        analysis = self.analysis
+        fig, ax = self.plot.subplots()
+        img_display = ax.imshow(analysis.dicom_img, cmap='gray')  # Keep a reference to the image plot for editing
+        fig.tight_layout()
+
+        # Stuff for detecting mouse clicks on plot
+        def on_click(event):
+            if event.inaxes is not None:  # Check if the click was inside the plot axes.
+                analysis.add_crop_point(event.xdata, event.ydata)
+                img_display.set_data(analysis.dicom_img)  # Edit image in plot and redraw canvas.
+                self.plot.draw()
+
+        self.plot.connect_click(on_click)  # Bind on_click function to mouse click events.
+        self.plot.draw()
+
+    def crop_dicom(self):
+        """
+        Crops the DICOM frame to the box drawn by the user, using self.analysis.crop_dicom().
+        Activated by GUI button 'btn_crop_dicom'.
+        The cropped image is treated in the same way as an uploaded .png from then on.
+        Calls image_plot() to display the new cropped image and allow user to proceed with analysis.
+        """
+        self.analysis.crop_dicom()
+        self.image_plot(self.analysis.img)
+
+    def image_plot(self, display_img):
+        """
+        Displays image in GUI. Allows user to click to draw a box around anomalies, using function on_click().
+        Each click is saved by self.analysis.add_box_point(), which draws each box once both corners have been
+        clicked, on the original or annotated image depending on self.analysis.anomaly_mode.
+
+        :param display_img: Image object to be displayed in the plot and edited.
+        """
+        analysis = self.analysis
+        fig, ax = self.plot.subplots()
+        img_display = ax.imshow(display_img, cmap='gray')  # Keep a reference to the image plot for editing
+        fig.tight_layout()
+
+        # Stuff for detecting mouse clicks on plot and removing anomalies
+        def on_click(event):
+            if event.inaxes is not None:  # Check if the click was inside the plot axes
+                analysis.add_box_point(event.xdata, event.ydata)
+                img_display.set_data(analysis.display_img)  # Update plot with any new box and redraw canvas.
+                self.plot.draw()
+
+        self.plot.connect_click(on_click)  # Bind on_click function to mouse click events.
+        self.plot.draw()
+
+    def scale_length(self):
+        """
+        :return scale_length: Length of DICOM scale entered by the user in 'ent_scale', or None if it is not a number.
+        """
+        try:
+            return float(self.ent_scale.get())
+        except ValueError:
+            return None
+
+    def run_model(self):
+        """
+        Called when user presses GUI button 'btn_run_model'.
+        Splits the image into the 512x512 squares used by the model with self.analysis.split_image(), which also finds
+        the conversion from pixels to units for DICOM images.
+        Gets self.model_name from the model registry in 'models.py', which only loads it from disk the first time it is
+        used, and runs it on every square with segment_squares(), session.model_batch_size at a time, using the
+        inference backend chosen in 'drop_backend', session.model_backend.
+        The model is loaded and run on a worker thread with start_task(), so the GUI stays responsive.
+        model_finished() is called when it is done.
+        """
+        if self.task_running:  # Model is already running
+            return
+        session = self.controller.session
+        analysis = self.analysis
+        try:
+            model_images = analysis.split_image(self.scale_length())  # Split image into usable 512x512 squares.
+        except ValueError as error:  # DICOM scale has not been entered
+            messagebox.showwarning("Warning", str(error))
+            return
+
+        # Copied here, as the worker thread must not read the session while the user can change it
+        model_name = self.model_name
+        backend_name = session.model_backend
+        batch_size = session.model_batch_size
+        threshold = analysis.mask_threshold
+        img = analysis.img
+        width = img.width
+
+        def segment(progress):
+            loaded_model = get_model(model_name, backend_name)  # Only loaded from disk the first time
+            return segment_squares(loaded_model, model_images, width, threshold, batch_size, progress)
+
+        self.start_task(segment, lambda result: self.model_finished(result, analysis, img),
+                        f'Segmenting {self.modality.name} image')
+
+    def model_finished(self, result, analysis, img):
+        """
+        Called on the main thread when the worker thread started by run_model() has finished.
+        Saves the predictions and their joined probability map to the analysis they were found for, then calls
+        process_predictions() to display them. They are discarded if the session has been reset or the image changed
+        since the model started, so they are never drawn onto a different image.
+
+        :param result: Predictions and ProbabilityMap returned by segment_squares().
+        :param analysis: ImageAnalysis the model was run for.
+        :param img: Image the model was run on.
+        """
+        if not self.is_current(analysis, img):
+            self.progress_text.set("Discarded, as the image has changed")
+            return
+        analysis.set_predictions(*result)
+        self.process_predictions()
+
+    def start_task(self, work, on_done, description):
+        """
+        Runs slow work on a worker thread with BackgroundTask from 'worker.py'. Progress is shown in 'lbl_progress' and
+        'btn_cancel' is enabled until the work finishes. The buttons which change the image or leave the page are
+        disabled until then with set_image_buttons(). Results are handed back to the main thread with after(), so
+        widgets and session data are only changed there.
+
+        :param work: Function called on the worker thread with a progress(done, total) function.
+        :param on_done: Function called on the main thread with the value returned by work.
+        :param description: Text shown in 'lbl_progress' while the work runs.
+        """
+        def show_progress(done, total):
+            self.progress_text.set(f"{description}: {done}/{total}")
+
+        def end_task(message):
+            self.progress_text.set(message)
+            self.btn_cancel.config(state=tk.DISABLED)
+            self.set_image_buttons(tk.NORMAL)
+
+        def finished(result):
+            end_task("")
+            on_done(result)
+
+        def failed(error):
+            end_task("")
+            messagebox.showwarning("Warning", f"{description} failed: {error}")
+
+        self.progress_text.set(description + "...")
+        self.btn_cancel.config(state=tk.NORMAL)
+        self.set_image_buttons(tk.DISABLED)
+        self.task = BackgroundTask(self, work, finished, on_progress=show_progress,
+                                   on_cancel=lambda: end_task("Cancelled"), on_error=failed).start()
+
+    def set_image_buttons(self, state):
+        """
+        Enables or disables every button which changes the image or leaves the page, so none can be used while a task
+        is running on the image.
+
+        :param state: tk.NORMAL or tk.DISABLED.
+        """
+        for button in (self.btn_select_image, self.btn_reset, self.btn_crop_dicom, self.btn_back, self.btn_save_exit):
+            button.config(state=state)
+
+    def cancel_task(self):
+        """
+        Called when user presses GUI button 'btn_cancel'. Stops the running model after its current batch of images.
+        """
+        if self.task is not None:
+            self.task.cancel()
+
+    def process_predictions(self):
+        """
+        Outlines the model predictions at the mask threshold with self.analysis.annotate(), and displays the annotated
+        image using image_plot().
+        The predictions are joined into a single probability map the first time, so changing the threshold only
+        re-thresholds the joined map. Default threshold value can be adjusted in 'imageengine.py', and user can change
+        it manually with entry box in GUI.
+        """
+        try:
+            annotated_image = self.analysis.annotate()
+        except ValueError as error:  # Nothing in the image is above the threshold
+            messagebox.showwarning("Warning", str(error))
+            return
+        if annotated_image is not None:  # Model has been run
+            self.image_plot(annotated_image)
+
+    def undo_changes(self):
+        """
+        Called when user presses GUI button 'btn_undo'. Function differs depending on the stage of the image analysis
+        process, as described in ImageAnalysis.undo().
+        Displays the image which has been reverted using image_plot(), or the original DICOM frame using
+        process_dicom() so a new crop can be taken.
+        """
+        display_img = self.analysis.undo()
+        if display_img is not None:
+            self.image_plot(display_img)
+        elif self.analysis.dicom_upload:
+            self.process_dicom()
+
+    def reset_image(self):
+        """
+        Completely resets the image to its original state and displays using image_plot(), regardless of which stage
+        of the image analysis process has been reached. Any cine results are discarded.
+        """
+        self.analysis.reset_image()
+        self.image_plot(self.analysis.img)  # Plot the image again after resetting
+
+    def change_backend(self, choice):
+        """
+        Saves the inference backend chosen by the user in 'drop_backend' to session.model_backend. TFLite backends run
+        faster on computers without a GPU. Models are converted the first time a TFLite backend is used.
+
+        :param choice: Name of backend, one of the keys of models.backends.
+        """
+        self.controller.session.model_backend = choice
+
+    def change_mask_threshold(self):
+        """
+        Saves new mask threshold, limited to between 0 and 1, when user changes it in 'spinbox' widget.
+        Runs process_predictions() to produce and display new annotated image based on mask threshold chosen by user.
+        """
+        try:
+            # Attempt to convert the entry content to a float
+            self.analysis.set_mask_threshold(float(self.spinbox_value.get()))
+        except ValueError:
+            # If the string in the entry box cannot convert to floating point, nothing happens.
+            return
+        self.process_predictions()
+
+    def remove_anomaly_press(self):
+        """
+        Called when user presses GUI button 'btn_remove_anomalies'.
+        Removes anomalies inside the boxes drawn by the user with self.analysis.remove_anomalies(). Before the model
+        has run, boxes are filled in black so the model ignores them. After the model has run, the annotation inside
+        the boxes is replaced by a straight line. Displays the edited image with image_plot().
+        """
+        self.image_plot(self.analysis.remove_anomalies())
+
+    def match_velocity_to_diameter(self):
+        """
+        Resamples the velocity from its image onto the times of the diameter, once both images have been analysed, and
+        saves it as session.u_data. Both images have the same time per pixel column, so they are matched by length.
+        The diameter of a DICOM cine is sampled at its frame rate instead, so the velocity is interpolated on time and
+        only the time covered by both is kept, with a warning if their durations differ. session.d_data and
+        session.t_data are cut to the same time if the diameter has already been saved.
+        """
+        session = self.controller.session
+        u_analysis, d_analysis = session.u_analysis, session.d_analysis
+        t_d = d_analysis.time()
+        if d_analysis.cine_diameters is None:
+            session.u_data = match_length(u_analysis.data(), len(t_d))
+            return
+
+        t_u = u_analysis.time()
+        if abs(t_u[-1] - t_d[-1]) > 1 / d_analysis.sampling_frequency():
+            messagebox.showwarning("Warning", f"The velocity image lasts {t_u[-1]:.2f} s but the diameter cine lasts "
+                                              f"{t_d[-1]:.2f} s. Only the first {min(t_u[-1], t_d[-1]):.2f} s of "
+                                              f"each will be used.")
+        overlap = t_d <= t_u[-1]
+        session.u_data = np.interp(t_d[overlap], t_u, u_analysis.data())
+        if len(session.d_data) == len(t_d):  # Diameter has been saved already
+            session.d_data = session.d_data[overlap]
+            session.t_data = session.t_data[overlap]
+
+    def save_and_exit(self):
+        """
+        Called when user presses GUI button 'btn_save_exit'.
+        Saves data extracted from image with save_data(), to be used throughout the rest of the GUI.
+        Calls function controller.show_frame("InputPage") to return user to previous GUI page.
+        """
+        self.save_data()
+        self.controller.show_frame("InputPage")
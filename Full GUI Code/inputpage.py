@@ -3,6 +3,8 @@ from tkinter import messagebox
 from tkinter.filedialog import askopenfile
 import numpy as np
 import config
+from imagepage import ImagePage
+from models import release_models
 
 
 class InputPage(tk.Frame):
@@ -10,47 +12,57 @@ class InputPage(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=config.bg_col)
         self.controller = controller
+        session = controller.session  # Data and results of the current analysis
 
         def save_columns(x):
             """
-            Save which column of the user input data corresponds to P/U/D/t to global configuration.
+            Save which column of the user input data corresponds to P/U/D/t to the AnalysisSession.
             Called on key release every time any of the column entry boxes are edited.
-            Edits variables config.p_column/config.u_column/config.d_column/config.t_column.
+            Edits variables session.p_column/session.u_column/session.d_column/session.t_column.
 
             :param x: Arbitrary variable x which is not used. Required in this situation when binding the function to
                       entry boxes.
             """
             if ent_column_p.get().isdigit():
-                config.p_column = int(ent_column_p.get())
+                session.p_column = int(ent_column_p.get())
             if ent_column_u.get().isdigit():
-                config.u_column = int(ent_column_u.get())
+                session.u_column = int(ent_column_u.get())
             if ent_column_d.get().isdigit():
-                config.d_column = int(ent_column_d.get())
+                session.d_column = int(ent_column_d.get())
             if ent_column_t.get().isdigit():
-                config.t_column = int(ent_column_t.get())
+                session.t_column = int(ent_column_t.get())
 
         def save_units(x):
             """
-            Save the unit of measurement for P/U/D to global configuration.
+            Save the unit of measurement for P/U/D to the AnalysisSession.
             Called whenever any unit of measurement dropdown is changed in GUI.
-            Edits variables config.p_unit/config.u_unit/config.d_unit.
+            Edits variables session.p_unit/session.u_unit/session.d_unit.
 
             :param x: Arbitrary variable x which is not used. Required in this situation when binding the function to
                       dropdown boxes.
             """
-            config.p_unit = p_unit.get()
-            config.u_unit = u_unit.get()
-            config.d_unit = d_unit.get()
+            session.p_unit = p_unit.get()
+            session.u_unit = u_unit.get()
+            session.d_unit = d_unit.get()
+
+        def save_settings():
+            """
+            Saves the columns and units shown in this frame with save_columns() and save_units(). Called whenever this
+            frame is opened, as the entry boxes and dropdowns keep their values when session.reset() starts a new
+            analysis.
+            """
+            save_columns(1)
+            save_units(1)
 
         def choose_file():
             """
             Uses askopenfile() function from tkinter.filedialog to allow the user to browse their system files and
             choose which one to upload to the GUI. File expected in .txt format.
-            Data is saved to global configuration through variable config.all_data as a numpy array.
+            Data is saved to the AnalysisSession as numpy array session.all_data.
             Immediately calls process_data() once data file has been selected.
             """
-            config.all_data = askopenfile(filetypes=[("Text files", "*.txt")])
-            config.all_data = np.loadtxt(config.all_data)
+            session.all_data = askopenfile(filetypes=[("Text files", "*.txt")])
+            session.all_data = np.loadtxt(session.all_data)
             process_data()
 
         def single_file_button():
@@ -132,84 +144,80 @@ class InputPage(tk.Frame):
 
         def assign_p_data():
             """
-            Assigns data from user chosen file to config.p_data in cases when data is contained in multiple files.
+            Assigns data from user chosen file to session.p_data in cases when data is contained in multiple files.
             """
-            config.p_data = askopenfile(filetypes=[("Text files", "*.txt")])
-            config.p_data = np.loadtxt(config.p_data)
+            session.p_data = askopenfile(filetypes=[("Text files", "*.txt")])
+            session.p_data = np.loadtxt(session.p_data)
             process_data()
 
         def assign_u_data():
             """
-            Assigns data from user chosen file to config.u_data in cases when data is contained in multiple files.
+            Assigns data from user chosen file to session.u_data in cases when data is contained in multiple files.
             """
-            config.u_data = askopenfile(filetypes=[("Text files", "*.txt")])
-            config.u_data = np.loadtxt(config.u_data)
+            session.u_data = askopenfile(filetypes=[("Text files", "*.txt")])
+            session.u_data = np.loadtxt(session.u_data)
             process_data()
 
         def assign_d_data():
             """
-            Assigns data from user chosen file to config.d_data in cases when data is contained in multiple files.
+            Assigns data from user chosen file to session.d_data in cases when data is contained in multiple files.
             """
-            config.d_data = askopenfile(filetypes=[("Text files", "*.txt")])
-            config.d_data = np.loadtxt(config.d_data)
+            session.d_data = askopenfile(filetypes=[("Text files", "*.txt")])
+            session.d_data = np.loadtxt(session.d_data)
             process_data()
 
         def assign_t_data():
             """
-            Assigns data from user chosen file to config.t_data in cases when data is contained in multiple files.
+            Assigns data from user chosen file to session.t_data in cases when data is contained in multiple files.
             """
-            config.t_data = askopenfile(filetypes=[("Text files", "*.txt")])
-            config.t_data = np.loadtxt(config.t_data)
+            session.t_data = askopenfile(filetypes=[("Text files", "*.txt")])
+            session.t_data = np.loadtxt(session.t_data)
             process_data()
 
         def process_data():
             """
-            Splits data assigned by user to config.all_data into separate numpy arrays for P/U/D/t/
+            Splits data assigned by user to session.all_data into separate numpy arrays for P/U/D/t/
             Also generates time data for the user if one is not specified in their data. Sampling frequency is assigned
-            to config.sampling_frequency. Default value is 1000, but can be changed in entry box in GUI.
+            to session.sampling_frequency. Default value is 1000, but can be changed in entry box in GUI.
             """
             if single_file.get() == 1:  # Skip assigning columns if data has been upload multiple files
-                if isinstance(config.t_column, int):
-                    config.t_data = np.array(config.all_data[:, config.t_column - 1])
-                if isinstance(config.p_column, int):
-                    config.p_data = np.array(config.all_data[:, config.p_column - 1])
-                if isinstance(config.u_column, int):
-                    config.u_data = np.array(config.all_data[:, config.u_column - 1])
-                if isinstance(config.d_column, int):
-                    config.d_data = np.array(config.all_data[:, config.d_column - 1])
+                if isinstance(session.t_column, int):
+                    session.t_data = np.array(session.all_data[:, session.t_column - 1])
+                if isinstance(session.p_column, int):
+                    session.p_data = np.array(session.all_data[:, session.p_column - 1])
+                if isinstance(session.u_column, int):
+                    session.u_data = np.array(session.all_data[:, session.u_column - 1])
+                if isinstance(session.d_column, int):
+                    session.d_data = np.array(session.all_data[:, session.d_column - 1])
 
             # Detect sampling frequency if user provided time data.
-            if len(config.t_data) > 0:
-                config.sampling_frequency = 1 / (config.t_data[1] - config.t_data[0])
+            if len(session.t_data) > 0:
+                session.sampling_frequency = 1 / (session.t_data[1] - session.t_data[0])
 
             # Create time data array if one was not included in uploaded file. Default sampling frequency is 1000,
             # although user should specify the actual value in the entry box.
-            if len(config.t_data) == 0:
-                step = 1 / config.sampling_frequency
-                length = len(config.u_data)
-                config.t_data = np.arange(0, step * length, step)
+            if len(session.t_data) == 0:
+                step = 1 / session.sampling_frequency
+                length = len(session.u_data)
+                session.t_data = np.arange(0, step * length, step)
 
         def u_image_press():
             """
             Uses function controller.show_frame() to move to the 'VelocityImage' page of the GUI, used for analysing
             velocity ultrasound images.
-            Sets global variable config.image_analysis to True to signify image analysis methods are required.
-            Sets global config.anomaly_mode to 1 to reset it after potential use in 'DiameterImage' frame.
+            Sets variable session.image_analysis to True to signify image analysis methods are required.
             """
             controller.show_frame("VelocityImage")
-            config.image_analysis = True
-            config.anomaly_mode = 1
+            session.image_analysis = True
 
         def d_image_press():
             """
             Uses function controller.show_frame() to move to the 'DiameterImage' page of the GUI, used for analysing
             diameter ultrasound images.
-            Sets global variable config.image_analysis to True to signify image analysis methods are required.
-            Sets global config.anomaly_mode to 1 to reset it after potential use in 'VelocityImage' frame.
+            Sets variable session.image_analysis to True to signify image analysis methods are required.
             """
             controller.show_frame("DiameterImage")
-            config.image_analysis = True
-            config.anomaly_mode = 1
+            session.image_analysis = True
 
         def col_key_release(x):
             """
@@ -220,7 +228,7 @@ class InputPage(tk.Frame):
                       entry boxes.
             """
             save_columns(1)
-            if config.all_data is not None:  # Only execute process_data() if user has already selected data.
+            if session.all_data is not None:  # Only execute process_data() if user has already selected data.
                 process_data()
 
         def single_file_toggle():
@@ -246,13 +254,19 @@ class InputPage(tk.Frame):
         def next_button_press():
             """
             Stops progress through the GUI if the user has not selected data.
-            """
-            if len(config.u_data) != 0:
+            Image analysis is finished once the user moves on, so the segmentation models are released to free memory.
+            They are kept while an image page is still running a model on its worker thread, as releasing them would
+            clear the TensorFlow session under it.
+            """
+            if len(session.u_data) != 0:
+                image_pages = [frame for frame in controller.frames.values() if isinstance(frame, ImagePage)]
+                if session.image_analysis and not any(page.task_running for page in image_pages):
+                    release_models()
                 controller.show_frame("PtNew")
             else:
                 messagebox.showwarning("Warning", "Please upload data before proceeding.")
 
-
+        self.save_settings = save_settings  # Called by tkraise()
 
         self.grid_rowconfigure((0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10), weight=1)  # Configure rows to split evenly.
         self.grid_columnconfigure((0, 1, 2, 3, 4, 5), weight=1)               # Configure columns to split evenly.
@@ -461,3 +475,10 @@ class InputPage(tk.Frame):
 
         btn_next.grid(row=10, column=4, padx=5, pady=5)
         btn_back.grid(row=10, column=0, padx=5, pady=5)
+
+    def tkraise(self):
+        """
+        Calls function save_settings() as soon as this frame is opened in GUI.
+        """
+        super().tkraise()
+        self.save_settings()
@@ -0,0 +1,105 @@
+import numpy as np
+
+
+# Detection of the linear section of PU-loops and lnDU-loops, independent of the GUI.
+# Least squares fits for every window along the loop are found from running sums of x, y, xy, x^2 and y^2, so the
+# whole search is a handful of vectorised operations instead of one regression per window.
+
+def _window_fits(sums, starts, ends):
+    """
+    Calculates slope, intercept and R2 of ordinary least squares fits of y against x over the windows [start, end).
+
+    :param sums: Tuple of cumulative sums (n, x, y, xx, yy, xy), each starting with 0, as produced in sliding_regression().
+    :param starts: Array of window start indices.
+    :param ends: Array of window end indices (exclusive).
+
+    :return slopes, intercepts, r2_values: Arrays with one value per window.
+    """
+    n, sx, sy, sxx, syy, sxy = (s[ends] - s[starts] for s in sums)
+
+    sxx_c = sxx - sx * sx / n  # Centred sums of squares and cross products
+    syy_c = syy - sy * sy / n
+    sxy_c = sxy - sx * sy / n
+
+    # Guard against windows where x or y is constant, in the same way as sklearn's LinearRegression and r2_score.
+    # A constant x gives a slope of 0. A constant y gives R2 of 1 as the fit is perfect.
+    valid_x = sxx_c > 0
+    slopes = np.divide(sxy_c, sxx_c, out=np.zeros_like(sxy_c), where=valid_x)
+    intercepts = (sy - slopes * sx) / n
+    r2_values = np.divide(sxy_c * sxy_c, sxx_c * syy_c, out=np.zeros_like(sxy_c), where=valid_x & (syy_c > 0))
+    r2_values[syy_c <= 0] = 1
+
+    return slopes, intercepts, r2_values
+
+
+def sliding_regression(x, y, frame_size, jump, start=0):
+    """
+    Performs linear regression of y against x over frames of length frame_size, moving 'jump' indices at a time from
+    'start' to the end of the data. Also fits the whole span from 'start' to the end of each frame, which is used to
+    check that the frames have not moved around the corner of the loop.
+
+    :param x: 1D array of x values (velocity).
+    :param y: 1D array of y values (pressure or ln(diameter)), same length as x.
+    :param frame_size: Number of points in each frame.
+    :param jump: Number of indices between the starts of consecutive frames.
+    :param start: Index of the first frame.
+
+    :return fits: Dictionary of arrays with one value per frame: 'starts', 'slopes', 'intercepts', 'r2' and 'check_r2'.
+    """
+    # Centre the data before summing to keep the running sums well conditioned for long recordings.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    xc = x - x_mean
+    yc = y - y_mean
+
+    def cumulative(values):
+        return np.concatenate(([0.0], np.cumsum(values)))
+
+    sums = (np.arange(len(x) + 1, dtype=float), cumulative(xc), cumulative(yc),
+            cumulative(xc * xc), cumulative(yc * yc), cumulative(xc * yc))
+
+    starts = np.arange(start, len(x) - frame_size, max(jump, 1))
+    ends = starts + frame_size
+
+    slopes, intercepts, r2_values = _window_fits(sums, starts, ends)
+    check_r2 = _window_fits(sums, np.full_like(starts, start), ends)[2]
+
+    # Undo the centring. Slopes and R2 are unaffected.
+    intercepts = intercepts + y_mean - slopes * x_mean
+
+    return {'starts': starts, 'slopes': slopes, 'intercepts': intercepts, 'r2': r2_values, 'check_r2': check_r2}
+
+
+def find_linear_section(x, y, frame_fraction, check_threshold=0.9):
+    """
+    Automatically detects the linear portion of a loop. Frames of the loop are tested for linearity starting from the
+    lowest point of y, and the frame with the highest R2 score is taken as most linear.
+    The search stops at the first frame where a fit over the whole span from the first frame has R2 below
+    check_threshold, which means the frames have moved around the corner of the loop.
+
+    :param x: 1D array of x values (velocity).
+    :param y: 1D array of y values (pressure or ln(diameter)), same length as x.
+    :param frame_fraction: Size of the frames checked for linearity as a fraction of the data length.
+    :param check_threshold: R2 below which the search stops.
+
+    :return slope, intercept, window_start, frame_size: Fit of the most linear frame, its starting index and length.
+    """
+    frame_size = round(len(x) * frame_fraction)
+    jump = round(frame_size / 5)
+    start = np.argmin(y)  # Start search for linear section at lowest point of loop
+    if (start + frame_size) > len(x):
+        start = 0
+
+    fits = sliding_regression(x, y, frame_size, jump, start)
+    if len(fits['starts']) == 0:
+        raise ValueError("Loop is too short to search for a linear section.")
+
+    # Frames are only used up to and including the first one which fails the check.
+    failed = np.flatnonzero(fits['check_r2'] <= check_threshold)
+    num_frames = failed[0] + 1 if len(failed) > 0 else len(fits['starts'])
+
+    lin_index = np.argmax(fits['r2'][:num_frames])  # Find highest R2 values for most linear section
+
+    return fits['slopes'][lin_index], fits['intercepts'][lin_index], int(fits['starts'][lin_index]), frame_size
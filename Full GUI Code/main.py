@@ -10,6 +10,7 @@ from puadjust import PUAdjust
 from puloop import PULoop
 from outputpage import OutputPage
 from windkessel import Windkessel
+from session import AnalysisSession
 
 
 # Main file which links all pages of the GUI
@@ -22,6 +23,9 @@ class Main(tk.Tk):
         self.geometry("1000x700")  # Set windows size for the GUI
         self.resizable(width=False, height=False)  # Disable resizing the window
 
+        # All data and results of the analysis are held by the session, which every page reads through its controller
+        self.session = AnalysisSession()
+
         # Creates the container which will hold all pages of the GUI. The current page will move to the top, so it is
         # the only one visible to the user.
         container = tk.Frame(self)
@@ -0,0 +1,291 @@
+import argparse
+import gc
+import os
+import threading
+import numpy as np
+from os import path
+from PIL import Image
+import tensorflow as tf
+from tensorflow.keras import backend
+from tensorflow.keras.models import load_model
+from imageops import resize_for_model, split_squares, ProbabilityMap
+from imageengine import velocity, diameter
+
+
+# Process-wide registry of the image segmentation models used by 'VelocityImage' and 'DiameterImage'.
+# Each model is loaded from disk the first time it is needed and then reused by every run of either page, instead of
+# being reloaded each time 'Run Model' is pressed. release_models() frees them once image analysis is finished.
+# predict_squares() runs all square images of one strip through a model together, instead of one predict() per square,
+# and segment_squares() also joins the predictions into one ProbabilityMap for the strip.
+#
+# Models can be run by Keras, or converted to TensorFlow Lite, which is faster on CPU-only machines. The TFLite models
+# can also be quantized to float16 or int8 weights. Converted models are saved next to the .h5 file, so conversion only
+# happens once. check_backend() compares the masks of any backend with Keras. From the command line:
+#
+#     python models.py velocity image.png --backend tflite-int8
+
+velocity_model = '512_velocity_30.h5'  # Trained on 512x512 velocity images for 30 epochs
+diameter_model = '512_diameter_50.h5'  # Trained on 512x512 diameter images for 50 epochs
+
+# Available inference backends, and the quantization applied when converting to TFLite
+backends = {'keras': None, 'tflite': 'float32', 'tflite-float16': 'float16', 'tflite-int8': 'int8'}
+
+_models = {}
+_lock = threading.RLock()  # Models may be requested from more than one thread
+
+
+class TFLiteModel:
+    """
+    Runs a TensorFlow Lite model through the same predict() call as a Keras model, so the image pages can use either.
+
+    :param model_content: Bytes of the converted .tflite model.
+    """
+
+    def __init__(self, model_content):
+        self.interpreter = tf.lite.Interpreter(model_content=model_content, num_threads=os.cpu_count())
+        self.input_index = self.interpreter.get_input_details()[0]['index']
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        self.input_shape = None
+        self._lock = threading.Lock()  # An interpreter can only run one batch at a time
+
+    def predict(self, batch, batch_size=8, verbose=0):
+        """
+        Runs the model on a batch of images, batch_size at a time.
+
+        :param batch: Float array of shape (no. images, 512, 512, 1).
+        :param batch_size: Number of images passed through the model at once.
+        :param verbose: Not used. Accepted to match Keras.
+
+        :return output: Array of predictions, one per image.
+        """
+        outputs = []
+        with self._lock:
+            for start in range(0, len(batch), batch_size):
+                chunk = np.ascontiguousarray(batch[start:start + batch_size], dtype=np.float32)
+                if chunk.shape != self.input_shape:  # Only reallocate when the number of images changes
+                    self.interpreter.resize_tensor_input(self.input_index, chunk.shape)
+                    self.interpreter.allocate_tensors()
+                    self.input_shape = chunk.shape
+                self.interpreter.set_tensor(self.input_index, chunk)
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self.output_index).copy())
+        return np.concatenate(outputs)
+
+
+def get_model_path(relative_path):
+    """
+    Get path to image segmentation model. Model must be in same folder as GUI. This method is necessary when models are
+    packaged by pyinstaller into single GUI .exe file.
+
+    :param relative_path: Name of image segmentation model, e.g. velocity_model or diameter_model.
+
+    :return path_to_model: Returns full path to model by joining current GUI folder path and model name.
+    """
+    bundle_dir = path.abspath(path.dirname(__file__))
+    path_to_model = path.join(bundle_dir, relative_path)
+
+    return path_to_model
+
+
+def convert_to_tflite(keras_model, quantization='float32'):
+    """
+    Converts a Keras model to TensorFlow Lite.
+
+    :param keras_model: Loaded Keras model.
+    :param quantization: 'float32' for no quantization, 'float16' to store weights as float16, or 'int8' for dynamic
+                         range quantization, which stores weights as int8 and needs no calibration images.
+
+    :return model_content: Bytes of the converted model.
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    if quantization in ('float16', 'int8'):
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+
+def _load_tflite(name, quantization):
+    """
+    Loads the TFLite version of a model, converting it from the .h5 file if there is no up to date converted copy.
+    The converted copy is saved next to the .h5 file where possible. Conversion takes a while, but only happens once
+    and is run on the worker thread of the image pages, which show that the model is running.
+
+    :param name: Name of model file, e.g. velocity_model or diameter_model.
+    :param quantization: 'float32', 'float16' or 'int8'.
+
+    :return model: TFLiteModel.
+    """
+    h5_path = get_model_path(name)
+    tflite_path = path.splitext(h5_path)[0] + '_' + quantization + '.tflite'
+
+    if path.exists(tflite_path) and path.getmtime(tflite_path) >= path.getmtime(h5_path):
+        with open(tflite_path, 'rb') as f:
+            return TFLiteModel(f.read())
+
+    model_content = convert_to_tflite(get_model(name, 'keras'), quantization)
+    try:
+        with open(tflite_path, 'wb') as f:
+            f.write(model_content)
+    except OSError:  # Folder is read only, e.g. inside a packaged .exe. Conversion will be repeated next session
+        pass
+    return TFLiteModel(model_content)
+
+
+def get_model(name, backend_name='keras'):
+    """
+    Returns a loaded image segmentation model, loading it from disk only if it is not already in the registry.
+
+    :param name: Name of model file, e.g. velocity_model or diameter_model.
+    :param backend_name: Inference backend, one of the keys of backends.
+
+    :return model: Loaded model with a Keras style predict() method.
+    """
+    if backend_name not in backends:
+        raise ValueError(f"Unknown inference backend '{backend_name}'. Choose from {', '.join(backends)}.")
+
+    with _lock:
+        key = (name, backend_name)
+        if key not in _models:
+            if backend_name == 'keras':
+                _models[key] = load_model(get_model_path(name))
+            else:
+                _models[key] = _load_tflite(name, backends[backend_name])
+        return _models[key]
+
+
+def release_models(name=None):
+    """
+    Removes models from the registry and frees the memory held by TensorFlow. They will be loaded again if needed.
+
+    :param name: Name of model to release, with every backend. Releases every model if None.
+    """
+    with _lock:
+        released = [key for key in _models if name is None or key[0] == name]
+        for key in released:
+            del _models[key]
+
+        if len(released) > 0:
+            backend.clear_session()
+            gc.collect()
+
+
+def squares_to_batch(square_images):
+    """
+    Converts 512x512 square images into a single array of model inputs, in the same way as each image used to be
+    converted on its own: grayscale, scaled to between 0 and 1, with a channel axis.
+
+    :param square_images: List of Image objects from split_image().
+
+    :return batch: Float array of shape (no. images, 512, 512, 1).
+    """
+    batch = np.stack([np.asarray(image.convert("L"), dtype=np.float32) for image in square_images])
+    batch /= 255.0
+    return batch[..., np.newaxis]
+
+
+def predict_squares(model, square_images, batch_size=8, progress=None):
+    """
+    Runs the image segmentation model on every square image of a strip with a single call to predict().
+    If progress is given, the images are instead passed to predict() batch_size at a time, and progress is called after
+    each batch so a BackgroundTask from 'worker.py' can show progress and be cancelled between batches.
+
+    :param model: Loaded model from get_model().
+    :param square_images: List of Image objects from split_image().
+    :param batch_size: Number of images passed through the model at once. Lower values use less memory.
+    :param progress: Optional function called with (images done, total images) before the first batch and after each.
+
+    :return predictions: List with one prediction of shape (1, 512, 512, 1) per image, in the same order, as returned
+                         by predict() on a single image.
+    """
+    batch = squares_to_batch(square_images)
+    if progress is None:
+        output = model.predict(batch, batch_size=batch_size, verbose=0)
+    else:
+        progress(0, len(batch))
+        outputs = []
+        for start in range(0, len(batch), batch_size):
+            outputs.append(model.predict(batch[start:start + batch_size], batch_size=batch_size, verbose=0))
+            progress(start + len(outputs[-1]), len(batch))
+        output = np.concatenate(outputs)
+    return [output[i:i + 1] for i in range(len(output))]
+
+
+def segment_squares(model, square_images, width, threshold, batch_size=8, progress=None):
+    """
+    Runs the image segmentation model on the square images of a strip and joins the predictions into a ProbabilityMap.
+    Reads and changes no ImageAnalysis, so can be run on a worker thread while the user carries on.
+
+    :param model: Loaded model from get_model().
+    :param square_images: List of square Image objects from ImageAnalysis.split_image().
+    :param width: Width of the resized image the squares were cut from.
+    :param threshold: Mask threshold. The outline at this threshold is found now, so ImageAnalysis.annotate() only draws
+                      it.
+    :param batch_size: Number of images passed through the model at once.
+    :param progress: Optional function called with (images done, total images), as in predict_squares().
+
+    :return predictions, probability_map: List of model predictions, and ProbabilityMap joining them.
+    """
+    predictions = predict_squares(model, square_images, batch_size, progress)
+    probability_map = ProbabilityMap(predictions, width)
+    try:
+        probability_map.outline(threshold)  # Outline is kept by the map, so is not found again
+    except ValueError:
+        pass  # Nothing above the threshold. ImageAnalysis.annotate() tells the user
+    return predictions, probability_map
+
+
+def check_backend(name, backend_name, square_images, threshold, min_agreement=0.99, batch_size=8):
+    """
+    Checks that a backend produces the same masks as Keras, within a tolerance.
+
+    :param name: Name of model file, e.g. velocity_model or diameter_model.
+    :param backend_name: Inference backend to check, one of the keys of backends.
+    :param square_images: List of 512x512 Image objects to segment.
+    :param threshold: Mask threshold, as ImageAnalysis.mask_threshold.
+    :param min_agreement: Smallest fraction of mask pixels which must agree with Keras for the check to pass.
+    :param batch_size: Number of images passed through the models at once.
+
+    :return result: Dictionary with the largest difference in probability, the fraction of mask pixels which agree, the
+                    intersection over union of the masks, and whether the check passed.
+    """
+    reference = np.concatenate(predict_squares(get_model(name, 'keras'), square_images, batch_size))
+    candidate = np.concatenate(predict_squares(get_model(name, backend_name), square_images, batch_size))
+
+    reference_mask = reference > threshold
+    candidate_mask = candidate > threshold
+    agreement = np.mean(reference_mask == candidate_mask)
+    union = np.count_nonzero(reference_mask | candidate_mask)
+    iou = np.count_nonzero(reference_mask & candidate_mask) / union if union else 1.0
+
+    return {'backend': backend_name, 'max_difference': float(np.max(np.abs(reference - candidate))),
+            'agreement': float(agreement), 'iou': float(iou), 'passed': bool(agreement >= min_agreement)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check an inference backend against the Keras segmentation masks.")
+    parser.add_argument('model', choices=['velocity', 'diameter'], help="Which segmentation model to check.")
+    parser.add_argument('images', nargs='+', help="Cropped ultrasound images, as analysed by the image pages.")
+    parser.add_argument('--backend', default='tflite', choices=[key for key in backends if key != 'keras'])
+    parser.add_argument('--threshold', type=float, help="Mask threshold. Defaults to the GUI default for the model.")
+    parser.add_argument('--min-agreement', type=float, default=0.99,
+                        help="Smallest fraction of mask pixels which must agree with Keras.")
+    args = parser.parse_args()
+
+    name = velocity_model if args.model == 'velocity' else diameter_model
+    modality = velocity if args.model == 'velocity' else diameter
+    threshold = args.threshold if args.threshold is not None else modality.mask_threshold
+
+    square_images = []
+    for image_path in args.images:
+        square_images += split_squares(resize_for_model(Image.open(image_path).convert("RGB")))
+
+    result = check_backend(name, args.backend, square_images, threshold, args.min_agreement)
+    print(f"{result['backend']}: max difference {result['max_difference']:.4f}, "
+          f"mask agreement {result['agreement']:.4%}, IoU {result['iou']:.4f}")
+    print("PASSED" if result['passed'] else "FAILED")
+    raise SystemExit(0 if result['passed'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 import tkinter as tk
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.ticker import ScalarFormatter
-from scipy import integrate
 from tkinter.filedialog import asksaveasfilename
+from plotarea import PlotArea
+from units import convert_session_to_si, convert_session_from_si
+from waveintensity import separate_invasive, separate_non_invasive
 import config
 
 
@@ -13,25 +13,17 @@ class OutputPage(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=config.bg_col)
         self.controller = controller
+        session = controller.session  # Data and results of the current analysis
 
         def convert_units():
             """
             Called if user goes back to previous frame 'PULoop' by pressing GUI button 'btn_back'.
             Units must flip back and forth between pages to avoid units being 'converted' many times repeatedly as the
             user navigates back and forth through the GUI.
+            The adjusted data arrays are views of session.p_data, session.u_data and session.d_data, so they
+            are converted with them.
             """
-            if config.p_unit == 'kPa':
-                config.p_data_adjusted *= 1000
-            if config.p_unit == 'mmHg':
-                config.p_data_adjusted *= 133
-            if config.u_unit == 'cm/s':
-                config.u_data_adjusted /= 100
-            if config.u_unit == 'mm/s':
-                config.u_data_adjusted /= 1000
-            if config.d_unit == 'cm':
-                config.d_data_adjusted /= 100
-            if config.d_unit == 'mm':
-                config.d_data_adjusted /= 1000
+            convert_session_to_si(session)
 
         def save_p_separation_plot():  # saves d separation instead of p if running non-invasive analysis
             """
@@ -80,10 +72,10 @@ class OutputPage(tk.Frame):
             Saves raw data for the displayed plot as .txt file.
             """
             file_path = asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
-            if config.method_choice == 1:
-                data = np.column_stack((config.t_data, config.p_data_adjusted, config.P_f, config.P_b))
-            elif config.method_choice == 2:
-                data = np.column_stack((config.t_data, config.d_data_adjusted, config.D_f, config.D_b))
+            if session.method_choice == 1:
+                data = np.column_stack((session.t_data, session.p_data_adjusted, session.P_f, session.P_b))
+            elif session.method_choice == 2:
+                data = np.column_stack((session.t_data, session.d_data_adjusted, session.D_f, session.D_b))
             np.savetxt(file_path, data, fmt='%.6f', delimiter='\t', comments='')
 
         def save_u_separation_data():
@@ -93,7 +85,7 @@ class OutputPage(tk.Frame):
             Saves raw data for the displayed plot as .txt file.
             """
             file_path = asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
-            data = np.column_stack((config.t_data, config.u_data_adjusted, config.U_f, config.U_b))
+            data = np.column_stack((session.t_data, session.u_data_adjusted, session.U_f, session.U_b))
             np.savetxt(file_path, data, fmt='%.6f', delimiter='\t', comments='')
 
         def save_wia_data():
@@ -103,7 +95,7 @@ class OutputPage(tk.Frame):
             Saves raw data for the displayed plot as .txt file.
             """
             file_path = asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
-            data = np.column_stack((config.t_data, config.dI))
+            data = np.column_stack((session.t_data, session.dI))
             np.savetxt(file_path, data, fmt='%.6f', delimiter='\t', comments='')
 
         def save_wia_separation_data():
@@ -113,33 +105,33 @@ class OutputPage(tk.Frame):
             Saves raw data for the displayed plot as .txt file.
             """
             file_path = asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
-            data = np.column_stack((config.t_data, config.dI, config.dI_f, config.dI_b))
+            data = np.column_stack((session.t_data, session.dI, session.dI_f, session.dI_b))
             np.savetxt(file_path, data, fmt='%.6f', delimiter='\t', comments='')
 
         def save_plot_pressed():
             """
             Ensures the plot being displayed matches the plot being saved when user presses GUI button 'btn_save_plot'.
             """
-            if config.current_plot == 'P sep':
+            if session.current_plot == 'P sep':
                 save_p_separation_plot()
-            elif config.current_plot == 'U sep':
+            elif session.current_plot == 'U sep':
                 save_u_separation_plot()
-            elif config.current_plot == 'WIA':
+            elif session.current_plot == 'WIA':
                 save_wia_plot()
-            elif config.current_plot == 'WIA sep':
+            elif session.current_plot == 'WIA sep':
                 save_wia_separation_plot()
 
         def save_data_pressed():
             """
             Ensures the plot being displayed matches the data being saved when user presses GUI button 'btn_save_data'.
             """
-            if config.current_plot == 'P sep':
+            if session.current_plot == 'P sep':
                 save_p_separation_data()
-            elif config.current_plot == 'U sep':
+            elif session.current_plot == 'U sep':
                 save_u_separation_data()
-            elif config.current_plot == 'WIA':
+            elif session.current_plot == 'WIA':
                 save_wia_data()
-            elif config.current_plot == 'WIA sep':
+            elif session.current_plot == 'WIA sep':
                 save_wia_separation_data()
 
         def close_program():
@@ -273,164 +265,162 @@ class OutputPage(tk.Frame):
         btn_save_data.grid(row=2, column=2, padx=5, pady=5)
         btn_exit.grid(row=2, column=3, padx=5, pady=5)
 
+        # Every output plot is drawn on the same figure, which is also the one saved by 'btn_save_plot'
+        self.plot = PlotArea(self, (8, 5), row=1, column=0, columnspan=4, padx=5, pady=5)
+
     def run_analysis(self):
         """
         Runs as soon as this frame opens in GUI.
-        Perform calculations for waveform separations and wave intensity analysis using wave speed value config.c
-        calculated in previous page 'PULoop'
+        Perform calculations for waveform separations and wave intensity analysis using wave speed value session.c
+        calculated in previous page 'PULoop'.
+        The calculations themselves are carried out by separate_invasive() and separate_non_invasive() from
+        'waveintensity.py', which can also be used without the GUI.
         """
-        if config.method_choice == 1:
-            config.dP = np.gradient(config.p_data_adjusted, config.t_data)
-            config.dU = np.gradient(config.u_data_adjusted, config.t_data)
-            config.dI = config.dP * config.dU
-
-            # Calculating wave separation derivatives
-            config.dP_f = (config.dP + (config.rho * config.c * config.dU)) / 2
-            config.dU_f = (config.dU + (config.dP / (config.rho * config.c))) / 2
-            config.dI_f = config.dP_f * config.dU_f
-            config.dP_b = (config.dP - (config.rho * config.c * config.dU)) / 2
-            config.dU_b = (config.dU - (config.dP / (config.rho * config.c))) / 2
-            config.dI_b = config.dP_b * config.dU_b
-
-            # Calculating wave separations
-            # np.insert is necessary after each cumtrapz in order for dimensions to align.
-            # cumtrapz returns an array 1 element shorter than its inputs.
-            config.P_f = min(config.p_data_adjusted) + integrate.cumtrapz(config.dP_f, config.t_data)
-            config.P_f = np.insert(config.P_f, 0, config.P_f[0])
-            config.U_f = integrate.cumtrapz(config.dU_f, config.t_data)
-            config.U_f = np.insert(config.U_f, 0, config.U_f[0])
-            config.P_b = integrate.cumtrapz(config.dP_b, config.t_data)
-            config.P_b = np.insert(config.P_b, 0, config.P_b[0])
-            config.U_b = integrate.cumtrapz(config.dU_b, config.t_data)
-            config.U_b = np.insert(config.U_b, 0, config.U_b[0])
-
-        elif config.method_choice == 2:
-            config.dD = np.gradient(config.d_data_adjusted, config.t_data)
-            config.dlnD = np.gradient(config.lnd_data_adjusted, config.t_data)
-            config.dU = np.gradient(config.u_data_adjusted, config.t_data)
-            config.dI = config.dD * config.dU
-
-            # Calculating wave separation derivatives
-            config.dD_f = (config.d_data_adjusted / 2) * (config.dlnD + (config.dU / (2 * config.c)))
-            config.dD_b = (-config.d_data_adjusted / 2) * (config.dlnD - (config.dU / (2 * config.c)))
-            config.dU_f = 0.5 * (config.dU + (2 * config.c * config.dlnD))
-            config.dU_b = 0.5 * (config.dU - (2 * config.c * config.dlnD))
-            config.dI_f = config.dD_f * config.dU_f
-            config.dI_b = config.dD_b * config.dU_b
-
-            # Calculating wave separations
-            # np.insert is necessary after each cumtrapz in order for dimensions to align.
-            # cumtrapz returns an array 1 element shorter than its inputs.
-            config.D_f = config.d_data_adjusted[0] + integrate.cumtrapz(config.dD_f, config.t_data)
-            config.D_f = np.insert(config.D_f, 0, config.D_f[0])
-            config.U_f = integrate.cumtrapz(config.dU_f, config.t_data)
-            config.U_f = np.insert(config.U_f, 0, config.U_f[0])
-            config.D_b = config.d_data_adjusted[0] - integrate.cumtrapz(config.dD_b, config.t_data)
-            config.D_b = np.insert(config.D_b, 0, config.D_b[0])
-            config.U_b = integrate.cumtrapz(config.dU_b, config.t_data)
-            config.U_b = np.insert(config.U_b, 0, config.U_b[0])
+        session = self.controller.session
+        if session.method_choice == 1:
+            results = separate_invasive(session.p_data_adjusted, session.u_data_adjusted, session.t_data, session.c,
+                                        rho=session.rho)
+            session.dP = results['dP']
+            session.dU = results['dU']
+            session.dI = results['dI']
+
+            # Wave separation derivatives
+            session.dP_f = results['dP_f']
+            session.dU_f = results['dU_f']
+            session.dI_f = results['dI_f']
+            session.dP_b = results['dP_b']
+            session.dU_b = results['dU_b']
+            session.dI_b = results['dI_b']
+
+            # Wave separations
+            session.P_f = results['P_f']
+            session.U_f = results['U_f']
+            session.P_b = results['P_b']
+            session.U_b = results['U_b']
+
+        elif session.method_choice == 2:
+            results = separate_non_invasive(session.d_data_adjusted, session.u_data_adjusted, session.t_data,
+                                            session.c)
+            session.dD = results['dD']
+            session.dlnD = results['dlnD']
+            session.dU = results['dU']
+            session.dI = results['dI']
+
+            # Wave separation derivatives
+            session.dD_f = results['dD_f']
+            session.dD_b = results['dD_b']
+            session.dU_f = results['dU_f']
+            session.dU_b = results['dU_b']
+            session.dI_f = results['dI_f']
+            session.dI_b = results['dI_b']
+
+            # Wave separations
+            session.D_f = results['D_f']
+            session.U_f = results['U_f']
+            session.D_b = results['D_b']
+            session.U_b = results['U_b']
+
     def convert_units_back(self):
         """
         Called as soon as this frame opens in GUI.
         Converts all units back to those originally input by the user so they can see the displayed output plots in
         their preferred units.
+        The adjusted data arrays are views of session.p_data, session.u_data and session.d_data, so they
+        are converted with them.
         """
-        if config.p_unit == 'kPa':
-            config.p_data_adjusted /= 1000
-            config.P_f /= 1000
-            config.P_b /= 1000
-        if config.p_unit == 'mmHg':
-            config.p_data_adjusted /= 133
-            config.P_f /= 133
-            config.P_b /= 133
-        if config.u_unit == 'cm/s':
-            config.u_data_adjusted *= 100
-            config.U_f *= 100
-            config.U_b *= 100
-        if config.u_unit == 'mm/s':
-            config.u_data_adjusted *= 1000
-            config.U_f *= 1000
-            config.U_b *= 1000
-        if config.d_unit == 'cm':
-            config.d_data_adjusted *= 100
-            config.D_f *= 100
-            config.D_b *= 100
-        if config.d_unit == 'mm':
-            config.d_data_adjusted *= 1000
-            config.D_f *= 1000
-            config.D_b *= 1000
+        session = self.controller.session
+        convert_session_from_si(session)
+        if session.p_unit == 'kPa':
+            session.P_f /= 1000
+            session.P_b /= 1000
+        if session.p_unit == 'mmHg':
+            session.P_f /= 133
+            session.P_b /= 133
+        if session.u_unit == 'cm/s':
+            session.U_f *= 100
+            session.U_b *= 100
+        if session.u_unit == 'mm/s':
+            session.U_f *= 1000
+            session.U_b *= 1000
+        if session.d_unit == 'cm':
+            session.D_f *= 100
+            session.D_b *= 100
+        if session.d_unit == 'mm':
+            session.D_f *= 1000
+            session.D_b *= 1000
 
     def create_p_separation_plot(self):
         """
         Called as soon as this frame opens in GUI.
         Creates either P separation or D separation plot depending on whether analysis is invasive or non-invasive.
-        Plot is not displayed in this function.
+        Plot is drawn on self.plot but not displayed in this function.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if config.method_choice == 1:
+        session = self.controller.session
+        if session.method_choice == 1:
             # Plot separation of P, P+ and P-.
-            if len(config.p_data_adjusted) > 200:
-                pts_per_marker = round(len(config.p_data_adjusted) / 200)
+            if len(session.p_data_adjusted) > 200:
+                pts_per_marker = round(len(session.p_data_adjusted) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(8, 5))
+            fig, ax = self.plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            ax.plot(config.t_data, config.p_data_adjusted, c='#e00202', linewidth=0.8, label='P')
-            plt.plot(config.t_data[::pts_per_marker], config.p_data_adjusted[::pts_per_marker], linestyle='None',
-                     marker='.', markeredgecolor='#8a0000',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            ax.plot(config.t_data, config.P_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{P_{+}}$')
-            plt.plot(config.t_data[::pts_per_marker], config.P_f[::pts_per_marker], linestyle='None', marker='.',
-                     markeredgecolor='#030785',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            ax.plot(config.t_data, config.P_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{P_{-}}$')
-            plt.plot(config.t_data[::pts_per_marker], config.P_b[::pts_per_marker], linestyle='None', marker='.',
-                     markeredgecolor='#1638cc',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.plot(session.t_data, session.p_data_adjusted, c='#e00202', linewidth=0.8, label='P')
+            ax.plot(session.t_data[::pts_per_marker], session.p_data_adjusted[::pts_per_marker], linestyle='None',
+                    marker='.', markeredgecolor='#8a0000',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.plot(session.t_data, session.P_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{P_{+}}$')
+            ax.plot(session.t_data[::pts_per_marker], session.P_f[::pts_per_marker], linestyle='None', marker='.',
+                    markeredgecolor='#030785',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.plot(session.t_data, session.P_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{P_{-}}$')
+            ax.plot(session.t_data[::pts_per_marker], session.P_b[::pts_per_marker], linestyle='None', marker='.',
+                    markeredgecolor='#1638cc',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('t (s)')
-            ax.set_ylabel(f'P ({config.p_unit})')
+            ax.set_ylabel(f'P ({session.p_unit})')
             ax.set_title('P separation')
             ax.legend(loc='upper right')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
 
-        elif config.method_choice == 2:
+        elif session.method_choice == 2:
             # Plot separation of D, D+ and D-.
-            if len(config.d_data_adjusted) > 200:
-                pts_per_marker = round(len(config.d_data_adjusted) / 200)
+            if len(session.d_data_adjusted) > 200:
+                pts_per_marker = round(len(session.d_data_adjusted) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(8, 5))
+            fig, ax = self.plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            ax.plot(config.t_data, config.d_data_adjusted, c='#e00202', linewidth=0.8, label='P')
-            plt.plot(config.t_data[::pts_per_marker], config.d_data_adjusted[::pts_per_marker], linestyle='None',
-                     marker='.', markeredgecolor='#8a0000',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            ax.plot(config.t_data, config.D_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{P_{+}}$')
-            plt.plot(config.t_data[::pts_per_marker], config.D_f[::pts_per_marker], linestyle='None', marker='.',
-                     markeredgecolor='#030785',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            ax.plot(config.t_data, config.D_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{P_{-}}$')
-            plt.plot(config.t_data[::pts_per_marker], config.D_b[::pts_per_marker], linestyle='None', marker='.',
-                     markeredgecolor='#1638cc',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.plot(session.t_data, session.d_data_adjusted, c='#e00202', linewidth=0.8, label='P')
+            ax.plot(session.t_data[::pts_per_marker], session.d_data_adjusted[::pts_per_marker], linestyle='None',
+                    marker='.', markeredgecolor='#8a0000',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.plot(session.t_data, session.D_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{P_{+}}$')
+            ax.plot(session.t_data[::pts_per_marker], session.D_f[::pts_per_marker], linestyle='None', marker='.',
+                    markeredgecolor='#030785',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.plot(session.t_data, session.D_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{P_{-}}$')
+            ax.plot(session.t_data[::pts_per_marker], session.D_b[::pts_per_marker], linestyle='None', marker='.',
+                    markeredgecolor='#1638cc',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('t (s)')
-            ax.set_ylabel(f'D ({config.d_unit})')
+            ax.set_ylabel(f'D ({session.d_unit})')
             ax.set_title('D separation')
             ax.legend(loc='upper right')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
 
         return fig
@@ -438,39 +428,40 @@ class OutputPage(tk.Frame):
     def create_u_separation_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Creates U separation plot but does not display.
+        Creates U separation plot on self.plot but does not display.
         Various aesthetic choices which remain consistent throughout GUI.
         """
+        session = self.controller.session
         # Plot separation of U, U+ and U-.
-        if len(config.u_data_adjusted) > 200:
-            pts_per_marker = round(len(config.u_data_adjusted) / 200)
+        if len(session.u_data_adjusted) > 200:
+            pts_per_marker = round(len(session.u_data_adjusted) / 200)
         else:
             pts_per_marker = 1
-        fig, ax = plt.subplots(figsize=(8, 5))
+        fig, ax = self.plot.subplots()
         fig.patch.set_facecolor(config.plot_bg_col)
         ax.set_facecolor(config.plot_bg_col)
-        ax.plot(config.t_data, config.u_data_adjusted, c='#e00202', linewidth=0.8, label='U')
-        plt.plot(config.t_data[::pts_per_marker], config.u_data_adjusted[::pts_per_marker], linestyle='None',
-                 marker='.', markeredgecolor='#8a0000',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        ax.plot(config.t_data, config.U_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{U_{+}}$')
-        plt.plot(config.t_data[::pts_per_marker], config.U_f[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#030785',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        ax.plot(config.t_data, config.U_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{U_{-}}$')
-        plt.plot(config.t_data[::pts_per_marker], config.U_b[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#1638cc',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-        plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+        ax.plot(session.t_data, session.u_data_adjusted, c='#e00202', linewidth=0.8, label='U')
+        ax.plot(session.t_data[::pts_per_marker], session.u_data_adjusted[::pts_per_marker], linestyle='None',
+                marker='.', markeredgecolor='#8a0000',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.plot(session.t_data, session.U_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{U_{+}}$')
+        ax.plot(session.t_data[::pts_per_marker], session.U_f[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#030785',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.plot(session.t_data, session.U_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{U_{-}}$')
+        ax.plot(session.t_data[::pts_per_marker], session.U_b[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#1638cc',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
         ax.set_xlabel('t (s)')
-        ax.set_ylabel(f'U ({config.u_unit})')
+        ax.set_ylabel(f'U ({session.u_unit})')
         ax.set_title('U separation')
         ax.legend(loc='upper right')
-        plt.minorticks_on()
-        plt.tick_params(axis='both', which='major', labelsize=12)
-        plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-        plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+        ax.minorticks_on()
+        ax.tick_params(axis='both', which='major', labelsize=12)
+        ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+        ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
         fig.tight_layout()
 
         return fig
@@ -478,30 +469,31 @@ class OutputPage(tk.Frame):
     def create_wia_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Creates wave intensity analysis plot but does not display.
+        Creates wave intensity analysis plot on self.plot but does not display.
         Various aesthetic choices which remain consistent throughout GUI.
         """
+        session = self.controller.session
         # Plot wave intensity analysis.
-        if len(config.dI) > 200:
-            pts_per_marker = round(len(config.dI) / 200)
+        if len(session.dI) > 200:
+            pts_per_marker = round(len(session.dI) / 200)
         else:
             pts_per_marker = 1
-        fig, ax = plt.subplots(figsize=(8, 5))
+        fig, ax = self.plot.subplots()
         fig.patch.set_facecolor(config.plot_bg_col)
         ax.set_facecolor(config.plot_bg_col)
-        ax.plot(config.t_data, config.dI, c='#e00202', linewidth=0.8, label='dI')
-        plt.plot(config.t_data[::pts_per_marker], config.dI[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#8a0000',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-        plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+        ax.plot(session.t_data, session.dI, c='#e00202', linewidth=0.8, label='dI')
+        ax.plot(session.t_data[::pts_per_marker], session.dI[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#8a0000',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
         ax.set_xlabel('t (s)')
         ax.set_ylabel(r'dI $\mathregular{(Wm^{-2})}$')
         ax.set_title('Wave Intensity Analysis')
-        plt.minorticks_on()
-        plt.tick_params(axis='both', which='major', labelsize=12)
-        plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-        plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+        ax.minorticks_on()
+        ax.tick_params(axis='both', which='major', labelsize=12)
+        ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+        ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
         fig.tight_layout()
 
         return fig
@@ -509,39 +501,40 @@ class OutputPage(tk.Frame):
     def create_wia_separation_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Creates WIA separation plot but does not display.
+        Creates WIA separation plot on self.plot but does not display.
         Various aesthetic choices which remain consistent throughout GUI.
         """
+        session = self.controller.session
         # Plot separation of dI, dI+ and dI-.
-        if len(config.dI) > 200:
-            pts_per_marker = round(len(config.dI) / 200)
+        if len(session.dI) > 200:
+            pts_per_marker = round(len(session.dI) / 200)
         else:
             pts_per_marker = 1
-        fig, ax = plt.subplots(figsize=(8, 5))
+        fig, ax = self.plot.subplots()
         fig.patch.set_facecolor(config.plot_bg_col)
         ax.set_facecolor(config.plot_bg_col)
-        ax.plot(config.t_data, config.dI, c='#e00202', linewidth=0.8, label='dI')
-        plt.plot(config.t_data[::pts_per_marker], config.dI[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#8a0000',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        ax.plot(config.t_data, config.dI_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{dI_{+}}$')
-        plt.plot(config.t_data[::pts_per_marker], config.dI_f[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#030785',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        ax.plot(config.t_data, config.dI_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{dI_{-}}$')
-        plt.plot(config.t_data[::pts_per_marker], config.dI_b[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#1638cc',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-        plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+        ax.plot(session.t_data, session.dI, c='#e00202', linewidth=0.8, label='dI')
+        ax.plot(session.t_data[::pts_per_marker], session.dI[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#8a0000',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.plot(session.t_data, session.dI_f, c='#1638cc', linewidth=0.8, label=r'$\mathregular{dI_{+}}$')
+        ax.plot(session.t_data[::pts_per_marker], session.dI_f[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#030785',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.plot(session.t_data, session.dI_b, c='#05d8f0', linewidth=0.8, label=r'$\mathregular{dI_{-}}$')
+        ax.plot(session.t_data[::pts_per_marker], session.dI_b[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#1638cc',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
         ax.set_xlabel('t (s)')
         ax.set_ylabel(r'dI $\mathregular{(Wm^{-2})}$')
         ax.set_title('WIA separation')
         ax.legend(loc='upper right')
-        plt.minorticks_on()
-        plt.tick_params(axis='both', which='major', labelsize=12)
-        plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-        plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+        ax.minorticks_on()
+        ax.tick_params(axis='both', which='major', labelsize=12)
+        ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+        ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
         fig.tight_layout()
 
         return fig
@@ -549,46 +542,46 @@ class OutputPage(tk.Frame):
     def display_p_separation_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Calls create_p_separation_plot() to create the plot, then displays in GUI frame.
-        Sets config.current_plot to relevant graph for use when saving plots and data.
+        Calls create_p_separation_plot() to draw the plot, then displays in GUI frame.
+        Sets session.current_plot to relevant graph for use when saving plots and data.
         """
-        fig = self.create_p_separation_plot()
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=1, column=0, columnspan=4, padx=5, pady=5)
-        config.current_plot = 'P sep'
+        session = self.controller.session
+        self.create_p_separation_plot()
+        self.plot.draw()
+        session.current_plot = 'P sep'
 
     def display_u_separation_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Calls create_u_separation_plot() to create the plot, then displays in GUI frame.
-        Sets config.current_plot to relevant graph for use when saving plots and data.
+        Calls create_u_separation_plot() to draw the plot, then displays in GUI frame.
+        Sets session.current_plot to relevant graph for use when saving plots and data.
         """
-        fig = self.create_u_separation_plot()
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=1, column=0, columnspan=4, padx=5, pady=5)
-        config.current_plot = 'U sep'
+        session = self.controller.session
+        self.create_u_separation_plot()
+        self.plot.draw()
+        session.current_plot = 'U sep'
 
     def display_wia_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Calls create_wia_plot() to create the plot, then displays in GUI frame.
-        Sets config.current_plot to relevant graph for use when saving plots and data.
+        Calls create_wia_plot() to draw the plot, then displays in GUI frame.
+        Sets session.current_plot to relevant graph for use when saving plots and data.
         """
-        fig = self.create_wia_plot()
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=1, column=0, columnspan=4, padx=5, pady=5)
-        config.current_plot = 'WIA'
+        session = self.controller.session
+        self.create_wia_plot()
+        self.plot.draw()
+        session.current_plot = 'WIA'
 
     def display_wia_separation_plot(self):
         """
         Called as soon as this frame opens in GUI.
-        Calls create_wia_separation_plot() to create the plot, then displays in GUI frame.
-        Sets config.current_plot to relevant graph for use when saving plots and data.
+        Calls create_wia_separation_plot() to draw the plot, then displays in GUI frame.
+        Sets session.current_plot to relevant graph for use when saving plots and data.
         """
-        fig = self.create_wia_separation_plot()
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=1, column=0, columnspan=4, padx=5, pady=5)
-        config.current_plot = 'WIA sep'
+        session = self.controller.session
+        self.create_wia_separation_plot()
+        self.plot.draw()
+        session.current_plot = 'WIA sep'
 
     def tkraise(self):
         """
@@ -0,0 +1,51 @@
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+# A figure and canvas placed on a GUI page once and reused by every plot drawn in the same place.
+# Each plot used to be drawn on a new pyplot figure with a new canvas gridded on top of the last one. The old figures
+# were kept by pyplot and the old canvases by Tk, so memory grew and redraws slowed over a session. Figures made here
+# are not registered with pyplot, and clearing them for the next plot frees the previous one, so memory stays bounded
+# however long the GUI is used.
+
+class PlotArea:
+    """
+    Persistent figure and canvas for one plot position on a GUI page.
+
+    :param parent: Tk frame the canvas is placed on.
+    :param figsize: Size of the figure in inches, as given to plt.subplots().
+    :param grid: Keyword arguments for grid(), placing the canvas on parent.
+    """
+
+    def __init__(self, parent, figsize, **grid):
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvasTkAgg(self.figure, parent)
+        self.canvas.get_tk_widget().grid(**grid)
+        self._click_id = None
+
+    def subplots(self):
+        """
+        Clears the figure ready for a new plot. Used in place of plt.subplots(), which made a new figure each time.
+
+        :return fig, ax: The reused figure, and new axes filling it.
+        """
+        self.figure.clear()
+        return self.figure, self.figure.add_subplot()
+
+    def draw(self):
+        """
+        Shows the plot once the GUI is idle, so plots redrawn together by one button press cost one draw each.
+        """
+        self.canvas.draw_idle()
+
+    def connect_click(self, function):
+        """
+        Calls function with each mouse click on the plot, replacing any function connected before.
+
+        :param function: Function taking a Matplotlib MouseEvent, or None to ignore clicks.
+        """
+        if self._click_id is not None:
+            self.canvas.mpl_disconnect(self._click_id)
+            self._click_id = None
+        if function is not None:
+            self._click_id = self.canvas.mpl_connect('button_press_event', function)
@@ -1,7 +1,6 @@
 import tkinter as tk
-import matplotlib.pyplot as plt
 from matplotlib.ticker import ScalarFormatter
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from plotarea import PlotArea
 import config
 
 
@@ -61,97 +60,101 @@ class PtNew(tk.Frame):
         btn_back.grid(row=1, column=0, padx=5, pady=5)
         btn_filter.grid(row=1, column=4, columnspan=2, padx=5, pady=5)
 
+        # Plots are redrawn on the same figures each time this frame opens. P or D on the left, U on the right
+        self.pd_plot = PlotArea(self, (5, 3), row=0, column=0, columnspan=5, padx=5, pady=5)
+        self.u_plot = PlotArea(self, (5, 3), row=0, column=5, columnspan=5, padx=5, pady=5)
+
     def ptgraph(self):
         """
         Called as soon as frame 'PtNew' is opened in GUI.
-        Plot config.p_data vs config.t_data.
+        Plot session.p_data vs session.t_data.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if config.method_choice == 1 or config.method_choice == 3:
-            if len(config.p_data) > 200:
-                pts_per_marker = round(len(config.p_data) / 200)
+        session = self.controller.session
+        if session.method_choice == 1 or session.method_choice == 3:
+            if len(session.p_data) > 200:
+                pts_per_marker = round(len(session.p_data) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(5, 3))
+            fig, ax = self.pd_plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            ax.plot(config.t_data, config.p_data, c='#1638cc', linewidth=0.8, label='P')
-            plt.plot(config.t_data[::pts_per_marker], config.p_data[::pts_per_marker], linestyle='None', marker='.',
-                     markeredgecolor='#030785',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.plot(session.t_data, session.p_data, c='#1638cc', linewidth=0.8, label='P')
+            ax.plot(session.t_data[::pts_per_marker], session.p_data[::pts_per_marker], linestyle='None', marker='.',
+                    markeredgecolor='#030785',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('t (s)')
-            ax.set_ylabel(f'P ({config.p_unit})')
+            ax.set_ylabel(f'P ({session.p_unit})')
             ax.set_title('P/t graph')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
-            canvas = FigureCanvasTkAgg(fig, self)
-            canvas.get_tk_widget().grid(row=0, column=0, columnspan=5, padx=5, pady=5)
+            self.pd_plot.draw()
 
     def utgraph(self):
         """
         Called as soon as frame 'PtNew' is opened in GUI.
-        Plot config.u_data vs config.t_data.
+        Plot session.u_data vs session.t_data.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if len(config.u_data) > 200:
-            pts_per_marker = round(len(config.u_data) / 200)
+        session = self.controller.session
+        if len(session.u_data) > 200:
+            pts_per_marker = round(len(session.u_data) / 200)
         else:
             pts_per_marker = 1
-        fig, ax = plt.subplots(figsize=(5, 3))
+        fig, ax = self.u_plot.subplots()
         fig.patch.set_facecolor(config.plot_bg_col)
         ax.set_facecolor(config.plot_bg_col)
-        ax.plot(config.t_data, config.u_data, c='#e00202', linewidth=0.8, label='U')
-        plt.plot(config.t_data[::pts_per_marker], config.u_data[::pts_per_marker], linestyle='None', marker='.',
-                 markeredgecolor='#8a0000',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-        plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+        ax.plot(session.t_data, session.u_data, c='#e00202', linewidth=0.8, label='U')
+        ax.plot(session.t_data[::pts_per_marker], session.u_data[::pts_per_marker], linestyle='None', marker='.',
+                markeredgecolor='#8a0000',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
         ax.set_xlabel('t (s)')
-        ax.set_ylabel(f'U ({config.u_unit})')
+        ax.set_ylabel(f'U ({session.u_unit})')
         ax.set_title('U/t graph')
-        plt.minorticks_on()
-        plt.tick_params(axis='both', which='major', labelsize=12)
-        plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-        plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+        ax.minorticks_on()
+        ax.tick_params(axis='both', which='major', labelsize=12)
+        ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+        ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
         fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=0, column=5, columnspan=5, padx=5, pady=5)
+        self.u_plot.draw()
 
     def dtgraph(self):
         """
         Called as soon as frame 'PtNew' is opened in GUI.
-        Plot config.d_data vs config.t_data.
+        Plot session.d_data vs session.t_data.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if config.method_choice == 2:
-            if len(config.d_data) > 200:
-                pts_per_marker = round(len(config.d_data) / 200)
+        session = self.controller.session
+        if session.method_choice == 2:
+            if len(session.d_data) > 200:
+                pts_per_marker = round(len(session.d_data) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(5, 3))
+            fig, ax = self.pd_plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            ax.plot(config.t_data, config.d_data, c='#1638cc', linewidth=0.8, label='P')
-            plt.plot(config.t_data[::pts_per_marker], config.d_data[::pts_per_marker], linestyle='None', marker='.',
-                     markeredgecolor='#030785',
-                     markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.plot(session.t_data, session.d_data, c='#1638cc', linewidth=0.8, label='P')
+            ax.plot(session.t_data[::pts_per_marker], session.d_data[::pts_per_marker], linestyle='None', marker='.',
+                    markeredgecolor='#030785',
+                    markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('t (s)')
-            ax.set_ylabel(f'D ({config.d_unit})')
+            ax.set_ylabel(f'D ({session.d_unit})')
             ax.set_title('D/t graph')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
-            canvas = FigureCanvasTkAgg(fig, self)
-            canvas.get_tk_widget().grid(row=0, column=0, columnspan=5, padx=5, pady=5)
+            self.pd_plot.draw()
 
     def tkraise(self):
         """
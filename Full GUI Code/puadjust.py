@@ -1,8 +1,11 @@
 import tkinter as tk
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.ticker import ScalarFormatter
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from alignment import find_lag
+from blitting import BlitManager
+from plotarea import PlotArea
+from shiftedarray import shifted_view
+from units import convert_session_to_si
 import config
 
 
@@ -11,89 +14,45 @@ class PUAdjust(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=config.bg_col)
         self.controller = controller
+        session = controller.session  # Data and results of the current analysis
 
         def save_adjusted():
             """
             Called when user moves to the next frame 'PULoop'.
-            Saves adjusted data globally to config.p_data_adjusted, config.u_data_adjusted, and config.d_data_adjusted.
+            Saves adjusted data to session.p_data_adjusted, session.u_data_adjusted, and session.d_data_adjusted.
 
             Convert the temporary adjusted time data into actual change in the data arrays. This is achieved by
             removing the necessary number of elements from one end of the array, and extending the opposite end
             with duplicates of the end value.
             For example: [1, 2, 3, 4, 5, 6] shifted left by 1 time step would become [2, 3, 4, 5, 6, 6].
+            The shifted arrays are views of session.p_data, session.u_data and session.d_data (see 'shiftedarray.py').
             """
-            if config.method_choice == 1:
-                config.p_data_adjusted = config.p_data.copy()
-                p_delta_t = config.p_t_adjusted[0]  # Amount of time adjusted by the user
-                p_index = int(p_delta_t * config.sampling_frequency)  # No. of array indices corresponding to delta_t
-
-                # Change in index is used to shift data left or right the correct amount, in the manner described above.
-                # config.p_data_adjusted[0] * np.ones(p_index) creates array of duplicates of the required length.
-                # config.p_data_adjusted[:-p_index] excludes from concatenation elements which are pushed off the end.
-                if p_index > 0:
-                    config.p_data_adjusted = np.concatenate(
-                        (config.p_data_adjusted[0] * np.ones(p_index), config.p_data_adjusted[:-p_index]))
-                elif p_index < 0:
-                    config.p_data_adjusted = np.concatenate(
-                        (config.p_data_adjusted[-p_index:], config.p_data_adjusted[-1] * np.ones(-p_index)))
-
-            if config.method_choice == 1 or config.method_choice == 2:
-                config.u_data_adjusted = config.u_data.copy()
-                u_delta_t = config.u_t_adjusted[0]  # Amount of time adjusted by the user
-                u_index = int(u_delta_t * config.sampling_frequency)  # No. of array indices corresponding to delta_t
-
-                # Change in index is used to shift data left or right the correct amount, in the manner described above.
-                # config.p_data_adjusted[0] * np.ones(p_index) creates array of duplicates of the required length.
-                # config.p_data_adjusted[:-p_index] excludes from concatenation elements which are pushed off the end.
-                if u_index > 0:
-                    config.u_data_adjusted = np.concatenate(
-                        (config.u_data_adjusted[0] * np.ones(u_index), config.u_data_adjusted[:-u_index]))
-                elif u_index < 0:
-                    config.u_data_adjusted = np.concatenate(
-                        (config.u_data_adjusted[-u_index:], config.u_data_adjusted[-1] * np.ones(-u_index)))
-
-            if config.method_choice == 2:
-                config.d_data_adjusted = config.d_data.copy()
-                d_delta_t = config.d_t_adjusted[0]  # Amount of time adjusted by the user
-                d_index = int(d_delta_t * config.sampling_frequency)  # No. of array indices corresponding to delta_t
-
-                # Change in index is used to shift data left or right the correct amount, in the manner described above.
-                # config.p_data_adjusted[0] * np.ones(p_index) creates array of duplicates of the required length.
-                # config.p_data_adjusted[:-p_index] excludes from concatenation elements which are pushed off the end.
-                if d_index > 0:
-                    config.d_data_adjusted = np.concatenate(
-                        (config.d_data_adjusted[0] * np.ones(d_index), config.d_data_adjusted[:-d_index]))
-                elif d_index < 0:
-                    config.d_data_adjusted = np.concatenate(
-                        (config.d_data_adjusted[-d_index:], config.d_data_adjusted[-1] * np.ones(-d_index)))
+            # Each adjusted array is a ShiftedArray view of the original data, so no data is copied here. Views which
+            # already exist have their shift updated in place.
+            if session.method_choice == 1:
+                session.p_data_adjusted = shifted_view(session.p_data, session.p_t_adjusted,
+                                                       session.sampling_frequency, session.p_data_adjusted)
+
+            if session.method_choice == 1 or session.method_choice == 2:
+                session.u_data_adjusted = shifted_view(session.u_data, session.u_t_adjusted,
+                                                       session.sampling_frequency, session.u_data_adjusted)
+
+            if session.method_choice == 2:
+                session.d_data_adjusted = shifted_view(session.d_data, session.d_t_adjusted,
+                                                       session.sampling_frequency, session.d_data_adjusted)
 
         def convert_units():
             """
             Called when user presses GUI button 'btn_next' to move to 'PULoop frame'.
             Convert all units into SI so that correct values can be obtained from loop analysis.
-            Reads config.p_unit, config.u_unit, and config.d_unit which were assigned by user in 'InputPage' frame.
-            Also generates lnD data array as config.lnd_data_adjusted if non-invasive analysis is being carried out.
+            Reads session.p_unit, session.u_unit, and session.d_unit which were assigned by user in 'InputPage' frame.
+            Also generates lnD data array as session.lnd_data_adjusted if non-invasive analysis is being carried out.
+            The adjusted data arrays are views of session.p_data, session.u_data and session.d_data, so they
+            are converted with them.
             """
-            if config.p_unit == 'kPa':
-                config.p_data *= 1000
-                config.p_data_adjusted *= 1000
-            if config.p_unit == 'mmHg':
-                config.p_data *= 133
-                config.p_data_adjusted *= 133
-            if config.u_unit == 'cm/s':
-                config.u_data /= 100
-                config.u_data_adjusted /= 100
-            if config.u_unit == 'mm/s':
-                config.u_data /= 1000
-                config.u_data_adjusted /= 1000
-            if config.d_unit == 'cm':
-                config.d_data /= 100
-                config.d_data_adjusted /= 100
-            if config.d_unit == 'mm':
-                config.d_data /= 1000
-                config.d_data_adjusted /= 1000
-
-            config.lnd_data_adjusted = np.log(config.d_data_adjusted)
+            convert_session_to_si(session)
+
+            session.lnd_data_adjusted = np.log(session.d_data_adjusted)
 
         def shift_p_left():
             """
@@ -102,17 +61,17 @@ class PUAdjust(tk.Frame):
             plotted, shifting the P waveform left by one time step.
             Updates plot dynamically without redrawing the whole thing.
             """
-            if config.method_choice == 1 or config.method_choice == 3:
-                config.p_t_adjusted -= 1 / config.sampling_frequency  # Adjust time array by 1 time step
-                config.p_line.set_xdata(config.p_t_adjusted)          # Update plot line
+            if session.method_choice == 1 or session.method_choice == 3:
+                session.p_t_adjusted -= 1 / session.sampling_frequency  # Adjust time array by 1 time step
+                session.p_line.set_xdata(session.p_t_adjusted)          # Update plot line
 
-                if len(config.p_data) > 200:
-                    pts_per_marker = round(len(config.p_data) / 200)  # Get number of markers required
+                if len(session.p_data) > 200:
+                    pts_per_marker = round(len(session.p_data) / 200)  # Get number of markers required
                 else:
                     pts_per_marker = 1
-                config.p_markers[0].set_xdata(config.p_t_adjusted[::pts_per_marker])  # Update plot markers
+                session.p_markers[0].set_xdata(session.p_t_adjusted[::pts_per_marker])  # Update plot markers
 
-                self.canvas.draw()  # Redraw the canvas on which the plot is placed
+                self.blit.update()  # Redraw only the moved waveform on the saved background
 
         def shift_p_right():
             """
@@ -121,17 +80,17 @@ class PUAdjust(tk.Frame):
             plotted, shifting the P waveform right by one time step.
             Updates plot dynamically without redrawing the whole thing.
             """
-            if config.method_choice == 1 or config.method_choice == 3:
-                config.p_t_adjusted += 1 / config.sampling_frequency  # Adjust time array by 1 time step
-                config.p_line.set_xdata(config.p_t_adjusted)          # Update plot line
+            if session.method_choice == 1 or session.method_choice == 3:
+                session.p_t_adjusted += 1 / session.sampling_frequency  # Adjust time array by 1 time step
+                session.p_line.set_xdata(session.p_t_adjusted)          # Update plot line
 
-                if len(config.p_data) > 200:
-                    pts_per_marker = round(len(config.p_data) / 200)  # Get number of markers required
+                if len(session.p_data) > 200:
+                    pts_per_marker = round(len(session.p_data) / 200)  # Get number of markers required
                 else:
                     pts_per_marker = 1
-                config.p_markers[0].set_xdata(config.p_t_adjusted[::pts_per_marker])  # Update plot markers
+                session.p_markers[0].set_xdata(session.p_t_adjusted[::pts_per_marker])  # Update plot markers
 
-                self.canvas.draw()  # Redraw the canvas on which the plot is placed
+                self.blit.update()  # Redraw only the moved waveform on the saved background
 
         def shift_u_left():
             """
@@ -140,16 +99,16 @@ class PUAdjust(tk.Frame):
             plotted, shifting the U waveform left by one time step.
             Updates plot dynamically without redrawing the whole thing.
             """
-            config.u_t_adjusted -= 1 / config.sampling_frequency  # Adjust time array by 1 time step
-            config.u_line.set_xdata(config.u_t_adjusted)          # Update plot line
+            session.u_t_adjusted -= 1 / session.sampling_frequency  # Adjust time array by 1 time step
+            session.u_line.set_xdata(session.u_t_adjusted)          # Update plot line
 
-            if len(config.u_data) > 200:
-                pts_per_marker = round(len(config.u_data) / 200)  # Get number of markers required
+            if len(session.u_data) > 200:
+                pts_per_marker = round(len(session.u_data) / 200)  # Get number of markers required
             else:
                 pts_per_marker = 1
-            config.u_markers[0].set_xdata(config.u_t_adjusted[::pts_per_marker])  # Update plot markers
+            session.u_markers[0].set_xdata(session.u_t_adjusted[::pts_per_marker])  # Update plot markers
 
-            self.canvas.draw()  # Redraw the canvas on which the plot is placed
+            self.blit.update()  # Redraw only the moved waveform on the saved background
 
         def shift_u_right():
             """
@@ -158,16 +117,16 @@ class PUAdjust(tk.Frame):
             plotted, shifting the U waveform right by one time step.
             Updates plot dynamically without redrawing the whole thing.
             """
-            config.u_t_adjusted += 1 / config.sampling_frequency  # Adjust time array by 1 time step
-            config.u_line.set_xdata(config.u_t_adjusted)          # Update plot line
+            session.u_t_adjusted += 1 / session.sampling_frequency  # Adjust time array by 1 time step
+            session.u_line.set_xdata(session.u_t_adjusted)          # Update plot line
 
-            if len(config.u_data) > 200:
-                pts_per_marker = round(len(config.u_data) / 200)  # Get number of markers required
+            if len(session.u_data) > 200:
+                pts_per_marker = round(len(session.u_data) / 200)  # Get number of markers required
             else:
                 pts_per_marker = 1
-            config.u_markers[0].set_xdata(config.u_t_adjusted[::pts_per_marker])  # Update plot markers
+            session.u_markers[0].set_xdata(session.u_t_adjusted[::pts_per_marker])  # Update plot markers
 
-            self.canvas.draw()  # Redraw the canvas on which the plot is placed
+            self.blit.update()  # Redraw only the moved waveform on the saved background
 
         def shift_d_left():
             """
@@ -176,17 +135,17 @@ class PUAdjust(tk.Frame):
             plotted, shifting the D waveform left by one time step.
             Updates plot dynamically without redrawing the whole thing.
             """
-            if config.method_choice == 2:
-                config.d_t_adjusted -= 1 / config.sampling_frequency  # Adjust time array by 1 time step
-                config.d_line.set_xdata(config.d_t_adjusted)          # Update plot line
+            if session.method_choice == 2:
+                session.d_t_adjusted -= 1 / session.sampling_frequency  # Adjust time array by 1 time step
+                session.d_line.set_xdata(session.d_t_adjusted)          # Update plot line
 
-                if len(config.d_data) > 200:
-                    pts_per_marker = round(len(config.d_data) / 200)  # Get number of markers required
+                if len(session.d_data) > 200:
+                    pts_per_marker = round(len(session.d_data) / 200)  # Get number of markers required
                 else:
                     pts_per_marker = 1
-                config.d_markers[0].set_xdata(config.d_t_adjusted[::pts_per_marker])  # Update plot markers
+                session.d_markers[0].set_xdata(session.d_t_adjusted[::pts_per_marker])  # Update plot markers
 
-                self.canvas.draw()  # Redraw the canvas on which the plot is placed
+                self.blit.update()  # Redraw only the moved waveform on the saved background
 
         def shift_d_right():
             """
@@ -195,17 +154,53 @@ class PUAdjust(tk.Frame):
             plotted, shifting the D waveform right by one time step.
             Updates plot dynamically without redrawing the whole thing.
             """
-            if config.method_choice == 2:
-                config.d_t_adjusted += 1 / config.sampling_frequency  # Adjust time array by 1 time step
-                config.d_line.set_xdata(config.d_t_adjusted)          # Update plot line
+            if session.method_choice == 2:
+                session.d_t_adjusted += 1 / session.sampling_frequency  # Adjust time array by 1 time step
+                session.d_line.set_xdata(session.d_t_adjusted)          # Update plot line
+
+                if len(session.d_data) > 200:
+                    pts_per_marker = round(len(session.d_data) / 200)  # Get number of markers required
+                else:
+                    pts_per_marker = 1
+                session.d_markers[0].set_xdata(session.d_t_adjusted[::pts_per_marker])  # Update plot markers
+
+                self.blit.update()  # Redraw only the moved waveform on the saved background
+
+        def auto_align():
+            """
+            Called when user presses GUI button 'btn_auto_align'.
+            Finds the shift of velocity which best lines it up with pressure (or diameter) across the whole range of
+            shifts in one FFT cross-correlation, then writes the result into session.u_t_adjusted. The P (or D) time
+            array is reset, so the manual shift buttons can then be used for fine-tuning from the aligned position.
+            Updates plot dynamically, redrawing only the moved waveforms.
+            """
+            if session.method_choice == 1:
+                reference = session.p_data
+            elif session.method_choice == 2:
+                reference = session.d_data
+            else:
+                return
+
+            lag = find_lag(reference, session.u_data)  # Shift of U in time steps
+            session.p_t_adjusted = session.t_data.copy()
+            session.d_t_adjusted = session.t_data.copy()
+            session.u_t_adjusted = session.t_data + lag / session.sampling_frequency
+
+            if session.method_choice == 1:
+                lines = [(session.p_line, session.p_markers, session.p_t_adjusted, session.p_data)]
+            else:
+                lines = [(session.d_line, session.d_markers, session.d_t_adjusted, session.d_data)]
+            lines.append((session.u_line, session.u_markers, session.u_t_adjusted, session.u_data))
 
-                if len(config.d_data) > 200:
-                    pts_per_marker = round(len(config.d_data) / 200)  # Get number of markers required
+            for line, markers, t_adjusted, data in lines:
+                line.set_xdata(t_adjusted)  # Update plot line
+                if len(data) > 200:
+                    pts_per_marker = round(len(data) / 200)  # Get number of markers required
                 else:
                     pts_per_marker = 1
-                config.d_markers[0].set_xdata(config.d_t_adjusted[::pts_per_marker])  # Update plot markers
+                markers[0].set_xdata(t_adjusted[::pts_per_marker])  # Update plot markers
 
-                self.canvas.draw()  # Redraw the canvas on which the plot is placed
+            self.blit.update()  # Redraw only the moved waveforms on the saved background
 
         def next_button_press():
             """
@@ -220,10 +215,10 @@ class PUAdjust(tk.Frame):
             # When the button is pressed for next page, user is taken to a different screen depending on whether they
             # are performing windkessel or loop analysis.
             save_adjusted()
-            if config.method_choice == 1 or config.method_choice == 2:
+            if session.method_choice == 1 or session.method_choice == 2:
                 convert_units()
                 controller.show_frame("PULoop")
-            elif config.method_choice == 3:
+            elif session.method_choice == 3:
                 controller.show_frame("Windkessel")
 
         # Configure row weights
@@ -269,6 +264,8 @@ class PUAdjust(tk.Frame):
             relief=tk.FLAT,
             width=5,
             height=config.btn_height,
+            repeatdelay=config.btn_repeat_delay,
+            repeatinterval=config.btn_repeat_interval,
             command=lambda: [shift_p_left(), shift_d_left()]
         )
         btn_p_right = tk.Button(
@@ -282,6 +279,8 @@ class PUAdjust(tk.Frame):
             relief=tk.FLAT,
             width=5,
             height=config.btn_height,
+            repeatdelay=config.btn_repeat_delay,
+            repeatinterval=config.btn_repeat_interval,
             command=lambda: [shift_p_right(), shift_d_right()]
         )
         btn_u_left = tk.Button(
@@ -295,6 +294,8 @@ class PUAdjust(tk.Frame):
             relief=tk.FLAT,
             width=5,
             height=config.btn_height,
+            repeatdelay=config.btn_repeat_delay,
+            repeatinterval=config.btn_repeat_interval,
             command=lambda: shift_u_left()
         )
         btn_u_right = tk.Button(
@@ -308,8 +309,23 @@ class PUAdjust(tk.Frame):
             relief=tk.FLAT,
             width=5,
             height=config.btn_height,
+            repeatdelay=config.btn_repeat_delay,
+            repeatinterval=config.btn_repeat_interval,
             command=lambda: shift_u_right()
         )
+        btn_auto_align = tk.Button(
+            self,
+            text="Auto align",
+            font=config.font,
+            bg=config.btn_col,
+            fg=config.btn_text,
+            activebackground=config.btn_col_a,
+            activeforeground=config.btn_text_a,
+            relief=tk.FLAT,
+            width=config.btn_width,
+            height=config.btn_height,
+            command=lambda: auto_align()
+        )
 
         lbl_p = tk.Label(self, text="P", font=('Roboto', 14), bg=config.bg_col, fg=config.lbl_text_col)
         lbl_u = tk.Label(self, text="U", font=('Roboto', 14), bg=config.bg_col, fg=config.lbl_text_col)
@@ -323,53 +339,61 @@ class PUAdjust(tk.Frame):
         lbl_u.grid(row=2, column=10, padx=5, pady=5)
         btn_u_right.grid(row=2, column=11, padx=5, pady=5)
 
+        btn_auto_align.grid(row=2, column=13, padx=5, pady=5)
+
         btn_next.grid(row=2, column=15, padx=5, pady=5)
         btn_back.grid(row=2, column=0, padx=5, pady=5)
 
+        self.plot = PlotArea(self, (8, 5), row=0, column=0, columnspan=16, padx=5, pady=5)  # Reused by graph1()
+        self.blit = BlitManager(self.plot.canvas)
+
     def update_adjusted(self):
         """
         Called as soon as this frame opens in GUI.
-        Creates temporary time arrays to be adjusted by the user without editing config.t_data.
+        Creates temporary time arrays to be adjusted by the user without editing session.t_data.
         This allows for convenient shifting of the various waveforms left and right, without making permanent changes to
-        config.p_data, config.p_data, or config.p_data until the presses 'btn_next'.
+        session.p_data, session.p_data, or session.p_data until the presses 'btn_next'.
         """
-        config.p_t_adjusted = config.t_data.copy()
-        config.u_t_adjusted = config.t_data.copy()
-        config.d_t_adjusted = config.t_data.copy()
+        session = self.controller.session
+        session.p_t_adjusted = session.t_data.copy()
+        session.u_t_adjusted = session.t_data.copy()
+        session.d_t_adjusted = session.t_data.copy()
 
     def graph1(self):
         """
-        Called as soon as this frame opens in GUI. Also called each time a waveform is shifted left or right by user
-        button presses in the GUI.
+        Called as soon as this frame opens in GUI. Waveforms shifted left or right by user button presses are then
+        redrawn by self.blit, which only draws the moved lines and markers on top of the rest of the saved plot.
         If user chose invasive analysis, plots P vs t and U vs t on the same axes, so they can be aligned by user.
         If user chose non-invasive analysis, plots D vs t and U vs t on the same axes, so they can be aligned by user.
         """
-        if config.method_choice == 1 or config.method_choice == 3:
+        session = self.controller.session
+        if session.method_choice == 1 or session.method_choice == 3:
             # For invasive or windkessel analysis, plot P and U on same axes against time,
             # allowing the user to manually align them.
-            if len(config.p_data) > 200:
-                pts_per_marker = round(len(config.p_data) / 200)
+            if len(session.p_data) > 200:
+                pts_per_marker = round(len(session.p_data) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax1 = plt.subplots(figsize=(8, 5))
+            fig, ax1 = self.plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax1.set_facecolor(config.plot_bg_col)
-            config.p_line, = ax1.plot(config.p_t_adjusted, config.p_data, c='#1638cc', linewidth=0.8, label='P')
-            config.p_markers = ax1.plot(config.p_t_adjusted[::pts_per_marker], config.p_data[::pts_per_marker],
+            session.p_line, = ax1.plot(session.p_t_adjusted, session.p_data, c='#1638cc', linewidth=0.8, label='P')
+            session.p_markers = ax1.plot(session.p_t_adjusted[::pts_per_marker], session.p_data[::pts_per_marker],
                                         linestyle='None',
                                         marker='.', markeredgecolor='#030785', markerfacecolor='None',
                                         markeredgewidth=0.5, markersize=2)
             ax1.set_xlabel('t (s)')
-            ax1.set_ylabel(f'P ({config.p_unit})')
+            ax1.set_ylabel(f'P ({session.p_unit})')
 
             ax2 = ax1.twinx()
-            config.u_line, = ax2.plot(config.u_t_adjusted, config.u_data, c='#e00202', linewidth=0.8, label='U')
-            config.u_markers = ax2.plot(config.u_t_adjusted[::pts_per_marker], config.u_data[::pts_per_marker], linestyle='None',
+            session.u_line, = ax2.plot(session.u_t_adjusted, session.u_data, c='#e00202', linewidth=0.8, label='U')
+            session.u_markers = ax2.plot(session.u_t_adjusted[::pts_per_marker], session.u_data[::pts_per_marker], linestyle='None',
                      marker='.',
                      markeredgecolor='#8a0000', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            ax2.set_ylabel(f'U ({config.u_unit})')
+            ax2.set_ylabel(f'U ({session.u_unit})')
 
-            lines = [config.p_line, config.u_line]
+            lines = [session.p_line, session.u_line]
+            moving = [session.p_line, session.p_markers[0], session.u_line, session.u_markers[0]]
             labels = [line.get_label() for line in lines]
             ax1.legend(lines, labels, loc='upper right')
             ax1.minorticks_on()
@@ -379,31 +403,32 @@ class PUAdjust(tk.Frame):
             ax1.tick_params(axis='both', which='major', labelsize=12)
             fig.tight_layout()
 
-        elif config.method_choice == 2:
+        elif session.method_choice == 2:
             # For non-invasive analysis, plot P and D on same axes against time,
             # allowing the user to manually align them.
-            if len(config.d_data) > 200:
-                pts_per_marker = round(len(config.d_data) / 200)
+            if len(session.d_data) > 200:
+                pts_per_marker = round(len(session.d_data) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax1 = plt.subplots(figsize=(8, 5))
+            fig, ax1 = self.plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax1.set_facecolor(config.plot_bg_col)
-            config.d_line, = ax1.plot(config.d_t_adjusted, config.d_data, c='#1638cc', linewidth=0.8, label='P')
-            config.d_markers = ax1.plot(config.d_t_adjusted[::pts_per_marker], config.d_data[::pts_per_marker], linestyle='None',
+            session.d_line, = ax1.plot(session.d_t_adjusted, session.d_data, c='#1638cc', linewidth=0.8, label='P')
+            session.d_markers = ax1.plot(session.d_t_adjusted[::pts_per_marker], session.d_data[::pts_per_marker], linestyle='None',
                      marker='.',
                      markeredgecolor='#030785', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
             ax1.set_xlabel('t (s)')
-            ax1.set_ylabel(f'D ({config.d_unit})')
+            ax1.set_ylabel(f'D ({session.d_unit})')
 
             ax2 = ax1.twinx()
-            config.u_line, = ax2.plot(config.u_t_adjusted, config.u_data, c='#e00202', linewidth=0.8, label='U')
-            config.u_markers = ax2.plot(config.u_t_adjusted[::pts_per_marker], config.u_data[::pts_per_marker], linestyle='None',
+            session.u_line, = ax2.plot(session.u_t_adjusted, session.u_data, c='#e00202', linewidth=0.8, label='U')
+            session.u_markers = ax2.plot(session.u_t_adjusted[::pts_per_marker], session.u_data[::pts_per_marker], linestyle='None',
                      marker='.',
                      markeredgecolor='#8a0000', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            ax2.set_ylabel(f'U ({config.u_unit})')
+            ax2.set_ylabel(f'U ({session.u_unit})')
 
-            lines = [config.d_line, config.u_line]
+            lines = [session.d_line, session.u_line]
+            moving = [session.d_line, session.d_markers[0], session.u_line, session.u_markers[0]]
             labels = [line.get_label() for line in lines]
             ax1.legend(lines, labels, loc='upper right')
             ax1.minorticks_on()
@@ -413,8 +438,8 @@ class PUAdjust(tk.Frame):
             ax1.tick_params(axis='both', which='major', labelsize=12)
             fig.tight_layout()
 
-        self.canvas = FigureCanvasTkAgg(fig, self)
-        self.canvas.get_tk_widget().grid(row=0, column=0, columnspan=16, padx=5, pady=5)
+        self.blit.set_artists(moving)  # Set after the legend is made, so legend lines are not animated
+        self.plot.draw()
 
     def tkraise(self):
         """
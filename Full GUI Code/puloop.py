@@ -1,11 +1,13 @@
 import tkinter as tk
 import numpy as np
-import matplotlib.pyplot as plt
 from tkinter import messagebox
-from sklearn.linear_model import LinearRegression
 from matplotlib.ticker import ScalarFormatter
 from tkinter.filedialog import asksaveasfilename
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from blitting import BlitManager
+from loopfit import find_linear_section
+from plotarea import PlotArea
+from shiftedarray import shifted_view
+from units import convert_session_from_si
 import config
 
 
@@ -14,6 +16,7 @@ class PULoop(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=config.bg_col)
         self.controller = controller
+        session = controller.session  # Data and results of the current analysis
 
         """
         The functions save_adjusted(), shift_u_left(), and shift_u_right() are copied directly from 'puadjust.py'
@@ -25,57 +28,27 @@ class PULoop(tk.Frame):
         def save_adjusted():
             """
             Called when user moves to the next frame 'PULoop'.
-            Saves adjusted data globally to config.p_data_adjusted, config.u_data_adjusted, and config.d_data_adjusted.
+            Saves adjusted data to session.p_data_adjusted, session.u_data_adjusted, and session.d_data_adjusted.
 
             Convert the temporary adjusted time data into actual change in the data arrays. This is achieved by
             removing the necessary number of elements from one end of the array, and extending the opposite end
             with duplicates of the end value.
             For example: [1, 2, 3, 4, 5, 6] shifted left by 1 time step would become [2, 3, 4, 5, 6, 6].
+            The shifted arrays are views of session.p_data, session.u_data and session.d_data (see 'shiftedarray.py').
             """
-            if config.method_choice == 1:
-                config.p_data_adjusted = config.p_data.copy()
-                p_delta_t = config.p_t_adjusted[0]  # Amount of time adjusted by the user
-                p_index = int(p_delta_t * config.sampling_frequency)  # No. of array indices corresponding to delta_t
-
-                # Change in index is used to shift data left or right the correct amount, in the manner described above.
-                # config.p_data_adjusted[0] * np.ones(p_index) creates array of duplicates of the required length.
-                # config.p_data_adjusted[:-p_index] excludes from concatenation elements which are pushed off the end.
-                if p_index > 0:
-                    config.p_data_adjusted = np.concatenate(
-                        (config.p_data_adjusted[0] * np.ones(p_index), config.p_data_adjusted[:-p_index]))
-                elif p_index < 0:
-                    config.p_data_adjusted = np.concatenate(
-                        (config.p_data_adjusted[-p_index:], config.p_data_adjusted[-1] * np.ones(-p_index)))
-
-            if config.method_choice == 1 or config.method_choice == 2:
-                config.u_data_adjusted = config.u_data.copy()
-                u_delta_t = config.u_t_adjusted[0]  # Amount of time adjusted by the user
-                u_index = int(u_delta_t * config.sampling_frequency)  # No. of array indices corresponding to delta_t
-
-                # Change in index is used to shift data left or right the correct amount, in the manner described above.
-                # config.p_data_adjusted[0] * np.ones(p_index) creates array of duplicates of the required length.
-                # config.p_data_adjusted[:-p_index] excludes from concatenation elements which are pushed off the end.
-                if u_index > 0:
-                    config.u_data_adjusted = np.concatenate(
-                        (config.u_data_adjusted[0] * np.ones(u_index), config.u_data_adjusted[:-u_index]))
-                elif u_index < 0:
-                    config.u_data_adjusted = np.concatenate(
-                        (config.u_data_adjusted[-u_index:], config.u_data_adjusted[-1] * np.ones(-u_index)))
-
-            if config.method_choice == 2:
-                config.d_data_adjusted = config.d_data.copy()
-                d_delta_t = config.d_t_adjusted[0]  # Amount of time adjusted by the user
-                d_index = int(d_delta_t * config.sampling_frequency)  # No. of array indices corresponding to delta_t
-
-                # Change in index is used to shift data left or right the correct amount, in the manner described above.
-                # config.p_data_adjusted[0] * np.ones(p_index) creates array of duplicates of the required length.
-                # config.p_data_adjusted[:-p_index] excludes from concatenation elements which are pushed off the end.
-                if d_index > 0:
-                    config.d_data_adjusted = np.concatenate(
-                        (config.d_data_adjusted[0] * np.ones(d_index), config.d_data_adjusted[:-d_index]))
-                elif d_index < 0:
-                    config.d_data_adjusted = np.concatenate(
-                        (config.d_data_adjusted[-d_index:], config.d_data_adjusted[-1] * np.ones(-d_index)))
+            # Each adjusted array is a ShiftedArray view of the original data, so no data is copied here. Views which
+            # already exist have their shift updated in place.
+            if session.method_choice == 1:
+                session.p_data_adjusted = shifted_view(session.p_data, session.p_t_adjusted,
+                                                       session.sampling_frequency, session.p_data_adjusted)
+
+            if session.method_choice == 1 or session.method_choice == 2:
+                session.u_data_adjusted = shifted_view(session.u_data, session.u_t_adjusted,
+                                                       session.sampling_frequency, session.u_data_adjusted)
+
+            if session.method_choice == 2:
+                session.d_data_adjusted = shifted_view(session.d_data, session.d_t_adjusted,
+                                                       session.sampling_frequency, session.d_data_adjusted)
 
         def shift_u_left():
             """
@@ -83,7 +56,7 @@ class PULoop(tk.Frame):
             Subtract one time step (1/sampling frequency) from every element of the time data against which U is
             plotted, shifting the U waveform left by one time step.
             """
-            config.u_t_adjusted = config.u_t_adjusted - 1 / config.sampling_frequency
+            session.u_t_adjusted = session.u_t_adjusted - 1 / session.sampling_frequency
 
         def shift_u_right():
             """
@@ -91,161 +64,88 @@ class PULoop(tk.Frame):
             Add one time step (1/sampling frequency) to every element of the time data against which U is
             plotted, shifting the U waveform right by one time step.
             """
-            config.u_t_adjusted = config.u_t_adjusted + 1 / config.sampling_frequency
+            session.u_t_adjusted = session.u_t_adjusted + 1 / session.sampling_frequency
 
         def update_plot():
             """
             Called whenever user adjusts loop alignment using GUI buttons 'btn_u_left' or 'btn_u_right'.
-            Updates data in loop graph without redrawing the whole thing.
+            Updates data in loop graph without redrawing the whole thing. Only the loop line and markers are drawn
+            again, on top of the rest of the plot saved by self.blit.
             """
-            if len(config.u_data) > 200:
-                pts_per_marker = round(len(config.u_data) / 200)  # Get number of markers required
+            if len(session.u_data) > 200:
+                pts_per_marker = round(len(session.u_data) / 200)  # Get number of markers required
             else:
                 pts_per_marker = 1
 
-            config.loop_line.set_xdata(config.u_data_adjusted)
-            config.loop_markers[0].set_xdata(config.u_data_adjusted[::pts_per_marker])
-            self.canvas.draw()
+            session.loop_line.set_xdata(session.u_data_adjusted)
+            session.loop_markers[0].set_xdata(session.u_data_adjusted[::pts_per_marker])
+            self.blit.update()
 
         def manual_gradient():
             """
             Called when user presses GUI button 'btn_enter_gradient' after inputting the loop gradient in entry box
             'ent_gradient'.
             Allow the user to manually read and enter the gradient of the loop linear section.
-            Calculates wave speed, c, by either PU-loop or lnDU-loop, and saves globally to config.c.
+            Calculates wave speed, c, by either PU-loop or lnDU-loop, and saves to session.c.
             """
             # Allow the user to manually read and enter the gradient of the loop linear section.
-            if config.method_choice == 1:
+            if session.method_choice == 1:
                 loop_gradient = float(ent_gradient.get())  # Read user input gradient and convert to float
-                config.c = (1 / config.rho) * loop_gradient  # Calculate wave speed, c, using PU-loop
+                session.c = (1 / session.rho) * loop_gradient  # Calculate wave speed, c, using PU-loop
 
-            elif config.method_choice == 2:
+            elif session.method_choice == 2:
                 loop_gradient = float(ent_gradient.get())  # Read user input gradient and convert to float
-                config.c = 0.5 * (1 / loop_gradient)  # Calculate wave speed, c, using ln(D)U-loop
+                session.c = 0.5 * (1 / loop_gradient)  # Calculate wave speed, c, using ln(D)U-loop
 
             ent_wave_speed.delete(0, tk.END)  # Clear wave speed display box
-            ent_wave_speed.insert(0, config.c)  # Display calculated wave speed in GUI
+            ent_wave_speed.insert(0, session.c)  # Display calculated wave speed in GUI
 
         def automatic_gradient():
             """
             Called when user pressed GUI button 'btn_auto_gradient'.
             Automatically detects gradient of the linear portion of the loop plot. This is done by moving through
             'frames' and performing linear regression. The frame with the highest R2 score is taken as most linear.
+            The regressions for every frame are calculated together by find_linear_section() in 'loopfit.py'.
             Once gradient of either PU-loop or lnDU-loop has been determined, calculates wave speed, c, and assigns to
-            global config.c.
+            session.c.
             Displays loopgraph() with the linear section highlighted in a different colour.
             """
-            if config.method_choice == 1:
+            if session.method_choice == 1:
                 pu_frame_fraction = 0.04  # Determines size of linear frames which are checked for linearity
 
-                u_reg = config.u_data_adjusted
-                p_reg = config.p_data_adjusted
-
-                r2_values = np.array([])
-                slopes = np.array([])
-                intercepts = np.array([])
-                window_starts = np.array([])
-
-                frame_size = round(len(u_reg) * pu_frame_fraction)
-                jump = round(frame_size / 5)
-                start = np.argmin(p_reg)  # Start search for linear section at lowest point of loop
-                if (start + frame_size) > len(u_reg):
-                    start = 0
-                start_og = start
-
-                check_r2 = 1  # Checks the linear window has not moved around the corner of the loop.
-                while (start + frame_size) < len(u_reg) and check_r2 > 0.9:
-                    end = start + frame_size
-
-                    # Select 'frame' within loop to be tested for linearity
-                    x_segment = u_reg[start:end].reshape(-1, 1)
-                    y_segment = p_reg[start:end]
-
-                    reg = LinearRegression().fit(x_segment, y_segment)  # Perform linear regression
-                    r2 = reg.score(x_segment, y_segment)
-                    slope = reg.coef_
-                    intercept = reg.intercept_
-
-                    r2_values = np.append(r2_values, r2)
-                    slopes = np.append(slopes, slope)
-                    intercepts = np.append(intercepts, intercept)
-                    window_starts = np.append(window_starts, start)
-
-                    x_check = u_reg[start_og:end].reshape(-1, 1)
-                    y_check = p_reg[start_og:end]
-                    check_reg = LinearRegression().fit(x_check, y_check)
-                    check_r2 = check_reg.score(x_check, y_check)
+                u_reg = session.u_data_adjusted
+                p_reg = session.p_data_adjusted
 
-                    start += jump
+                # Find gradient, y-intercept and starting index of the most linear section of the loop
+                lin_slope, lin_intercept, lin_window, frame_size = find_linear_section(u_reg, p_reg,
+                                                                                       pu_frame_fraction)
 
-                lin_index = np.argmax(r2_values)  # Find highest R2 values for most linear section
-                lin_slope = slopes[lin_index]  # Find gradient for this section
-                lin_intercept = intercepts[lin_index]  # Find y-intercept for this section
-                lin_window = int(window_starts[lin_index])  # Find starting index of linear section within the loop
+                # Assign x and y values of linear section of loop to session.x_lin and session.y_lin respectively.
+                session.lin_x = u_reg[lin_window:lin_window + frame_size].copy()
+                session.lin_y = lin_slope * session.lin_x + lin_intercept
 
-                # Assign x and y values of linear section of loop to config.x_lin and config.y_lin respectively.
-                config.lin_x = u_reg[lin_window:lin_window + frame_size].copy()
-                config.lin_y = lin_slope * config.lin_x + lin_intercept
+                session.c = (1 / session.rho) * lin_slope  # Calculate wave speed, c, using PU-loop
 
-                config.c = (1 / config.rho) * lin_slope  # Calculate wave speed, c, using PU-loop
-
-            elif config.method_choice == 2:
+            elif session.method_choice == 2:
                 lndu_frame_fraction = 0.02  # Determines size of linear frames which are checked for linearity
 
-                u_reg = config.u_data_adjusted
-                lnd_reg = config.lnd_data_adjusted
-
-                r2_values = np.array([])
-                slopes = np.array([])
-                intercepts = np.array([])
-                window_starts = np.array([])
-
-                frame_size = round(len(u_reg) * lndu_frame_fraction)
-                jump = round(frame_size / 5)
-                start = np.argmin(lnd_reg)  # Start search for linear section at lowest point of loop
-                if (start + frame_size) > len(u_reg):
-                    start = 0
-                start_og = start
-
-                check_r2 = 1  # Checks the linear window has not moved around the corner of the loop.
-                while (start + frame_size) < len(u_reg) and check_r2 > 0.9:
-                    end = start + frame_size
-                    # Select 'frame' within loop to be tested for linearity
-                    x_segment = u_reg[start:end].reshape(-1, 1)
-                    y_segment = lnd_reg[start:end]
-
-                    reg = LinearRegression().fit(x_segment, y_segment)  # Perform linear regression
-                    r2 = reg.score(x_segment, y_segment)
-                    slope = reg.coef_
-                    intercept = reg.intercept_
+                u_reg = session.u_data_adjusted
+                lnd_reg = session.lnd_data_adjusted
 
-                    r2_values = np.append(r2_values, r2)
-                    slopes = np.append(slopes, slope)
-                    intercepts = np.append(intercepts, intercept)
-                    window_starts = np.append(window_starts, start)
+                # Find gradient, y-intercept and starting index of the most linear section of the loop
+                lin_slope, lin_intercept, lin_window, frame_size = find_linear_section(u_reg, lnd_reg,
+                                                                                       lndu_frame_fraction)
 
-                    x_check = u_reg[start_og:end].reshape(-1, 1)
-                    y_check = lnd_reg[start_og:end]
-                    check_reg = LinearRegression().fit(x_check, y_check)
-                    check_r2 = check_reg.score(x_check, y_check)
+                # Assign x and y values of linear section of loop to session.x_lin and session.y_lin respectively.
+                session.lin_x = u_reg[lin_window:lin_window + frame_size].copy()
+                session.lin_y = lin_slope * session.lin_x + lin_intercept
 
-                    start += jump
-
-                lin_index = np.argmax(r2_values)  # Find highest R2 values for most linear section
-                lin_slope = slopes[lin_index]  # Find gradient for this section
-                lin_intercept = intercepts[lin_index]  # Find y-intercept for this section
-                lin_window = int(window_starts[lin_index])  # Find starting index of linear section within the loop
-
-                # Assign x and y values of linear section of loop to config.x_lin and config.y_lin respectively.
-                config.lin_x = u_reg[lin_window:lin_window + frame_size].copy()
-                config.lin_y = lin_slope * config.lin_x + lin_intercept
-
-                config.c = 0.5 * (1 / lin_slope)  # Calculate wave speed using lndDU-loop
+                session.c = 0.5 * (1 / lin_slope)  # Calculate wave speed using lndDU-loop
 
             ent_gradient.delete(0, tk.END)  # Clear gradient display box
             ent_gradient.insert(0, lin_slope)  # Display calculated gradient in GUI
             ent_wave_speed.delete(0, tk.END)  # Clear wave speed display box
-            ent_wave_speed.insert(0, config.c)  # Display calculated wave speed in GUI
+            ent_wave_speed.insert(0, session.c)  # Display calculated wave speed in GUI
             self.loopgraph()  # Display loop graph with linear section added
 
         def convert_units_back():
@@ -253,46 +153,31 @@ class PULoop(tk.Frame):
             Called if user goes back to previous frame 'PUAdjust' by pressing GUI button 'btn_back'.
             Units must flip back and forth between pages to avoid units being 'converted' many times repeatedly as the
             user navigates back and forth through the GUI.
+            The adjusted data arrays are views of session.p_data, session.u_data and session.d_data, so they
+            are converted with them.
             """
             # Convert back to original units if user goes back to previous page.
-            if config.p_unit == 'kPa':
-                config.p_data /= 1000
-                config.p_data_adjusted /= 1000
-            if config.p_unit == 'mmHg':
-                config.p_data /= 133
-                config.p_data_adjusted /= 133
-            if config.u_unit == 'cm/s':
-                config.u_data *= 100
-                config.u_data_adjusted *= 100
-            if config.u_unit == 'mm/s':
-                config.u_data *= 1000
-                config.u_data_adjusted *= 1000
-            if config.d_unit == 'cm':
-                config.d_data *= 100
-                config.d_data_adjusted *= 100
-            if config.d_unit == 'mm':
-                config.d_data *= 1000
-                config.d_data_adjusted *= 1000
+            convert_session_from_si(session)
 
         def save_data():
             """
             Called when user presses GUI button 'btn_save_data'.
             Asks the user to select a file path to save to using asksaveasfilename() from tkinter.filedialog.
-            Saves config.t_data,  config.p_data_adjusted,  config.u_data_adjusted, and/or  config.d_data_adjusted into a
+            Saves session.t_data,  session.p_data_adjusted,  session.u_data_adjusted, and/or  session.d_data_adjusted into a
             single raw data .txt file.
             """
             file_path = asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
-            if config.method_choice == 1:
-                data = np.column_stack((config.t_data, config.p_data_adjusted, config.u_data_adjusted))
-            elif config.method_choice == 2:
-                data = np.column_stack((config.t_data, config.d_data_adjusted, config.u_data_adjusted))
+            if session.method_choice == 1:
+                data = np.column_stack((session.t_data, session.p_data_adjusted, session.u_data_adjusted))
+            elif session.method_choice == 2:
+                data = np.column_stack((session.t_data, session.d_data_adjusted, session.u_data_adjusted))
             np.savetxt(file_path, data, fmt='%.6f', delimiter='\t', comments='')
 
         def next_button_press():
             """
             Stops progress through the GUI if the user has not selected data.
             """
-            if config.c != 0:
+            if session.c != 0:
                 controller.show_frame("OutputPage")
             else:
                 messagebox.showwarning("Warning", "Please calculate loop gradient before proceeding.")
@@ -380,6 +265,8 @@ class PULoop(tk.Frame):
             relief=tk.FLAT,
             width=config.btn_width,
             height=config.btn_height,
+            repeatdelay=config.btn_repeat_delay,
+            repeatinterval=config.btn_repeat_interval,
             command=lambda: [shift_u_left(), save_adjusted(), update_plot()]
         )
         btn_u_right = tk.Button(
@@ -393,6 +280,8 @@ class PULoop(tk.Frame):
             relief=tk.FLAT,
             width=config.btn_width,
             height=config.btn_height,
+            repeatdelay=config.btn_repeat_delay,
+            repeatinterval=config.btn_repeat_interval,
             command=lambda: [shift_u_right(), save_adjusted(), update_plot()]
         )
         btn_save_data = tk.Button(
@@ -430,88 +319,94 @@ class PULoop(tk.Frame):
 
         btn_save_data.grid(row=6, column=4, columnspan=4, padx=5, pady=5)
 
+        # Plots are redrawn on the same figures each time this frame opens or the loop gradient is found
+        self.pt_plot = PlotArea(self, (5, 3), row=0, column=0, columnspan=6, padx=5, pady=5)
+        self.tu_plot = PlotArea(self, (5, 3), row=1, column=6, columnspan=5, rowspan=5, padx=5, pady=5)
+        self.loop_plot = PlotArea(self, (5, 3), row=0, column=6, columnspan=5, padx=5, pady=5)
+        self.blit = BlitManager(self.loop_plot.canvas)
+
     def ptgraph(self):
         """
         Called as soon as frame 'PULoop' is opened in GUI.
-        Plot either config.p_data_adjusted vs config.t_data or config.d_data_adjusted vs config.t_data depending on
+        Plot either session.p_data_adjusted vs session.t_data or session.d_data_adjusted vs session.t_data depending on
         whether invasive or non-invasive analysis is being carried out.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if config.method_choice == 1:
-            if len(config.p_data_adjusted) > 200:
-                pts_per_marker = round(len(config.p_data_adjusted) / 200)
+        session = self.controller.session
+        if session.method_choice == 1:
+            if len(session.p_data_adjusted) > 200:
+                pts_per_marker = round(len(session.p_data_adjusted) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(5, 3))
+            fig, ax = self.pt_plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            ax.plot(config.t_data, config.p_data_adjusted, c='#1638cc', linewidth=0.8, label='P')
-            plt.plot(config.t_data[::pts_per_marker], config.p_data_adjusted[::pts_per_marker], linestyle='None',
-                     marker='.', markeredgecolor='#030785', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.plot(session.t_data, session.p_data_adjusted, c='#1638cc', linewidth=0.8, label='P')
+            ax.plot(session.t_data[::pts_per_marker], session.p_data_adjusted[::pts_per_marker], linestyle='None',
+                    marker='.', markeredgecolor='#030785', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('t (s)')
             ax.set_ylabel(f'P (Pa)')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
 
-        elif config.method_choice == 2:
+        elif session.method_choice == 2:
             # Plot graph of D against t.
-            if len(config.d_data_adjusted) > 200:
-                pts_per_marker = round(len(config.d_data_adjusted) / 200)
+            if len(session.d_data_adjusted) > 200:
+                pts_per_marker = round(len(session.d_data_adjusted) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(5, 3))
+            fig, ax = self.pt_plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            ax.plot(config.t_data, config.d_data_adjusted, c='#1638cc', linewidth=0.8, label='P')
-            plt.plot(config.t_data[::pts_per_marker], config.d_data_adjusted[::pts_per_marker], linestyle='None',
-                     marker='.', markeredgecolor='#030785', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.plot(session.t_data, session.d_data_adjusted, c='#1638cc', linewidth=0.8, label='P')
+            ax.plot(session.t_data[::pts_per_marker], session.d_data_adjusted[::pts_per_marker], linestyle='None',
+                    marker='.', markeredgecolor='#030785', markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('t (s)')
             ax.set_ylabel(f'D (m)')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
 
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=0, column=0, columnspan=6, padx=5, pady=5)
+        self.pt_plot.draw()
 
     def tugraph(self):
         """
         Called as soon as frame 'PULoop' is opened in GUI.
-        Plot config.t_data vs config.u_data_adjusted.
+        Plot session.t_data vs session.u_data_adjusted.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if len(config.u_data_adjusted) > 200:
-            pts_per_marker = round(len(config.u_data_adjusted) / 200)
+        session = self.controller.session
+        if len(session.u_data_adjusted) > 200:
+            pts_per_marker = round(len(session.u_data_adjusted) / 200)
         else:
             pts_per_marker = 1
-        fig, ax = plt.subplots(figsize=(5, 3))
+        fig, ax = self.tu_plot.subplots()
         fig.patch.set_facecolor(config.plot_bg_col)
         ax.set_facecolor(config.plot_bg_col)
-        ax.plot(config.u_data_adjusted, config.t_data, c='#e00202', linewidth=0.8, label='U')
-        plt.plot(config.u_data_adjusted[::pts_per_marker], config.t_data[::pts_per_marker], linestyle='None',
-                 marker='.', markeredgecolor='#8a0000',
-                 markerfacecolor='None', markeredgewidth=0.5, markersize=2)
-        plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-        plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+        ax.plot(session.u_data_adjusted, session.t_data, c='#e00202', linewidth=0.8, label='U')
+        ax.plot(session.u_data_adjusted[::pts_per_marker], session.t_data[::pts_per_marker], linestyle='None',
+                marker='.', markeredgecolor='#8a0000',
+                markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
         ax.set_xlabel(f'U (m/s)')
         ax.set_ylabel('t (s)')
-        plt.minorticks_on()
-        plt.tick_params(axis='both', which='major', labelsize=12)
-        plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-        plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+        ax.minorticks_on()
+        ax.tick_params(axis='both', which='major', labelsize=12)
+        ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+        ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
         fig.tight_layout()
 
-        canvas = FigureCanvasTkAgg(fig, self)
-        canvas.get_tk_widget().grid(row=1, column=6, columnspan=5, rowspan=5, padx=5, pady=5)
+        self.tu_plot.draw()
 
     def loopgraph(self):
         """
@@ -521,66 +416,67 @@ class PULoop(tk.Frame):
         loop in a different colour.
         Various aesthetic choices which remain consistent throughout GUI.
         """
-        if config.method_choice == 1:
+        session = self.controller.session
+        if session.method_choice == 1:
             # Plot graph of P against U.
-            if len(config.p_data_adjusted) > 200:
-                pts_per_marker = round(len(config.p_data_adjusted) / 200)
+            if len(session.p_data_adjusted) > 200:
+                pts_per_marker = round(len(session.p_data_adjusted) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(5, 3))
+            fig, ax = self.loop_plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            config.loop_line, = ax.plot(config.u_data_adjusted, config.p_data_adjusted, c='#aa00ff', linewidth=0.8)
-            config.loop_markers = plt.plot(config.u_data_adjusted[::pts_per_marker],
-                                           config.p_data_adjusted[::pts_per_marker],
-                                           linestyle='None', marker='.', markeredgecolor='#682860',
-                                           markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            session.loop_line, = ax.plot(session.u_data_adjusted, session.p_data_adjusted, c='#aa00ff', linewidth=0.8)
+            session.loop_markers = ax.plot(session.u_data_adjusted[::pts_per_marker],
+                                          session.p_data_adjusted[::pts_per_marker],
+                                          linestyle='None', marker='.', markeredgecolor='#682860',
+                                          markerfacecolor='None', markeredgewidth=0.5, markersize=2)
 
             # Plot line from which gradient is calculated
-            if len(config.lin_x) != 0:
-                ax.plot(config.lin_x, config.lin_y, color=config.green)
+            if len(session.lin_x) != 0:
+                ax.plot(session.lin_x, session.lin_y, color=config.green)
 
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('U (m/s)')
             ax.set_ylabel('P (Pa)')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
 
-        elif config.method_choice == 2:
+        elif session.method_choice == 2:
             # Plot graph of lnD against U.
-            if len(config.lnd_data_adjusted) > 200:
-                pts_per_marker = round(len(config.lnd_data_adjusted) / 200)
+            if len(session.lnd_data_adjusted) > 200:
+                pts_per_marker = round(len(session.lnd_data_adjusted) / 200)
             else:
                 pts_per_marker = 1
-            fig, ax = plt.subplots(figsize=(5, 3))
+            fig, ax = self.loop_plot.subplots()
             fig.patch.set_facecolor(config.plot_bg_col)
             ax.set_facecolor(config.plot_bg_col)
-            config.loop_line, = ax.plot(config.u_data_adjusted, config.lnd_data_adjusted, c='#aa00ff', linewidth=0.8)
-            config.loop_markers = plt.plot(config.u_data_adjusted[::pts_per_marker],
-                                           config.lnd_data_adjusted[::pts_per_marker],
-                                           linestyle='None', marker='.', markeredgecolor='#682860',
-                                           markerfacecolor='None', markeredgewidth=0.5, markersize=2)
+            session.loop_line, = ax.plot(session.u_data_adjusted, session.lnd_data_adjusted, c='#aa00ff', linewidth=0.8)
+            session.loop_markers = ax.plot(session.u_data_adjusted[::pts_per_marker],
+                                          session.lnd_data_adjusted[::pts_per_marker],
+                                          linestyle='None', marker='.', markeredgecolor='#682860',
+                                          markerfacecolor='None', markeredgewidth=0.5, markersize=2)
 
             # Plot line from which gradient is calculated
-            if len(config.lin_x) != 0:
-                ax.plot(config.lin_x, config.lin_y, color=config.green)
+            if len(session.lin_x) != 0:
+                ax.plot(session.lin_x, session.lin_y, color=config.green)
 
-            plt.gca().yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-            plt.gca().ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
+            ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+            ax.ticklabel_format(axis='y', style='scientific', scilimits=(0, 0))
             ax.set_xlabel('U (m/s)')
             ax.set_ylabel('ln(D) (m)')
-            plt.minorticks_on()
-            plt.tick_params(axis='both', which='major', labelsize=12)
-            plt.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
-            plt.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
+            ax.minorticks_on()
+            ax.tick_params(axis='both', which='major', labelsize=12)
+            ax.grid(which='major', color='grey', linestyle='-', linewidth=0.5, alpha=0.5)
+            ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.2, alpha=0.5)
             fig.tight_layout()
 
-        self.canvas = FigureCanvasTkAgg(fig, self)
-        self.canvas.get_tk_widget().grid(row=0, column=6, columnspan=5, padx=5, pady=5)
+        self.blit.set_artists([session.loop_line, session.loop_markers[0]])
+        self.loop_plot.draw()
 
     def tkraise(self):
         """
@@ -0,0 +1,272 @@
+import warnings
+import numpy as np
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+
+
+# Reservoir (windkessel) pressure separation, independent of the GUI.
+# This has been translated from MATLAB script 'Windkessel.mlapp' to Python. The fit of the reservoir rate constant uses
+# Newton's method with exact derivatives of the least squares objective, so each step costs one pass over the beat
+# rather than the several needed when derivatives are found by finite differences.
+
+def kexpint(Y, T, A):
+    """
+    Integral of Y * exp(A * t) over a beat of duration T. Used to calculate the moments of pressure during diastole.
+    Only the integral over the whole beat is used, so the cumulative integral of the original MATLAB translation is not
+    formed.
+
+    :param Y: Pressure samples evenly spaced across the beat.
+    :param T: Duration of the beat.
+    :param A: Rate constant of the exponential.
+
+    :return Z: Integral over the whole beat.
+    """
+    N = len(Y) - 1
+    t1 = np.linspace(0, T, N + 1)
+    dt = t1[2] - t1[1]
+    Y0 = Y[1]
+    y = Y - Y0
+    exp_at = np.exp(A * t1)
+    ye = y * exp_at
+    z = (np.sum(ye) - (ye[0] + ye[-1]) / 2) * dt  # Trapezoidal rule
+    Z = z + Y0 * (exp_at[-1] - 1) / A
+    return Z
+
+
+def diastolic_fit(p, t):
+    """
+    Fits the model p = a * exp(-b * t) + c to the diastolic pressure using the moments of pressure.
+    A RuntimeWarning is raised with warnings.warn() if the diastolic time constant is out of expected bounds.
+
+    :param p: Pressure samples from the start of diastole.
+    :param t: Time array starting at 0, same length as p.
+
+    :return b, pinf, prd: Rate constant b, asymptotic pressure pinf (c in the model), and the fitted exponential prd.
+    """
+    # Duration of beat, Tb
+    Tb = t[-1]
+    # Time of start of diastole, Tn
+    tn = 0
+
+    # calculate moments of pressure during diastole using model d=a*exp(-bt)+c
+    pd = p[:-1]
+    td = t[:-1] - tn
+    Td = Tb - tn
+    E0 = np.mean(pd)
+    E1 = kexpint(pd - E0, Td, 1 / Td)
+    E2 = kexpint(pd - E0, Td, 2 / Td)
+    r = E2 / E1
+
+    # Coefficients obtained by polyfit in MATLAB
+    polyB = [198.7882, -427.3471, 350.9809, -148.1055, 28.1913]
+    # Polynomial evaluation
+    BTd = np.polyval(polyB, r - 3)
+    # Check condition
+    if BTd > 10:
+        warning_str = f"BTd = {BTd:.3f} diastolic time constant is out of expected bounds"
+        warnings.warn(warning_str, RuntimeWarning)
+
+    e1 = np.exp(1)
+    if BTd == 1:
+        denom = (3 - e1 - 1 / e1)
+    else:
+        denom = (1 - e1 * np.exp(-BTd)) / (BTd - 1) - (e1 - 1) * (1 - np.exp(-BTd)) / BTd
+    a = E1 / (Td * denom)
+    c = E0 - a * (1 - np.exp(-BTd)) / BTd
+    b = BTd / Td
+    prd = a * np.exp(-b * td) + c  # Exponential fit
+
+    return b, c, prd
+
+
+class ReservoirObjective:
+    """
+    Sum of squared differences between measured pressure and reservoir pressure after index nn, as a function of the
+    rate constant a, together with its exact first and second derivatives.
+    The integrals in the reservoir pressure are found already multiplied by exp(-(a + b) * t), with a first order
+    recursive filter over the beat. Each evaluation then costs one pass over the beat, and cannot overflow for large a.
+
+    :param p: Pressure samples for one beat.
+    :param t: Time array starting at 0, same length as p, evenly spaced.
+    :param b: Diastolic rate constant from diastolic_fit().
+    :param pinf: Asymptotic pressure from diastolic_fit().
+    :param nn: Index at the start of diastole. Only pressure from this index onwards is fitted.
+    """
+
+    def __init__(self, p, t, b, pinf, nn=0):
+        self.p = np.asarray(p, dtype=float)
+        self.t = np.asarray(t, dtype=float)
+        self.b = b
+        self.pinf = pinf
+        self.nn = nn
+        self.dt = self.t[2] - self.t[1]
+        self.p_target = self.p[nn:]
+
+        # Rows are the integrands of the reservoir integral and of its first and second derivatives with respect to a,
+        # without their exponential, which does not depend on a.
+        self.integrands = np.stack((self.p, self.p * self.t, self.p * self.t ** 2))
+
+    def _reservoir_terms(self, a, rows):
+        """
+        Terms shared by the reservoir pressure and its derivatives.
+
+        :param a: Rate constant.
+        :param rows: Number of integrands required. 1 for the value only, 3 to include derivatives.
+
+        :return integrals, exp_minus_k, g, decaying: Cumulative integrals multiplied by exp(-(a + b) * t),
+                                                     exp(-(a + b) * t), b * pinf / (a + b), and the part of the
+                                                     reservoir pressure which decays as exp_minus_k.
+        """
+        k = a + self.b
+        decay = np.exp(-k * self.dt)  # Decay of the integrals over one sample
+        integrands = self.integrands[:rows]
+
+        # Trapezoidal rule, decaying the integral by one sample at each step. The initial state starts it from 0.
+        weights = [self.dt / 2, self.dt / 2 * decay]
+        integrals = lfilter(weights, [1, -decay], integrands, axis=-1, zi=-weights[0] * integrands[:, :1])[0]
+        # The first value is that of the second sample, as in the original MATLAB translation
+        integrals[:, 0] = integrals[:, 1] / decay
+
+        exp_minus_k = np.exp(-k * self.t)
+        g = self.b * self.pinf / k
+        decaying = a * integrals[0] + (self.p[1] - g) * exp_minus_k
+        return integrals, exp_minus_k, g, decaying
+
+    def reservoir_pressure(self, a):
+        """
+        Reservoir pressure over the whole beat for rate constant a.
+
+        :param a: Rate constant.
+
+        :return pr: Reservoir pressure, same length as p.
+        """
+        integrals, exp_minus_k, g, decaying = self._reservoir_terms(a, 1)
+        return decaying + g
+
+    def derivatives(self, a):
+        """
+        Objective and its exact first and second derivatives with respect to a.
+
+        :param a: Rate constant.
+
+        :return value, gradient, curvature: Sum of squared residuals and its first and second derivatives.
+        """
+        integrals, exp_minus_k, g, decaying = self._reservoir_terms(a, 3)
+        pse, dpse, d2pse = integrals
+        k = a + self.b
+        t = self.t
+
+        # Derivatives of each term with respect to a. d(k)/da = 1.
+        dg = -g / k
+        d2g = -2 * dg / k
+        ddecaying = pse + a * dpse - dg * exp_minus_k  # Derivative of the decaying term, apart from its exponential
+        dprb = ddecaying - t * decaying + dg
+        d2prb = 2 * dpse + a * d2pse - d2g * exp_minus_k + d2g + t * (t * decaying - 2 * ddecaying)
+
+        residual = self.p_target - (decaying + g)[self.nn:]
+        dprb = dprb[self.nn:]
+        value = np.dot(residual, residual)
+        gradient = -2 * np.dot(residual, dprb)
+        curvature = 2 * (np.dot(dprb, dprb) - np.dot(residual, d2prb[self.nn:]))
+        return value, gradient, curvature
+
+    def __call__(self, a):
+        """
+        Objective and its derivative, in the form expected by scipy.optimize.minimize(jac=True).
+
+        :param a: Array containing the single rate constant being optimised.
+
+        :return value, gradient: Sum of squared residuals and its derivative with respect to a.
+        """
+        value, gradient, curvature = self.derivatives(float(np.asarray(a).ravel()[0]))
+        return value, np.array([gradient])
+
+
+def fit_rate_constant(objective, max_iterations=30, tolerance=1e-5):
+    """
+    Finds the rate constant a which minimises the reservoir objective.
+    Newton's method using the exact derivatives starts from a = 1 / (4 * dt), a reservoir time constant of a few
+    samples, which is where the minimum of the sampled objective is usually found. Each step is kept inside a bracket
+    which shrinks using the sign of the gradient. If the minimum is beyond the range of a that can be evaluated,
+    L-BFGS-B with the exact gradient is used instead, as in the original MATLAB translation.
+
+    :param objective: ReservoirObjective for the beat.
+    :param max_iterations: Maximum number of Newton iterations.
+    :param tolerance: Relative change in a at which Newton's method stops.
+
+    :return aa: Optimised rate constant.
+    """
+    duration = objective.t[-1]
+    a_max = 600 / objective.dt - objective.b  # Keeps exp((a + b) * dt) well within floating point range
+    a_min = 1e-2 / duration
+    if a_max <= a_min:
+        return minimize(objective, 0, method='L-BFGS-B', jac=True, options={'ftol': 1e-6}).x[0]
+
+    # Safeguarded Newton's method. Bisection on a log scale is used whenever a Newton step would leave the bracket.
+    low, high = a_min, a_max
+    a = min(max(1 / (4 * objective.dt), a_min), a_max)
+    edges_checked = []
+    for i in range(max_iterations):
+        value, gradient, curvature = objective.derivatives(a)
+        if gradient > 0:
+            high = a
+        else:
+            low = a
+
+        if curvature > 0:
+            a_new = a - gradient / curvature
+        else:
+            a_new = a
+        if not low < a_new < high:
+            edge = low if a_new <= low else high
+            if edge in (a_min, a_max) and edge not in edges_checked:
+                # Checked once at each end of the range whether the minimum lies beyond it
+                edges_checked.append(edge)
+                edge_gradient = objective.derivatives(edge)[1]
+                if edge == a_min and edge_gradient > 0:
+                    return minimize(objective, 0, method='L-BFGS-B', jac=True, options={'ftol': 1e-6}).x[0]
+                if edge == a_max and edge_gradient < 0:
+                    return minimize(objective, a_max, method='L-BFGS-B', jac=True, options={'ftol': 1e-6}).x[0]
+            a_new = np.sqrt(low * high)
+
+        converged = abs(a_new - a) <= tolerance * a
+        a = a_new
+        if converged:
+            break
+
+    return a
+
+
+def windkessel_fit(p, sampling_frequency):
+    """
+    Complete windkessel analysis of a single beat.
+
+    :param p: Pressure samples for one beat, starting at the lowest point of the beat.
+    :param sampling_frequency: Sampling frequency of p in Hz.
+
+    :return results: Dictionary containing time 't', pressure 'p', reservoir pressure 'pr', excess pressure 'pex', the
+                     diastolic exponential fit 'prd', and the fitted constants 'a', 'b' and 'pinf'.
+    """
+    p = np.asarray(p, dtype=float)
+
+    # Creates t array of the right length for p
+    t = np.arange(len(p)) / sampling_frequency
+
+    # index at start of diastole
+    nn = 0
+
+    b, pinf, prd = diastolic_fit(p, t)
+
+    # Fit rate constant a using the exact derivatives of the objective
+    objective = ReservoirObjective(p, t, b, pinf, nn)
+    aa = fit_rate_constant(objective)
+    pr = objective.reservoir_pressure(aa)
+
+    pex = p - pr  # Calculate excess pressure
+
+    # First sample of each waveform is replaced by the second, as in the original MATLAB translation
+    p = np.concatenate((p[1:2], p[1:]))     # p = pressure waveform
+    pr = np.concatenate((pr[1:2], pr[1:]))  # pr = reservoir pressure
+    pex = np.concatenate((pex[1:2], pex[1:]))  # pex = excess pressure
+
+    return {'t': t, 'p': p, 'pr': pr, 'pex': pex, 'prd': prd, 'a': aa, 'b': b, 'pinf': pinf}
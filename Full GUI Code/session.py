@@ -0,0 +1,161 @@
+from imageengine import ImageAnalysis, velocity, diameter
+
+
+# Analysis session holding every array and parameter of one analysis.
+# Each page of the GUI reads and writes its session through self.session instead of module level globals, so several
+# analyses can run side by side in one process without interfering with each other. Aesthetic choices shared by all
+# sessions stay in 'config.py'.
+
+class AnalysisSession:
+    """
+    All data, parameters and results of a single analysis.
+    Attributes have the same names as the globals which used to be held in 'config.py', apart from the state of the
+    two ultrasound image analyses, which is held in u_analysis and d_analysis.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Sets every attribute back to its initial value, ready to start a new analysis. The session object itself is
+        kept, so pages holding a reference to it see the reset.
+        """
+        # Dictates chosen type of analysis
+        # Value of 1/2/3 for invasive, non-invasive and windkessel respectively
+        self.method_choice = int
+
+        # Units of measurement for data
+        self.p_unit = str
+        self.u_unit = str
+        self.d_unit = str
+
+        # File column containing each data type
+        self.t_column = int
+        self.p_column = int
+        self.u_column = int
+        self.d_column = int
+
+        # Original data inputs
+        self.all_data = None
+        self.t_data = []
+        self.p_data = []
+        self.u_data = []
+        self.d_data = []
+
+        # Sampling frequency
+        self.sampling_frequency = 1000
+
+        # Dictates how certain functions behave when carrying out image analysis
+        self.image_analysis = False
+
+        # Images, boxes, model predictions and annotations of the U and D ultrasound images, each analysed in its own
+        # ImageAnalysis from 'imageengine.py' by 'VelocityImage' and 'DiameterImage'
+        self.u_analysis = ImageAnalysis(velocity)
+        self.d_analysis = ImageAnalysis(diameter)
+
+        # Number of square images passed through the segmentation model at once. Lower values use less memory
+        self.model_batch_size = 8
+
+        # Inference backend used to run the segmentation models. One of the keys of models.backends
+        self.model_backend = 'keras'
+
+        # Dictates which data is to be cleaned or shortened in smoothdata.py
+        self.chosen_data = str
+
+        # Savitzky–Golay filter parameters
+        self.poly_order = int
+        self.window_size = int
+
+        # Coordinates which determine which bits of data to cut off after use draws vertical lines on graph
+        self.x_cut_values = []
+        self.x1 = None
+        self.x2 = None
+        self.x1_line = None
+        self.x2_line = None
+
+        # Temporary copy of each data type which is edited in smoothdata.py
+        self.p_edit = []
+        self.u_edit = []
+        self.d_edit = []
+
+        # Temporary time arrays corresponding to each data type in smoothdata.py
+        self.t_p = []
+        self.t_u = []
+        self.t_d = []
+
+        # Temporary shifted time data for PUAdjust page
+        self.p_t_adjusted = []
+        self.u_t_adjusted = []
+        self.d_t_adjusted = []
+
+        # Saved shifted data
+        self.p_data_adjusted = []
+        self.u_data_adjusted = []
+        self.d_data_adjusted = []
+        self.lnd_data_adjusted = []
+
+        # Saved to allow updates to plot data without redrawing whole plots in puadjust.py and puloop.py
+        self.p_line = None
+        self.p_markers = None
+        self.u_line = None
+        self.u_markers = None
+        self.d_line = None
+        self.d_markers = None
+        self.loop_line = None
+        self.loop_markers = None
+
+        # Data points for linear section of loop detected by automatic gradient function
+        self.lin_x = []
+        self.lin_y = []
+
+        # Blood density
+        self.rho = 1050
+
+        # Wave speed
+        self.c = 0
+
+        # First derivatives of data
+        self.dP = []
+        self.dU = []
+        self.dD = []
+        self.dlnD = []
+        self.dI = []
+
+        # First derivatives of data in forward direction
+        self.dP_f = []
+        self.dU_f = []
+        self.dD_f = []
+        self.dlnD_f = []
+        self.dI_f = []
+
+        # First derivatives of data in backward direction
+        self.dP_b = []
+        self.dU_b = []
+        self.dD_b = []
+        self.dlnD_b = []
+        self.dI_b = []
+
+        # Data in forward direction
+        self.P_f = []
+        self.U_f = []
+        self.D_f = []
+
+        # Data in backward direction
+        self.P_b = []
+        self.U_b = []
+        self.D_b = []
+
+        # Dictates which plot is displayed in outputpage.py
+        self.current_plot = str
+
+        # Output data from windkessel analysis
+        self.windkessel_t = []
+        self.windkessel_p = []
+        self.windkessel_pr = []
+        self.windkessel_pex = []
+        self.prd = []
+
+        # Linear section of loop in the original units of the loop plot
+        self.x_lin = []
+        self.y_lin = []
@@ -0,0 +1,127 @@
+import numpy as np
+
+
+# Shifted views of recordings, used to line up P, U and D without copying whole arrays.
+# A ShiftedArray holds a reference to the original data and a shift in samples. Elements pushed off one end are lost and
+# the other end is filled with duplicates of the end value, in the same way as the original save_adjusted().
+# For example: [1, 2, 3, 4, 5, 6] shifted left by 1 time step would become [2, 3, 4, 5, 6, 6].
+# Changing the shift costs nothing. Data is only gathered when it is read, and only the elements which are read.
+
+class ShiftedArray:
+    """
+    Read-only view of a 1D array shifted by a whole number of samples, with edge values repeated to fill the gap.
+    Works anywhere a NumPy array can be read (plotting, np.column_stack, analysis functions) through __array__().
+    The view always reflects the current contents of the base array, so changing units of the base array in place also
+    changes the view.
+
+    :param base: 1D array of original data.
+    :param shift: Shift in samples. Positive moves the data right (later), negative moves it left (earlier).
+    """
+
+    def __init__(self, base, shift=0):
+        self.base = base
+        self.shift = int(shift)
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def shape(self):
+        return np.shape(self.base)
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return len(self.base)
+
+    @property
+    def dtype(self):
+        return np.asarray(self.base).dtype
+
+    def _source_indices(self, indices):
+        """
+        Converts indices into the shifted view into indices into the base array, clamped to its ends.
+
+        :param indices: Integer or array of non-negative indices into the view.
+
+        :return source: Indices into the base array.
+        """
+        return np.clip(indices - self.shift, 0, len(self.base) - 1)
+
+    def __getitem__(self, key):
+        """
+        Reads elements of the shifted data. Only the requested elements are gathered, so reading every nth point for
+        plot markers costs a fraction of a full copy.
+
+        :param key: Integer, slice, or array of indices.
+
+        :return values: Single value or new array of values.
+        """
+        n = len(self.base)
+        if isinstance(key, slice):
+            indices = np.arange(*key.indices(n))
+        else:
+            indices = np.arange(n)[key]
+        return np.asarray(self.base)[self._source_indices(indices)]
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def values(self, out=None):
+        """
+        Gathers the whole shifted array.
+
+        :param out: Optional array of the same length to write the result into, so repeated reads do not allocate.
+
+        :return values: Shifted data.
+        """
+        base = np.asarray(self.base)
+        n = len(base)
+        if out is None:
+            out = np.empty_like(base)
+        s = min(max(self.shift, -n), n)  # A shift of the whole length or more leaves only the edge value
+
+        if s > 0:
+            out[:s] = base[0]
+            out[s:] = base[:n - s]
+        elif s < 0:
+            out[:n + s] = base[-s:]
+            out[n + s:] = base[-1]
+        else:
+            out[:] = base
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.values()
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+        return values
+
+    def __repr__(self):
+        return f"ShiftedArray({self.values()!r}, shift={self.shift})"
+
+
+def shifted_view(base, t_adjusted, sampling_frequency, current=None):
+    """
+    Returns a view of base shifted by the amount the user has adjusted its time array. When an existing view of the same
+    base array is passed as current, only its shift is updated, so repeated adjustments do not allocate anything.
+
+    :param base: 1D array of original data.
+    :param t_adjusted: Time array adjusted by the user. Its first element is the amount of time adjusted.
+    :param sampling_frequency: Sampling frequency in Hz.
+    :param current: Existing ShiftedArray to reuse, if any.
+
+    :return view: ShiftedArray of base.
+    """
+    delta_t = t_adjusted[0]  # Amount of time adjusted by the user
+    # No. of array indices corresponding to delta_t. Rounded, as repeated steps of 1/sampling_frequency do not add up
+    # to an exact whole number of samples.
+    index = round(delta_t * sampling_frequency)
+
+    if isinstance(current, ShiftedArray) and current.base is base:
+        current.shift = index
+        return current
+    return ShiftedArray(base, index)
@@ -0,0 +1,34 @@
+import numpy as np
+from scipy.signal import savgol_filter
+
+
+# Smoothing and trimming of recordings, as carried out in 'SmoothData', independent of the GUI.
+# 'batchrun.py' and 'benchmark.py' call the same functions, so they run exactly the code behind the GUI buttons.
+
+def smooth(x, window_size, poly_order):
+    """
+    Filters data with a Savitzky-Golay filter, savgol_filter() in scipy.signal.
+
+    :param x: 1D array of data.
+    :param window_size: Length of the filter window in samples.
+    :param poly_order: Order of the polynomial fitted within each window.
+
+    :return x_smooth: Filtered data, same length as x.
+    """
+    return savgol_filter(x, int(window_size), int(poly_order))
+
+
+def cut_indices(t, x1, x2):
+    """
+    Finds the indices of the samples closest to two cutting times, which may be given in either order.
+
+    :param t: Time array of the recording.
+    :param x1: Time of one cutting line.
+    :param x2: Time of the other cutting line.
+
+    :return index_low, index_high: Indices in increasing order. Data from index_low up to but not including
+                                   index_high is kept.
+    """
+    index1 = (np.abs(t - x1)).argmin()
+    index2 = (np.abs(t - x2)).argmin()
+    return min(index1, index2), max(index1, index2)
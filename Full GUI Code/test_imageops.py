@@ -0,0 +1,38 @@
+import numpy as np
+from imageops import box_mask
+
+
+# Tests for box_mask(), compared against the pixel by pixel check it replaced. Run with: python -m pytest
+
+def reference_mask(shape, box_coords):
+    """
+    Checks every pixel of the image against every box, as remove_anomalies_1() used to.
+    """
+    height, width = shape
+    ys, xs = np.mgrid[0:height, 0:width]
+    mask = np.zeros(shape, dtype=bool)
+    for x1, y1, x2, y2 in np.reshape(box_coords, (-1, 4)):
+        mask |= (xs >= min(x1, x2)) & (xs <= max(x1, x2)) & (ys >= min(y1, y2)) & (ys <= max(y1, y2))
+    return mask
+
+
+def test_box_inside_image():
+    box_coords = [2.4, 3.6, 7.5, 1.2]
+    assert np.array_equal(box_mask((10, 12), box_coords), reference_mask((10, 12), box_coords))
+
+
+def test_box_partly_outside_image():
+    box_coords = [-5.0, -3.0, 4.2, 2.8, 9.5, 6.0, 30.0, 40.0]
+    mask = box_mask((10, 12), box_coords)
+    assert np.array_equal(mask, reference_mask((10, 12), box_coords))
+    assert mask[0, 0] and mask[9, 11]
+
+
+def test_box_fully_outside_image():
+    # Negative ends must not wrap round to the far edges of the image
+    for box_coords in ([-8.0, -6.0, -2.0, -1.0], [-8.0, 2.0, -2.0, 5.0], [3.0, 20.0, 6.0, 25.0], [15.0, 1.0, 40.0, 4.0]):
+        assert not box_mask((10, 12), box_coords).any()
+
+
+def test_box_between_pixels():
+    assert not box_mask((10, 12), [2.2, 2.2, 2.8, 5.0]).any()
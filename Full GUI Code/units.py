@@ -0,0 +1,85 @@
+import numpy as np
+
+
+# Units of measurement offered in 'InputPage', and the factor which converts each of them into SI units.
+# The session functions convert the data of an AnalysisSession in place, as the GUI pages need. The array functions
+# return new arrays, for use outside the GUI.
+
+si_factors = {
+    'P': {'Pa': 1, 'kPa': 1000, 'mmHg': 133},
+    'U': {'m/s': 1, 'cm/s': 1 / 100, 'mm/s': 1 / 1000},
+    'D': {'m': 1, 'cm': 1 / 100, 'mm': 1 / 1000},
+}
+
+
+def si_factor(data_type, unit):
+    """
+    Factor which converts data in the given unit into SI units. Units which are not recognised, such as the '-' option
+    in the InputPage dropdowns, are treated as SI already, as in the GUI.
+
+    :param data_type: 'P', 'U' or 'D'.
+    :param unit: Unit of measurement chosen by the user.
+
+    :return factor: Multiply data by this to convert it to SI units.
+    """
+    return si_factors[data_type].get(unit, 1)
+
+
+def to_si(data, data_type, unit):
+    """
+    Converts data into SI units.
+
+    :param data: Array of data.
+    :param data_type: 'P', 'U' or 'D'.
+    :param unit: Unit of measurement of data.
+
+    :return data: New array of data in SI units.
+    """
+    return np.asarray(data, dtype=float) * si_factor(data_type, unit)
+
+
+def from_si(data, data_type, unit):
+    """
+    Converts data from SI units back into the unit chosen by the user.
+
+    :param data: Array of data in SI units.
+    :param data_type: 'P', 'U' or 'D'.
+    :param unit: Unit of measurement to convert into.
+
+    :return data: New array of data in the chosen unit.
+    """
+    return np.asarray(data, dtype=float) / si_factor(data_type, unit)
+
+
+# Session attribute holding each data type, and the attribute holding its unit
+session_data = (('P', 'p_data', 'p_unit'), ('U', 'u_data', 'u_unit'), ('D', 'd_data', 'd_unit'))
+
+
+def convert_session_to_si(session):
+    """
+    Converts session.p_data, session.u_data and session.d_data into SI units in place, using the units chosen in
+    'InputPage'. Arrays are edited in place, so any views of them (such as the adjusted data arrays) are converted too.
+
+    :param session: AnalysisSession to convert.
+    """
+    for data_type, data_name, unit_name in session_data:
+        factor = si_factor(data_type, getattr(session, unit_name))
+        if factor != 1:
+            data = getattr(session, data_name)
+            data *= factor
+            setattr(session, data_name, data)
+
+
+def convert_session_from_si(session):
+    """
+    Converts session.p_data, session.u_data and session.d_data from SI units back to the units chosen in 'InputPage',
+    in place. Reverses convert_session_to_si().
+
+    :param session: AnalysisSession to convert.
+    """
+    for data_type, data_name, unit_name in session_data:
+        factor = si_factor(data_type, getattr(session, unit_name))
+        if factor != 1:
+            data = getattr(session, data_name)
+            data /= factor
+            setattr(session, data_name, data)
@@ -0,0 +1,235 @@
+import numpy as np
+from scipy import integrate
+
+
+# Wave separation and wave intensity analysis independent of the GUI.
+# Every function in this file works on either a single recording (1D array) or a stack of recordings (2D array with one
+# recording per row) sampled at the same time points. Wave speed c can be a single value, or an array with one value per
+# recording, so a whole cohort can be separated in one vectorised call. The sweep functions separate the same data for a
+# whole array of wave speeds at once.
+
+
+def _wave_speed_column(c):
+    """
+    Converts wave speed into an array which broadcasts against the time axis of the data.
+
+    :param c: Single wave speed, or array of wave speeds with one value per recording.
+
+    :return c: Wave speed with a trailing axis of length 1 added.
+    """
+    return np.asarray(c, dtype=float)[..., np.newaxis]
+
+
+def _cumulative_integral(y, t):
+    """
+    Cumulative trapezoidal integral of y along the time axis.
+    cumulative_trapezoid returns an array 1 element shorter than its inputs, so the first value is repeated at the start
+    in order for dimensions to align. This matches the np.insert used originally in the GUI.
+
+    :param y: Data to be integrated. Time runs along the last axis.
+    :param t: 1D time array shared by all recordings.
+
+    :return z: Cumulative integral with the same shape as y.
+    """
+    z = integrate.cumulative_trapezoid(y, t, axis=-1)
+    return np.concatenate((z[..., :1], z), axis=-1)
+
+
+def invasive_derivatives(p, u, t):
+    """
+    Calculates the time derivatives required for invasive (PU-loop) analysis. These do not depend on wave speed, so
+    they can be calculated once and reused for any number of wave speeds.
+
+    :param p: Pressure in Pa. 1D array, or 2D array with one recording per row.
+    :param u: Velocity in m/s. Same shape as p.
+    :param t: 1D time array in seconds shared by all recordings.
+
+    :return derivatives: Dictionary containing 'dP', 'dU' and 'dI'.
+    """
+    dP = np.gradient(p, t, axis=-1)
+    dU = np.gradient(u, t, axis=-1)
+
+    return {'dP': dP, 'dU': dU, 'dI': dP * dU}
+
+
+def non_invasive_derivatives(d, u, t):
+    """
+    Calculates the time derivatives required for non-invasive (lnDU-loop) analysis. These do not depend on wave speed,
+    so they can be calculated once and reused for any number of wave speeds.
+
+    :param d: Diameter in m. 1D array, or 2D array with one recording per row.
+    :param u: Velocity in m/s. Same shape as d.
+    :param t: 1D time array in seconds shared by all recordings.
+
+    :return derivatives: Dictionary containing 'dD', 'dlnD', 'dU' and 'dI'.
+    """
+    dD = np.gradient(d, t, axis=-1)
+    dlnD = np.gradient(np.log(d), t, axis=-1)
+    dU = np.gradient(u, t, axis=-1)
+
+    return {'dD': dD, 'dlnD': dlnD, 'dU': dU, 'dI': dD * dU}
+
+
+def separate_invasive(p, u, t, c, rho=1050, derivatives=None):
+    """
+    Separates pressure, velocity and wave intensity into forward and backward travelling components using the PU-loop
+    wave speed.
+
+    :param p: Pressure in Pa. 1D array, or 2D array with one recording per row.
+    :param u: Velocity in m/s. Same shape as p.
+    :param t: 1D time array in seconds shared by all recordings.
+    :param c: Wave speed in m/s. Single value, or array with one value per recording. For a 1D recording an array of
+              wave speeds returns one row of results per wave speed.
+    :param rho: Blood density in kg/m^3.
+    :param derivatives: Optional output of invasive_derivatives() for p, u and t, to avoid recalculating them.
+
+    :return results: Dictionary containing 'dP', 'dU', 'dI', the forward ('_f') and backward ('_b') derivatives of each,
+                     and the separated waveforms 'P_f', 'U_f', 'P_b' and 'U_b'.
+    """
+    p = np.asarray(p, dtype=float)
+    if derivatives is None:
+        derivatives = invasive_derivatives(p, u, t)
+    dP = derivatives['dP']
+    dU = derivatives['dU']
+    c = _wave_speed_column(c)
+
+    # Calculating wave separation derivatives
+    dP_f = (dP + (rho * c * dU)) / 2
+    dU_f = (dU + (dP / (rho * c))) / 2
+    dP_b = (dP - (rho * c * dU)) / 2
+    dU_b = (dU - (dP / (rho * c))) / 2
+
+    # Calculating wave separations
+    P_f = np.min(p, axis=-1, keepdims=True) + _cumulative_integral(dP_f, t)
+    U_f = _cumulative_integral(dU_f, t)
+    P_b = _cumulative_integral(dP_b, t)
+    U_b = _cumulative_integral(dU_b, t)
+
+    return {'dP': dP, 'dU': dU, 'dI': derivatives['dI'],
+            'dP_f': dP_f, 'dU_f': dU_f, 'dI_f': dP_f * dU_f,
+            'dP_b': dP_b, 'dU_b': dU_b, 'dI_b': dP_b * dU_b,
+            'P_f': P_f, 'U_f': U_f, 'P_b': P_b, 'U_b': U_b}
+
+
+def separate_non_invasive(d, u, t, c, derivatives=None):
+    """
+    Separates diameter, velocity and wave intensity into forward and backward travelling components using the
+    lnDU-loop wave speed.
+
+    :param d: Diameter in m. 1D array, or 2D array with one recording per row.
+    :param u: Velocity in m/s. Same shape as d.
+    :param t: 1D time array in seconds shared by all recordings.
+    :param c: Wave speed in m/s. Single value, or array with one value per recording. For a 1D recording an array of
+              wave speeds returns one row of results per wave speed.
+    :param derivatives: Optional output of non_invasive_derivatives() for d, u and t, to avoid recalculating them.
+
+    :return results: Dictionary containing 'dD', 'dlnD', 'dU', 'dI', the forward ('_f') and backward ('_b')
+                     derivatives, and the separated waveforms 'D_f', 'U_f', 'D_b' and 'U_b'.
+    """
+    d = np.asarray(d, dtype=float)
+    if derivatives is None:
+        derivatives = non_invasive_derivatives(d, u, t)
+    dlnD = derivatives['dlnD']
+    dU = derivatives['dU']
+    c = _wave_speed_column(c)
+
+    # Calculating wave separation derivatives
+    dD_f = (d / 2) * (dlnD + (dU / (2 * c)))
+    dD_b = (-d / 2) * (dlnD - (dU / (2 * c)))
+    dU_f = 0.5 * (dU + (2 * c * dlnD))
+    dU_b = 0.5 * (dU - (2 * c * dlnD))
+
+    # Calculating wave separations
+    D_f = d[..., :1] + _cumulative_integral(dD_f, t)
+    U_f = _cumulative_integral(dU_f, t)
+    D_b = d[..., :1] - _cumulative_integral(dD_b, t)
+    U_b = _cumulative_integral(dU_b, t)
+
+    return {'dD': derivatives['dD'], 'dlnD': dlnD, 'dU': dU, 'dI': derivatives['dI'],
+            'dD_f': dD_f, 'dU_f': dU_f, 'dI_f': dD_f * dU_f,
+            'dD_b': dD_b, 'dU_b': dU_b, 'dI_b': dD_b * dU_b,
+            'D_f': D_f, 'U_f': U_f, 'D_b': D_b, 'U_b': U_b}
+
+
+def _sweep_wave_speeds(c, data):
+    """
+    Shapes an array of wave speeds so that separating data with it gives one set of results per wave speed, stacked
+    along a new first axis.
+
+    :param c: 1D array of wave speeds.
+    :param data: Data to be separated. 1D array, or 2D array with one recording per row.
+
+    :return c: Wave speeds with an axis of length 1 for every non-time axis of data.
+    """
+    return np.asarray(c, dtype=float).reshape((-1,) + (1,) * (np.ndim(data) - 1))
+
+
+def _sweep_metrics(t, dI_f, dI_b, forward, backward):
+    """
+    Summary metrics of a wave speed sweep, reduced over the time axis.
+
+    :param t: 1D time array in seconds.
+    :param dI_f: Forward wave intensity.
+    :param dI_b: Backward wave intensity.
+    :param forward: Separated forward waveform (P_f or D_f).
+    :param backward: Separated backward waveform (P_b or D_b).
+
+    :return metrics: Dictionary of arrays with one value per wave speed (and recording).
+    """
+    # Cumulative wave intensity (wave energy) in each direction
+    energy_f = integrate.trapezoid(dI_f, t, axis=-1)
+    energy_b = integrate.trapezoid(dI_b, t, axis=-1)
+    amplitude_f = np.ptp(forward, axis=-1)
+    amplitude_b = np.ptp(backward, axis=-1)
+
+    return {'peak_dI_f': np.max(dI_f, axis=-1), 'peak_dI_b': np.min(dI_b, axis=-1),
+            'energy_f': energy_f, 'energy_b': energy_b,
+            'reflection_index': np.divide(np.abs(energy_b), energy_f, out=np.full_like(energy_f, np.nan),
+                                          where=energy_f != 0),
+            'reflection_magnitude': np.divide(amplitude_b, amplitude_f, out=np.full_like(amplitude_f, np.nan),
+                                              where=amplitude_f != 0)}
+
+
+def sweep_invasive(p, u, t, c_values, rho=1050):
+    """
+    Separates pressure and velocity for every wave speed in c_values, to show how sensitive the forward and backward
+    waves are to the PU-loop wave speed. The time derivatives are calculated once and reused for every wave speed.
+
+    :param p: Pressure in Pa. 1D array, or 2D array with one recording per row.
+    :param u: Velocity in m/s. Same shape as p.
+    :param t: 1D time array in seconds shared by all recordings.
+    :param c_values: 1D array of wave speeds in m/s.
+    :param rho: Blood density in kg/m^3.
+
+    :return results, metrics: Output of separate_invasive() with an extra first axis for wave speed on every separated
+                              result (the time derivatives 'dP', 'dU' and 'dI' are shared, so keep their shape), and a
+                              dictionary of summary metrics with one value per wave speed (and recording): peak forward
+                              and backward wave intensity 'peak_dI_f' and 'peak_dI_b', wave energy 'energy_f' and
+                              'energy_b', 'reflection_index' |energy_b| / energy_f, and 'reflection_magnitude' the ratio
+                              of backward to forward pressure amplitude.
+    """
+    derivatives = invasive_derivatives(p, u, t)
+    results = separate_invasive(p, u, t, _sweep_wave_speeds(c_values, p), rho, derivatives)
+    metrics = _sweep_metrics(t, results['dI_f'], results['dI_b'], results['P_f'], results['P_b'])
+    return results, metrics
+
+
+def sweep_non_invasive(d, u, t, c_values):
+    """
+    Separates diameter and velocity for every wave speed in c_values, to show how sensitive the forward and backward
+    waves are to the lnDU-loop wave speed. The time derivatives are calculated once and reused for every wave speed.
+
+    :param d: Diameter in m. 1D array, or 2D array with one recording per row.
+    :param u: Velocity in m/s. Same shape as d.
+    :param t: 1D time array in seconds shared by all recordings.
+    :param c_values: 1D array of wave speeds in m/s.
+
+    :return results, metrics: Output of separate_non_invasive() with an extra first axis for wave speed on every
+                              separated result (the time derivatives keep their shape), and the same summary metrics
+                              as sweep_invasive(), with 'reflection_magnitude' calculated from the forward and backward
+                              diameter.
+    """
+    derivatives = non_invasive_derivatives(d, u, t)
+    results = separate_non_invasive(d, u, t, _sweep_wave_speeds(c_values, d), derivatives)
+    metrics = _sweep_metrics(t, results['dI_f'], results['dI_b'], results['D_f'], results['D_b'])
+    return results, metrics
@@ -0,0 +1,114 @@
+import queue
+import threading
+
+
+# Runs slow work, such as image segmentation, on a worker thread so the GUI stays responsive.
+# The work reports its progress through a callback, which also stops it at the next call once the user has cancelled.
+# Progress, results and errors are passed back through a queue, which the Tk main loop polls with after(), so every
+# widget is only ever touched from the main thread.
+
+class Cancelled(Exception):
+    """
+    Raised inside the work by BackgroundTask.progress() once the task has been cancelled.
+    """
+
+
+class BackgroundTask:
+    """
+    Runs a function on a worker thread and hands its progress and result back to the Tk main loop.
+
+    :param widget: Tk widget whose after() schedules the polling, normally the GUI page starting the task.
+    :param work: Function run on the worker thread. Called with one argument, progress, which it should call as
+                 progress(done, total) after each piece of work. Must not touch any Tk widgets or session data.
+    :param on_done: Called on the main thread with the value returned by work.
+    :param on_progress: Optional function called on the main thread with (done, total).
+    :param on_cancel: Optional function called on the main thread if the task is cancelled.
+    :param on_error: Optional function called on the main thread with any exception raised by work. By default the
+                     exception is reported in the same way as an error in any other Tk callback.
+    """
+    poll_ms = 50  # Time between checks for messages from the worker thread
+
+    def __init__(self, widget, work, on_done, on_progress=None, on_cancel=None, on_error=None):
+        self.widget = widget
+        self.work = work
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.on_error = on_error
+        self._messages = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)  # Does not stop the GUI from closing
+
+    @property
+    def running(self):
+        return self._thread.is_alive() or not self._messages.empty()
+
+    def start(self):
+        """
+        Starts the work on the worker thread and begins polling for its messages.
+
+        :return self: The task, so it can be started and saved in one line.
+        """
+        self._thread.start()
+        self.widget.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        """
+        Asks the work to stop. It stops at its next call to progress(), so the current piece of work is finished first.
+        """
+        self._cancel.set()
+
+    def progress(self, done, total):
+        """
+        Called by the work on the worker thread to report progress.
+
+        :param done: Number of pieces of work finished.
+        :param total: Total number of pieces of work.
+        """
+        if self._cancel.is_set():
+            raise Cancelled()
+        self._messages.put(('progress', (done, total)))
+
+    def _run(self):
+        try:
+            result = self.work(self.progress)
+        except Cancelled:
+            self._messages.put(('cancelled', None))
+        except Exception as error:
+            self._messages.put(('error', error))
+        else:
+            self._messages.put(('cancelled', None) if self._cancel.is_set() else ('done', result))
+
+    def _poll(self):
+        """
+        Handles every message from the worker thread since the last poll, on the main thread. Only the latest progress
+        is shown, so a fast worker cannot flood the GUI with updates.
+        """
+        latest_progress = None
+        while True:
+            try:
+                kind, value = self._messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                latest_progress = value
+                continue
+
+            if latest_progress is not None and self.on_progress is not None:
+                self.on_progress(*latest_progress)
+            if kind == 'done':
+                self.on_done(value)
+            elif kind == 'cancelled':
+                if self.on_cancel is not None:
+                    self.on_cancel()
+            elif self.on_error is not None:
+                self.on_error(value)
+            else:
+                self.widget.report_callback_exception(type(value), value, value.__traceback__)
+            return
+
+        if latest_progress is not None and self.on_progress is not None:
+            self.on_progress(*latest_progress)
+        self.widget.after(self.poll_ms, self._poll)